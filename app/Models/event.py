@@ -1,21 +1,110 @@
-from sqlalchemy import Column, String, DateTime, Text, JSON
+from sqlalchemy import Column, String, DateTime, Text, JSON, Integer, Float, ForeignKey, PrimaryKeyConstraint, Index, DDL, event
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
+from app.Models.venue import Venue
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+def _not_postgresql(ddl, target, bind, dialect=None, **kw) -> bool:
+    return (dialect or bind.dialect).name != "postgresql"
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Other backends keep a single table keyed on id
+        PrimaryKeyConstraint("id").ddl_if(callable_=_not_postgresql),
+        # PostgreSQL range partitions events by month of start_date. Unique indexes of a
+        # partitioned table must include start_date, and a primary key couldn't hold the
+        # NULL start_date of undated events, which land in the default partition
+        Index("uq_events_id_start_date", "id", "start_date", unique=True).ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (start_date)"},
+    )
+
+    id = Column(String, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text)
+    start_date = Column(DateTime, nullable=True, index=True)
+    venue_id = Column(String, ForeignKey("venues.id"), index=True)
+    url = Column(String)
+    # Indexed for the stream watcher's polls
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    trending_score = Column(Float, index=True)
+
+    venue = relationship(Venue)
+
+    # Venue details live on the venues table; these keep EventSchema's flat shape
+    @property
+    def venue_name(self):
+        return self.venue.name if self.venue else None
+
+    @property
+    def city(self):
+        return self.venue.city if self.venue else None
 
+    @property
+    def country(self):
+        return self.venue.country if self.venue else None
+
+    @property
+    def latitude(self):
+        return self.venue.latitude if self.venue else None
+
+    @property
+    def longitude(self):
+        return self.venue.longitude if self.venue else None
+
+# Rows whose month has no partition yet land here instead of failing the insert
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT").execute_if(dialect="postgresql")
+)
+
+class ArchivedEvent(Base):
+    __tablename__ = "events_archive"
+
+    # Same columns as events; rows move here once their start_date has passed
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
+    start_date = Column(DateTime, index=True)
+    venue_id = Column(String, ForeignKey("venues.id"), index=True)
+    url = Column(String)
+    created_at = Column(DateTime)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0")
+    trending_score = Column(Float)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    venue = relationship(Venue)
+
+class UpcomingEvent(Base):
+    __tablename__ = "upcoming_events"
+    __table_args__ = (
+        # The default listing order. On PostgreSQL it also carries the compact list
+        # columns, so the count and a ?fields=list page are index-only scans
+        Index(
+            "ix_upcoming_events_start_date_id", "start_date", "id",
+            postgresql_include=["name", "venue_name", "city", "country", "url", "favorite_count"]
+        ),
+    )
+
+    # Upcoming events already joined to their venue, in listing column order.
+    # Refreshed by ingestion after each batch (see refresh_upcoming_events)
+    id = Column(String, primary_key=True)
+    name = Column(String, nullable=False, index=True)
+    description = Column(Text)
     start_date = Column(DateTime)
+    venue_id = Column(String)
     venue_name = Column(String)
     city = Column(String)
     country = Column(String)
+    latitude = Column(Float)
+    longitude = Column(Float)
     url = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
 
 #pydantic model
 class EventSchema(BaseModel):
@@ -23,15 +112,46 @@ class EventSchema(BaseModel):
     name: str
     description: str | None = None
     start_date: datetime | None = None
+    venue_id: str | None = None
     venue_name: str | None = None
     city: str | None = None
     country: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
     url: str | None = None
     created_at: datetime | None = None
+    favorite_count: int | None = None
+    distance_km: float | None = None
     class Config:
         orm_mode = True
         from_attributes = True  # For Pydantic v2 compatibility
 
+class EventListItem(BaseModel):
+    """The compact event of list views (?fields=list): no description, ids or bookkeeping columns"""
+    id: str
+    name: str | None = None
+    start_date: datetime | None = None
+    venue_name: str | None = None
+    city: str | None = None
+    country: str | None = None
+    url: str | None = None
+    favorite_count: int | None = None
+    distance_km: float | None = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SuggestionSchema(BaseModel):
+    kind: str
+    text: str
+    id: Optional[str] = None
+    score: float
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[SuggestionSchema]
+
 class PaginatedEventsResponse(BaseModel):
     events: List[EventSchema]
     total: int
@@ -40,10 +160,16 @@ class PaginatedEventsResponse(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    # Only present when facets were requested
+    facets: Optional[Dict[str, List[FacetCount]]] = None
     class Config:
         orm_mode = True
         from_attributes = True  # For Pydantic v2 compatibility
 
+class PaginatedEventListResponse(PaginatedEventsResponse):
+    """A listing narrowed with ?fields=; events only carry the selected fields"""
+    events: List[EventListItem]
+
 # Query parameters model
 class EventFilters(BaseModel):
     name: Optional[str] = None
@@ -53,7 +179,17 @@ class EventFilters(BaseModel):
     start_date_from: Optional[datetime] = None
     start_date_to: Optional[datetime] = None
     search: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None
+    include_past: bool = False
 
+    @property
+    def origin(self) -> Optional[Tuple[float, float]]:
+        """The (latitude, longitude) of a nearby-events query, if one was given"""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return (self.latitude, self.longitude)
     
     class Config:
         orm_mode = True
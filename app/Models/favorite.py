@@ -8,7 +8,8 @@ class Favorite(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    event_id = Column(String, ForeignKey("events.id", ondelete="CASCADE"))
+    # No foreign key: favorites outlive their event's move to events_archive
+    event_id = Column(String, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
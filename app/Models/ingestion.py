@@ -0,0 +1,61 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, Index
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from app.core.database import Base
+
+class IngestionCheckpoint(Base):
+    __tablename__ = "ingestion_checkpoints"
+
+    # Progress through the Discovery pages of one ingestion keyword
+    keyword = Column(String, primary_key=True)
+    next_page = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime)
+    last_error = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    # queued -> running -> succeeded | failed
+    status = Column(String, nullable=False, default="queued")
+    payload = Column(JSON)
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    # Bumped by the worker while the job runs; a stale one means that worker died
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Workers poll for the oldest runnable queued job
+        Index("ix_ingestion_jobs_status_run_after", "status", "run_after"),
+    )
+
+#pydantic model
+class IngestionJobSchema(BaseModel):
+    id: int
+    kind: str
+    status: str
+    payload: Optional[Dict[str, Any]] = None
+    attempts: int
+    run_after: datetime
+    locked_by: str | None = None
+    error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    heartbeat_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True  # For Pydantic v2 compatibility
+
+class EnqueueJobRequest(BaseModel):
+    kind: str
+    payload: Optional[Dict[str, Any]] = None
@@ -0,0 +1,64 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Dict, List
+from app.core.database import Base
+
+class EventChange(Base):
+    __tablename__ = "event_changes"
+
+    # One row per ingested change to a stored event, fanned out to its favoriters later
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(String, nullable=False, index=True)
+    # {"start_date": {"old": ..., "new": ...}, "venue_id": {...}}
+    changes = Column(JSON, nullable=False)
+    # Indexed for the stream watcher, which pushes changed events to open streams
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Set once every favoriter has a notification
+    fanned_out_at = Column(DateTime)
+
+    __table_args__ = (
+        # The fan-out job picks up the pending changes
+        Index("ix_event_changes_pending", "fanned_out_at", "id"),
+    )
+
+class Notification(Base):
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(String, nullable=False)
+    # The payload lives on the change, not copied into every user's row
+    change_id = Column(Integer, ForeignKey("event_changes.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False, default="event_changed")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    read_at = Column(DateTime)
+
+    change = relationship("EventChange")
+
+    __table_args__ = (
+        # Makes a re-run fan-out idempotent
+        UniqueConstraint("change_id", "user_id", name="uq_notification_change_user"),
+        # Inbox pages, newest first
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+    )
+
+#pydantic model
+class NotificationSchema(BaseModel):
+    id: int
+    event_id: str
+    kind: str
+    changes: Dict[str, Any]
+    created_at: datetime | None = None
+    read_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True  # For Pydantic v2 compatibility
+
+class NotificationInbox(BaseModel):
+    notifications: List[NotificationSchema]
+    unread: int
+    # Pass as before_id to get the next (older) page
+    next_before_id: int | None = None
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, PrimaryKeyConstraint
+from datetime import datetime
+from pydantic import BaseModel
+from app.core.database import Base
+from app.Models.event import EventSchema
+
+class EventNeighbor(Base):
+    __tablename__ = "event_neighbors"
+
+    # Top co-favorited events per event, rebuilt by the build_recommendations job
+    event_id = Column(String, nullable=False)
+    rank = Column(Integer, nullable=False)
+    neighbor_id = Column(String, nullable=False)
+    # Cosine similarity of the two events' sets of favoriting users
+    score = Column(Float, nullable=False)
+    co_favorites = Column(Integer, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # An event's neighbors are one primary-key range, already in rank order
+        PrimaryKeyConstraint("event_id", "rank"),
+    )
+
+#pydantic model
+class RecommendationSchema(BaseModel):
+    event: EventSchema
+    score: float
+    # The saved event this recommendation is most similar to
+    because_event_id: str
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, String, DateTime, Float, Index
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List
+from app.core.database import Base
+
+class Venue(Base):
+    __tablename__ = "venues"
+
+    # Ticketmaster venue id
+    id = Column(String, primary_key=True, index=True)
+    name = Column(String, index=True)
+    city = Column(String, index=True)
+    country = Column(String, index=True)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Bounding-box prefilter for radius queries
+        Index("ix_venues_location", "latitude", "longitude"),
+    )
+
+#pydantic model
+class VenueSchema(BaseModel):
+    id: str
+    name: str | None = None
+    city: str | None = None
+    country: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True  # For Pydantic v2 compatibility
+
+class PaginatedVenuesResponse(BaseModel):
+    venues: List[VenueSchema]
+    total: int
+    page: int
+    per_page: int
+    total_pages: int
+    has_next: bool
+    has_prev: bool
+    class Config:
+        orm_mode = True
+        from_attributes = True  # For Pydantic v2 compatibility
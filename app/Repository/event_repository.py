@@ -1,65 +1,601 @@
 # fastapi_backend/repositories/event_repository.py
-from typing import List
-from sqlalchemy.orm import Session
-from app.Models.event import Event, EventSchema
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from datetime import datetime, timedelta
+import math
+import time
+import weakref
+from sqlalchemy.orm import Session, joinedload
+from app.Models.event import Event, ArchivedEvent, UpcomingEvent, EventSchema
+from app.Models.venue import Venue
 from app.Models.favorite import Favorite, FavoriteSchema
-from sqlalchemy import or_, and_, func
+from app.Models.notification import EventChange
+from sqlalchemy import or_, and_, func, null, insert, update, delete, select, literal, union_all, case, bindparam
 from app.Models.event import PaginatedEventsResponse, EventFilters
+from app.core.trending import favorite_weight, add_favorite_score, remove_favorite_score
+from app.core.geo import bounding_box, haversine_bound, longitude_ranges
+from app.core.cache import event_detail_cache
+from app.core.suggest import SuggestRow
 
-def get_events(db: Session, filters: EventFilters = None):
-        """Builds the base query with filters applied"""
-        query = db.query(Event)
-        
+DEFAULT_RADIUS_KM = 25.0
+
+# Sort keys that don't map directly onto an Event column
+SORT_COLUMNS = {
+    "popularity": Event.favorite_count,
+    "venue_name": Venue.name,
+    "city": Venue.city,
+    "country": Venue.country,
+    "latitude": Venue.latitude,
+    "longitude": Venue.longitude,
+}
+# The summary carries the venue columns itself; other sorts are its own columns too
+UPCOMING_SORT_COLUMNS = {"popularity": UpcomingEvent.favorite_count}
+UPCOMING_SORTS = (
+    "start_date", "name", "created_at", "popularity", "venue_name", "city", "country", "latitude", "longitude"
+)
+# How long a process trusts its last check of whether the summary is filled
+UPCOMING_READY_CHECK_SECONDS = 60.0
+# Engine -> (monotonic time of the last check, whether the summary was filled)
+_upcoming_ready = weakref.WeakKeyDictionary()
+
+def venue_columns(model=Event):
+    """Venue name, city, country and coordinates: joined from venues, or copied into the summary"""
+    if model is UpcomingEvent:
+        return (model.venue_name, model.city, model.country, model.latitude, model.longitude)
+    return (Venue.name, Venue.city, Venue.country, Venue.latitude, Venue.longitude)
+
+def event_columns(model=Event):
+    """Flat event columns in EventSchema field order, from events, events_archive or upcoming_events"""
+    venue_name, city, country, latitude, longitude = venue_columns(model)
+    return (
+        model.id,
+        model.name,
+        model.description,
+        model.start_date,
+        model.venue_id,
+        venue_name.label("venue_name"),
+        city,
+        country,
+        latitude,
+        longitude,
+        model.url,
+        model.created_at,
+        model.favorite_count,
+    )
+
+def list_columns(model=Event, fields: Optional[Sequence[str]] = None):
+    """Listing columns, or only the named ones (see projected_fields), in EventSchema field order"""
+    columns = event_columns(model) + (null().label("distance_km"),)
+    if fields is None:
+        return columns
+    return tuple(column for column in columns if column.key in fields)
+
+# Used for listings and the export
+EXPORT_COLUMNS = event_columns(Event)
+LIST_COLUMNS = list_columns(Event)
+# Fields a listing can be narrowed to with ?fields=
+LIST_FIELDS = tuple(column.key for column in LIST_COLUMNS)
+# Values ?sort_by= accepts: the listing's own columns, since a union with the
+# archive can only be ordered by what it selects; anything else is rejected
+SORT_FIELDS = ("popularity", "distance") + tuple(field for field in LIST_FIELDS if field != "distance_km")
+# Columns refresh_upcoming_events copies from events and venues
+UPCOMING_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+EXPORT_BATCH_SIZE = 1000
+# Facets over the filtered listing; "month" buckets events by start month
+FACET_FIELDS = ("city", "country", "venue_name", "month")
+DEFAULT_FACET_LIMIT = 10
+# Ingested fields whose changes favoriters are notified about
+TRACKED_CHANGE_FIELDS = ("start_date", "venue_id")
+# Past events stay in the live table this long before they are archived
+ARCHIVE_GRACE = timedelta(days=1)
+ARCHIVE_BATCH_SIZE = 500
+# Columns copied verbatim from events into events_archive
+ARCHIVED_FIELDS = ("id", "name", "description", "start_date", "venue_id", "url",
+                   "created_at", "favorite_count", "trending_score")
+
+def projected_fields(fields: Sequence[str], sort_by: str = "start_date", nearby: bool = False) -> Tuple[str, ...]:
+        """
+        The columns a projected listing selects: the requested fields plus the
+        id, what apply_sorting orders by (a union of live and archived rows can
+        only be ordered by selected columns) and, for nearby queries, the
+        coordinates distance_km is computed from.
+        """
+        wanted = {"id", *fields}
+        if sort_by == "distance" and nearby:
+            wanted.update(("latitude", "longitude"))
+        elif sort_by == "popularity":
+            wanted.add("favorite_count")
+        else:
+            wanted.add(sort_by if sort_by in LIST_FIELDS else "start_date")
+        if "distance_km" in wanted and nearby:
+            wanted.update(("latitude", "longitude"))
+        return tuple(field for field in LIST_FIELDS if field in wanted)
+
+def is_upcoming(model=Event):
+    """Events that haven't started yet, or have no date"""
+    return or_(model.start_date.is_(None), model.start_date >= datetime.utcnow())
+
+def listing_source(db: Session, filters: EventFilters = None, sort_by: str = "start_date"):
+        """
+        The table a listing reads: the upcoming_events summary when the query
+        fits it (no archive, no nearby search, a sort it has a column for) and
+        the summary has been filled, events otherwise.
+        """
+        if filters and (filters.include_past or filters.origin):
+            return Event
+        if sort_by not in UPCOMING_SORTS:
+            return Event
+        return UpcomingEvent if upcoming_summary_ready(db) else Event
+
+def upcoming_summary_ready(db: Session) -> bool:
+        """
+        Whether upcoming_events has been filled. It is only ever filled whole
+        (see refresh_upcoming_events), so any row means it is complete. Each
+        process checks at most once per UPCOMING_READY_CHECK_SECONDS.
+        """
+        bind = db.get_bind()
+        checked = _upcoming_ready.get(bind)
+        if checked is not None and time.monotonic() - checked[0] < UPCOMING_READY_CHECK_SECONDS:
+            return checked[1]
+        ready = db.query(UpcomingEvent.id).first() is not None
+        _upcoming_ready[bind] = (time.monotonic(), ready)
+        return ready
+
+def get_events(db: Session, filters: EventFilters = None, fields: Optional[Sequence[str]] = None, model=Event):
+        """
+        Builds the base query with filters applied. Listings only see upcoming
+        events unless include_past is set, which also unions in the archive.
+        With fields, only those columns are selected (see projected_fields).
+        model=UpcomingEvent reads the summary instead (see listing_source).
+        """
+        if model is UpcomingEvent:
+            # Already joined to venues; the filter drops rows that started since the last refresh
+            query = filter_events(db.query(*list_columns(UpcomingEvent, fields)), filters, UpcomingEvent)
+            return query.filter(is_upcoming(UpcomingEvent))
+
+        # Listings select plain row tuples: no ORM objects, no identity map
+        query = db.query(*list_columns(Event, fields)).select_from(Event).outerjoin(Event.venue)
+        query = filter_events(query, filters)
+        if not (filters and filters.include_past):
+            return query.filter(is_upcoming(Event))
+
+        archived = db.query(*list_columns(ArchivedEvent, fields))
+        archived = archived.select_from(ArchivedEvent).outerjoin(ArchivedEvent.venue)
+        return query.union_all(filter_events(archived, filters, ArchivedEvent))
+
+def filter_events(query, filters: EventFilters = None, model=Event):
+        """Applies EventFilters to a query over events or the archive joined to venues, or over upcoming_events"""
         if not filters:
             return query
             
         filter_conditions = []
+        venue_name, city, country, _, _ = venue_columns(model)
         
         if filters.name:
-            filter_conditions.append(Event.name.ilike(f"%{filters.name}%"))
+            filter_conditions.append(model.name.ilike(f"%{filters.name}%"))
         
         if filters.city:
-            filter_conditions.append(Event.city.ilike(f"%{filters.city}%"))
+            filter_conditions.append(city.ilike(f"%{filters.city}%"))
         
         if filters.country:
-            filter_conditions.append(Event.country.ilike(f"%{filters.country}%"))
+            filter_conditions.append(country.ilike(f"%{filters.country}%"))
         
         if filters.venue_name:
-            filter_conditions.append(Event.venue_name.ilike(f"%{filters.venue_name}%"))
+            filter_conditions.append(venue_name.ilike(f"%{filters.venue_name}%"))
         
         if filters.start_date_from:
-            filter_conditions.append(Event.start_date >= filters.start_date_from)
+            filter_conditions.append(model.start_date >= filters.start_date_from)
         
         if filters.start_date_to:
-            filter_conditions.append(Event.start_date <= filters.start_date_to)
+            filter_conditions.append(model.start_date <= filters.start_date_to)
         
         if filters.search:
             search_term = f"%{filters.search}%"
             search_conditions = or_(
-                Event.name.ilike(search_term),
-                Event.description.ilike(search_term),
-                Event.venue_name.ilike(search_term),
-                Event.city.ilike(search_term)
+                model.name.ilike(search_term),
+                model.description.ilike(search_term),
+                venue_name.ilike(search_term),
+                city.ilike(search_term)
             )
             filter_conditions.append(search_conditions)
+
+        if filters.origin:
+            lat, lng = filters.origin
+            radius_km = filters.radius_km or DEFAULT_RADIUS_KM
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+            # Index-friendly box first, then trim its corners to the circle with the
+            # same haversine distance that distance_km reports
+            filter_conditions.append(Venue.latitude.between(min_lat, max_lat))
+            filter_conditions.append(or_(*(
+                Venue.longitude.between(low, high) for low, high in longitude_ranges(min_lng, max_lng)
+            )))
+            filter_conditions.append(haversine_term(lat, lng) <= haversine_bound(radius_km))
         
         if filter_conditions:
             query = query.filter(and_(*filter_conditions))
             
         return query
+def stream_events(db: Session, filters: EventFilters = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yields filtered events as flat rows through a server-side cursor,
+    fetching batch_size rows at a time without building ORM objects.
+    """
+    query = filter_events(db.query(*EXPORT_COLUMNS).select_from(Event).outerjoin(Event.venue), filters)
+    # Same rows as the listing for the same filters: upcoming only unless include_past
+    if not (filters and filters.include_past):
+        query = query.filter(is_upcoming(Event))
+    else:
+        archived = db.query(*event_columns(ArchivedEvent)).select_from(ArchivedEvent).outerjoin(ArchivedEvent.venue)
+        query = query.union_all(filter_events(archived, filters, ArchivedEvent))
+    query = query.order_by(Event.id)
+    yield from query.execution_options(yield_per=batch_size)
+
+def month_bucket(db: Session, start_date):
+    """YYYY-MM of a start date, in the backend's own date formatting"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(start_date, "YYYY-MM")
+    return func.strftime("%Y-%m", start_date)
+
+def get_facets(
+    db: Session,
+    filters: EventFilters = None,
+    fields: Sequence[str] = FACET_FIELDS,
+    limit: int = DEFAULT_FACET_LIMIT,
+    model=Event
+) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Top value counts for each facet over the filtered events, in one query:
+    a UNION ALL of per-facet GROUP BYs over the filtered rows, ranked with a
+    window function. Months come back in date order, other facets by count.
+    """
+    if not fields:
+        return {}
+    filtered = get_events(db, filters, model=model).subquery()
+    # Column names of a union subquery differ from the plain one; positions don't
+    columns = dict(zip((column.key for column in LIST_COLUMNS), filtered.c))
+    columns["month"] = month_bucket(db, columns["start_date"])
+
+    grouped = union_all(*(
+        select(literal(field).label("facet"), columns[field].label("value"), func.count().label("count"))
+        .select_from(filtered)
+        .where(columns[field].isnot(None))
+        .group_by(columns[field])
+        for field in fields
+    )).subquery()
+    rank = func.row_number().over(
+        partition_by=grouped.c.facet,
+        order_by=(case((grouped.c.facet == "month", 0), else_=-grouped.c["count"]), grouped.c.value)
+    ).label("rank")
+    ranked = select(grouped, rank).subquery()
+
+    facets = {field: [] for field in fields}
+    rows = db.execute(
+        select(ranked.c.facet, ranked.c.value, ranked.c["count"])
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.facet, ranked.c.rank)
+    )
+    for facet, value, count in rows:
+        facets[facet].append((value, count))
+    return facets
+
+def refresh_upcoming_events(
+    db: Session,
+    event_ids: Optional[Iterable[str]] = None,
+    venue_ids: Sequence[str] = ()
+) -> None:
+    """
+    Bring upcoming_events in line with events and venues: rewrite the rows of
+    the given events and of every event at the given (changed) venues, or
+    every row when no ids are given or the summary is still empty (a partly
+    filled summary would be served as complete). Rows of events that have
+    started are dropped either way. Runs as one transaction, so listings
+    keep reading the previous rows until it commits.
+    """
+    if event_ids is not None and db.query(UpcomingEvent.id).first() is None:
+        event_ids = None
+    stale = delete(UpcomingEvent)
+    fresh = select(*EXPORT_COLUMNS).select_from(Event).outerjoin(Event.venue).where(is_upcoming(Event))
+    if event_ids is not None:
+        event_ids = list(event_ids)
+        stale = stale.where(or_(
+            UpcomingEvent.id.in_(event_ids),
+            UpcomingEvent.venue_id.in_(venue_ids),
+            UpcomingEvent.start_date < datetime.utcnow()
+        ))
+        fresh = fresh.where(or_(Event.id.in_(event_ids), Event.venue_id.in_(venue_ids)))
+    db.execute(stale)
+    db.execute(insert(UpcomingEvent).from_select(UPCOMING_FIELDS, fresh))
+    db.commit()
+    # A first fill should be routed to right away, not after the cached check expires
+    _upcoming_ready.pop(db.get_bind(), None)
+
+def archive_past_events(db: Session, before: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move one batch of events that started before `before` into events_archive,
+    oldest first. Returns how many were moved; 0 means nothing is left.
+    """
+    event_ids = [
+        event_id for (event_id,) in db.query(Event.id)
+        .filter(Event.start_date < before)
+        .order_by(Event.start_date)
+        .limit(batch_size)
+    ]
+    if not event_ids:
+        return 0
+    copied = select(*(getattr(Event, field) for field in ARCHIVED_FIELDS), literal(datetime.utcnow()))
+    copied = copied.where(Event.id.in_(event_ids))
+    columns = ARCHIVED_FIELDS + ("archived_at",)
+    # An id can be archived already when the event came back live; the newer copy wins
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+    if dialect_insert is None:
+        db.execute(delete(ArchivedEvent).where(ArchivedEvent.id.in_(event_ids)))
+        db.execute(insert(ArchivedEvent).from_select(columns, copied))
+    else:
+        statement = dialect_insert(ArchivedEvent).from_select(columns, copied)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[ArchivedEvent.id],
+            set_={field: statement.excluded[field] for field in columns if field != "id"}
+        ))
+    db.execute(delete(Event).where(Event.id.in_(event_ids)))
+    db.commit()
+    event_detail_cache.invalidate(*event_ids)
+    return len(event_ids)
+
+def restore_archived_events(db: Session, rows: List[dict], before: datetime) -> Set[str]:
+    """
+    Ingested rows whose ids are already in events_archive. Those rescheduled to
+    start at or after `before` are moved back into events, so update_changed_events
+    applies and logs their new date. Returns the ids of the rest, which
+    ingestion skips so they aren't stored live again.
+    """
+    if not rows:
+        return set()
+    rows = {row["id"]: row for row in rows}
+    archived_ids = {
+        event_id for (event_id,) in db.query(ArchivedEvent.id).filter(ArchivedEvent.id.in_(list(rows)))
+    }
+    if not archived_ids:
+        return set()
+    restored = [
+        event_id for event_id in archived_ids
+        if rows[event_id].get("start_date") is not None and rows[event_id]["start_date"] >= before
+    ]
+    if restored:
+        copied = select(*(getattr(ArchivedEvent, field) for field in ARCHIVED_FIELDS))
+        db.execute(insert(Event).from_select(ARCHIVED_FIELDS, copied.where(ArchivedEvent.id.in_(restored))))
+        db.execute(delete(ArchivedEvent).where(ArchivedEvent.id.in_(restored)))
+        db.commit()
+        event_detail_cache.invalidate(*restored)
+    return archived_ids - set(restored)
+
+def haversine_term(lat: float, lng: float):
+    """
+    The haversine term a of haversine_km between venues and a point, in SQL.
+    It grows with the distance, so it filters against haversine_bound and sorts
+    nearest first exactly as distance_km is reported. sin² of half the longitude
+    difference is the same either way round the antimeridian.
+    """
+    half_d_lat = func.sin(func.radians(Venue.latitude - lat) / 2)
+    half_d_lng = func.sin(func.radians(Venue.longitude - lng) / 2)
+    return (
+        half_d_lat * half_d_lat
+        + math.cos(math.radians(lat)) * func.cos(func.radians(Venue.latitude)) * half_d_lng * half_d_lng
+    )
+
+def update_event_counters(db: Session, event_id: str, favorite_count: int, trending_score: Optional[float]) -> None:
+    # Keyed on id alone: on PostgreSQL start_date is part of the partitioned table's key
+    db.query(Event).filter(Event.id == event_id).update(
+        {Event.favorite_count: favorite_count, Event.trending_score: trending_score},
+        synchronize_session="fetch"
+    )
+    # Keeps popularity sorts on the summary current between ingestion refreshes
+    db.query(UpcomingEvent).filter(UpcomingEvent.id == event_id).update(
+        {UpcomingEvent.favorite_count: favorite_count}, synchronize_session=False
+    )
+
 def save_event_repository(event_id: str, db: Session, user: int) -> FavoriteSchema:
-    event = db.query(Event).filter(Event.id == event_id).first()
+    # Lock the event row so concurrent saves don't lose counter updates
+    event = db.query(Event).filter(Event.id == event_id).with_for_update().first()
     if not event:
         raise ValueError(f"Event with id {event_id} not found")
     
     # Assuming you have a Favorite model to save the favorite event
-    favorite = Favorite(user_id=user.id, event_id=event.id)
+    favorite = Favorite(user_id=user.id, event_id=event.id, created_at=datetime.utcnow())
     db.add(favorite)
+    update_event_counters(
+        db,
+        event_id,
+        (event.favorite_count or 0) + 1,
+        add_favorite_score(event.trending_score, favorite_weight(favorite.created_at))
+    )
     db.commit()
     db.refresh(favorite)
+    # Only the counters moved; other processes pick them up when their entry's TTL ends
+    event_detail_cache.evict(event_id)
     
     return FavoriteSchema.from_orm(favorite)  # Convert to EventSchema for response
 
+def unsave_event_repository(event_id: str, db: Session, user: int) -> None:
+    """
+    Remove a favorite and roll its contribution back out of the event counters.
+    """
+    favorite = db.query(Favorite).filter(Favorite.event_id == event_id, Favorite.user_id == user.id).first()
+    if not favorite:
+        raise ValueError(f"Event with id {event_id} is not saved by user")
+
+    event = db.query(Event).filter(Event.id == event_id).with_for_update().first()
+    if event:
+        update_event_counters(
+            db,
+            event_id,
+            max((event.favorite_count or 0) - 1, 0),
+            remove_favorite_score(event.trending_score, favorite_weight(favorite.created_at))
+        )
+    db.delete(favorite)
+    db.commit()
+    event_detail_cache.evict(event_id)
+
+def insert_new_events(db: Session, rows: List[dict]) -> List[str]:
+    """
+    Bulk insert event rows whose ids aren't stored yet, as one executemany.
+    Returns the ids that were inserted.
+    """
+    if not rows:
+        return []
+    ids = [row["id"] for row in rows]
+    existing_ids = {event_id for (event_id,) in db.query(Event.id).filter(Event.id.in_(ids)).all()}
+    new_rows = {row["id"]: row for row in rows if row["id"] not in existing_ids}
+    if new_rows:
+        db.execute(insert(Event), list(new_rows.values()))
+    db.commit()
+    event_detail_cache.invalidate(*new_rows)
+    return list(new_rows)
+
+def get_suggest_rows(db: Session, since: Optional[datetime] = None) -> List[SuggestRow]:
+    """
+    Upcoming events with their venue, as loaded into the typeahead index.
+    With `since`, only events created at or after it.
+    """
+    query = (
+        db.query(Event.id, Event.name, Event.venue_id, Venue.name, Venue.city, Event.favorite_count, Event.created_at)
+        .outerjoin(Venue, Event.venue_id == Venue.id)
+        .filter(or_(Event.start_date.is_(None), Event.start_date >= datetime.utcnow()))
+    )
+    if since is not None:
+        query = query.filter(Event.created_at >= since)
+    return [SuggestRow(*row) for row in query]
+
+def _change_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def update_changed_events(db: Session, rows: List[dict]) -> Tuple[Set[str], int]:
+    """
+    Compare ingested rows with the stored events of the same ids. Changed start
+    dates and venues are applied in one executemany and logged to event_changes
+    for the notification fan-out; a missing new value never erases a stored one.
+    Returns the ids already stored and how many of them changed.
+    """
+    if not rows:
+        return set(), 0
+    rows = {row["id"]: row for row in rows}
+    stored = {
+        event_id: dict(zip(TRACKED_CHANGE_FIELDS, values))
+        for event_id, *values in db.query(Event.id, Event.start_date, Event.venue_id).filter(Event.id.in_(list(rows)))
+    }
+    updates, changes = [], []
+    for event_id, old in stored.items():
+        row = rows[event_id]
+        diff = {
+            field: {"old": _change_value(old[field]), "new": _change_value(row[field])}
+            for field in TRACKED_CHANGE_FIELDS
+            if row.get(field) is not None and row[field] != old[field]
+        }
+        if diff:
+            new = {field: row[field] if field in diff else old[field] for field in TRACKED_CHANGE_FIELDS}
+            updates.append({"b_id": event_id, **{f"b_{field}": value for field, value in new.items()}})
+            changes.append({"event_id": event_id, "changes": diff})
+    if updates:
+        events = Event.__table__
+        db.execute(
+            update(events)
+            .where(events.c.id == bindparam("b_id"))
+            .values({field: bindparam(f"b_{field}") for field in TRACKED_CHANGE_FIELDS}),
+            updates
+        )
+        db.execute(insert(EventChange), changes)
+        db.commit()
+        event_detail_cache.invalidate(*(change["event_id"] for change in changes))
+    return set(stored), len(changes)
+
+def get_catalog_watermark(db: Session) -> Tuple[Optional[datetime], Optional[int]]:
+    """
+    Newest event creation time and newest event change id: moves whenever
+    ingestion stores or re-dates an event, read from two index-only lookups
+    """
+    return db.query(
+        select(func.max(Event.created_at)).scalar_subquery(),
+        select(func.max(EventChange.id)).scalar_subquery()
+    ).one()
+
+def get_events_changed_since(db: Session, since: datetime, limit: int = EXPORT_BATCH_SIZE):
+    """
+    Events whose date or venue ingestion changed at or after `since`, least
+    recently changed first, as listing rows plus the time of their last change
+    """
+    latest = (
+        select(EventChange.event_id, func.max(EventChange.created_at).label("changed_at"))
+        .where(EventChange.created_at >= since)
+        .group_by(EventChange.event_id)
+        .subquery()
+    )
+    return (
+        db.query(*LIST_COLUMNS, latest.c.changed_at)
+        .select_from(Event)
+        .join(latest, latest.c.event_id == Event.id)
+        .outerjoin(Event.venue)
+        .order_by(latest.c.changed_at)
+        .limit(limit)
+        .all()
+    )
+
+def get_events_created_since(db: Session, since: datetime, limit: int = EXPORT_BATCH_SIZE):
+    """Events created at or after `since`, oldest first, as listing rows"""
+    return (
+        db.query(*LIST_COLUMNS)
+        .select_from(Event)
+        .outerjoin(Event.venue)
+        .filter(Event.created_at >= since)
+        .order_by(Event.created_at)
+        .limit(limit)
+        .all()
+    )
+
+def get_events_by_ids(db: Session, event_ids: List[str]) -> Dict[str, EventSchema]:
+    """
+    Get events by id, served from the hot-object cache where possible.
+    Misses are loaded with one IN query and cached; unknown ids are left out.
+    """
+    events = event_detail_cache.get_many(event_ids)
+    missing = [event_id for event_id in dict.fromkeys(event_ids) if event_id not in events]
+    if missing:
+        rows = (
+            db.query(*LIST_COLUMNS)
+            .select_from(Event)
+            .outerjoin(Event.venue)
+            .filter(Event.id.in_(missing))
+            .all()
+        )
+        for row in rows:
+            event = EventSchema.from_orm(row)
+            event_detail_cache.set(event.id, event)
+            events[event.id] = event
+    return events
+
+def get_event_by_id(db: Session, event_id: str) -> Optional[EventSchema]:
+    """
+    Get a single event by id, or None if it doesn't exist.
+    """
+    return get_events_by_ids(db, [event_id]).get(event_id)
+
+def get_trending_events(db: Session, limit: int) -> List[EventSchema]:
+    """
+    Get the highest scored trending events, served by the trending_score index.
+    """
+    events = (
+        db.query(Event)
+        .options(joinedload(Event.venue))
+        .filter(Event.trending_score.isnot(None))
+        .order_by(Event.trending_score.desc())
+        .limit(limit)
+        .all()
+    )
+    return [EventSchema.from_orm(event) for event in events]
+
 def get_favorites_repository(db: Session, user: int) -> List[FavoriteSchema]:
     """
     Get all favorite events for the current user.
@@ -72,7 +608,7 @@ def event_exists(event_id: str, db: Session) -> bool:
     """
     Check if an event exists in the database.
     """
-    return db.query(Event).filter(Event.id == event_id).first() is not None
+    return get_event_by_id(db, event_id) is not None
 
 #check if the favorite exists
 def favorite_exists(event_id: str, user: int, db: Session) -> bool:
@@ -85,9 +621,13 @@ def get_total_count(query):
         """Returns the total count of records"""
         return query.count()
 
-def apply_sorting(query, sort_by: str = "start_date", sort_order: str = "asc"):
-        """Applies sorting to the query"""
-        sort_column = getattr(Event, sort_by, Event.start_date)
+def apply_sorting(query, sort_by: str = "start_date", sort_order: str = "asc", origin=None, model=Event):
+        """Applies sorting to the query, over events or the upcoming_events summary"""
+        if sort_by == "distance" and origin:
+            sort_column = haversine_term(*origin)
+        else:
+            columns = UPCOMING_SORT_COLUMNS if model is UpcomingEvent else SORT_COLUMNS
+            sort_column = columns.get(sort_by) or getattr(model, sort_by, model.start_date)
         if sort_order.lower() == "desc":
             return query.order_by(sort_column.desc())
         return query.order_by(sort_column.asc())
@@ -0,0 +1,151 @@
+# repositories/ingestion_repository.py
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.Models.ingestion import IngestionCheckpoint, IngestionJob
+
+def get_checkpoints(db: Session, keywords: List[str]) -> Dict[str, IngestionCheckpoint]:
+    """Get the stored checkpoints for the given keywords"""
+    checkpoints = db.query(IngestionCheckpoint).filter(IngestionCheckpoint.keyword.in_(keywords)).all()
+    return {checkpoint.keyword: checkpoint for checkpoint in checkpoints}
+
+def order_keywords_by_checkpoint(db: Session, keywords: List[str]) -> List[str]:
+    """
+    Order keywords so unfinished and least recently completed ones run first.
+    A cycle cut short by upstream failures then resumes where it stopped.
+    """
+    checkpoints = get_checkpoints(db, keywords)
+
+    def sort_key(keyword: str):
+        checkpoint = checkpoints.get(keyword)
+        if checkpoint is None or checkpoint.completed_at is None:
+            return (0, datetime.min)
+        return (1, checkpoint.completed_at)
+
+    return sorted(keywords, key=sort_key)
+
+def get_next_page(db: Session, keyword: str) -> int:
+    """Page to resume a keyword from"""
+    checkpoint = db.get(IngestionCheckpoint, keyword)
+    return checkpoint.next_page if checkpoint else 0
+
+def save_checkpoint(
+    db: Session,
+    keyword: str,
+    next_page: int,
+    completed: bool = False,
+    error: Optional[str] = None
+) -> IngestionCheckpoint:
+    """Record progress for a keyword; a completed keyword starts over from page 0 next cycle"""
+    checkpoint = db.get(IngestionCheckpoint, keyword)
+    if checkpoint is None:
+        checkpoint = IngestionCheckpoint(keyword=keyword)
+        db.add(checkpoint)
+    checkpoint.next_page = 0 if completed else next_page
+    checkpoint.last_error = error
+    if completed:
+        checkpoint.completed_at = datetime.utcnow()
+    checkpoint.updated_at = datetime.utcnow()
+    db.commit()
+    return checkpoint
+
+def enqueue_job(db: Session, kind: str, payload: Optional[dict] = None, dedupe: bool = True) -> IngestionJob:
+    """
+    Queue a job for the ingestion worker. With dedupe, a queued or running job
+    of the same kind is returned instead, so duplicates don't stack up and two
+    workers never run the same kind of cycle at once.
+    """
+    if dedupe:
+        pending = (
+            db.query(IngestionJob)
+            .filter(IngestionJob.kind == kind, IngestionJob.status.in_(("queued", "running")))
+            .order_by(IngestionJob.id)
+            .first()
+        )
+        if pending:
+            return pending
+    job = IngestionJob(kind=kind, payload=payload, status="queued", run_after=datetime.utcnow())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[IngestionJob]:
+    """
+    Atomically take the oldest runnable queued job and mark it running.
+    PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED so workers never block
+    each other; other backends claim with a compare-and-set UPDATE instead.
+    """
+    now = datetime.utcnow()
+    runnable = (
+        db.query(IngestionJob)
+        .filter(IngestionJob.status == "queued", IngestionJob.run_after <= now)
+        .order_by(IngestionJob.id)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        job = runnable.with_for_update(skip_locked=True).first()
+        if job is None:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.locked_by = worker_id
+        job.started_at = now
+        job.heartbeat_at = now
+        job.attempts += 1
+        db.commit()
+        return job
+
+    for (job_id,) in runnable.with_entities(IngestionJob.id).limit(10).all():
+        claimed = (
+            db.query(IngestionJob)
+            .filter(IngestionJob.id == job_id, IngestionJob.status == "queued")
+            .update({
+                IngestionJob.status: "running",
+                IngestionJob.locked_by: worker_id,
+                IngestionJob.started_at: now,
+                IngestionJob.heartbeat_at: now,
+                IngestionJob.attempts: IngestionJob.attempts + 1,
+            }, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            return db.get(IngestionJob, job_id)
+    return None
+
+def finish_job(db: Session, job: IngestionJob, error: Optional[str] = None) -> IngestionJob:
+    """Mark a claimed job as succeeded, or failed with its error"""
+    job.status = "failed" if error else "succeeded"
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.commit()
+    return job
+
+def heartbeat_job(db: Session, job_id: int, worker_id: str) -> bool:
+    """Record that a claimed job is still running; False once the job is no longer this worker's"""
+    beat = (
+        db.query(IngestionJob)
+        .filter(IngestionJob.id == job_id, IngestionJob.status == "running", IngestionJob.locked_by == worker_id)
+        .update({IngestionJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(beat)
+
+def requeue_stale_jobs(db: Session, older_than: timedelta) -> int:
+    """Put running jobs whose worker stopped sending heartbeats back on the queue"""
+    last_seen = func.coalesce(IngestionJob.heartbeat_at, IngestionJob.started_at)
+    requeued = (
+        db.query(IngestionJob)
+        .filter(IngestionJob.status == "running", last_seen < datetime.utcnow() - older_than)
+        .update({IngestionJob.status: "queued", IngestionJob.locked_by: None}, synchronize_session=False)
+    )
+    db.commit()
+    return requeued
+
+def get_recent_jobs(db: Session, limit: int = 50, status: Optional[str] = None) -> List[IngestionJob]:
+    """Most recent jobs, newest first"""
+    query = db.query(IngestionJob)
+    if status:
+        query = query.filter(IngestionJob.status == status)
+    return query.order_by(IngestionJob.id.desc()).limit(limit).all()
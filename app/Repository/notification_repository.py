@@ -0,0 +1,86 @@
+# repositories/notification_repository.py
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import insert, update, func
+from sqlalchemy.orm import Session, joinedload
+from app.Models.favorite import Favorite
+from app.Models.notification import EventChange, Notification
+
+def get_pending_changes(db: Session, limit: int) -> List[EventChange]:
+    """Oldest changes not fanned out yet"""
+    return (
+        db.query(EventChange)
+        .filter(EventChange.fanned_out_at.is_(None))
+        .order_by(EventChange.id)
+        .limit(limit)
+        .all()
+    )
+
+def get_favoriters_page(db: Session, event_ids: List[str], after_id: int, limit: int):
+    """
+    One keyset page of (favorite id, user id, event id) for the given events,
+    so fanning out an event favorited by many users never loads them all at once.
+    """
+    return (
+        db.query(Favorite.id, Favorite.user_id, Favorite.event_id)
+        .filter(Favorite.event_id.in_(event_ids), Favorite.id > after_id)
+        .order_by(Favorite.id)
+        .limit(limit)
+        .all()
+    )
+
+def insert_notifications(db: Session, rows: List[dict]) -> None:
+    """Bulk insert notifications, skipping ones a previous, interrupted run already wrote"""
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = dialect_insert(Notification).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(Notification).on_conflict_do_nothing()
+    else:
+        statement = insert(Notification)
+    db.execute(statement, rows)
+    db.commit()
+
+def mark_changes_fanned_out(db: Session, change_ids: List[int]) -> None:
+    db.execute(
+        update(EventChange)
+        .where(EventChange.id.in_(change_ids))
+        .values(fanned_out_at=datetime.utcnow())
+    )
+    db.commit()
+
+def has_pending_changes(db: Session) -> bool:
+    return db.query(EventChange.id).filter(EventChange.fanned_out_at.is_(None)).first() is not None
+
+def get_inbox(db: Session, user_id: int, before_id: Optional[int], limit: int, unread_only: bool = False) -> List[Notification]:
+    """A user's notifications newest first, keyset-paginated on id"""
+    query = (
+        db.query(Notification)
+        .options(joinedload(Notification.change))
+        .filter(Notification.user_id == user_id)
+    )
+    if before_id is not None:
+        query = query.filter(Notification.id < before_id)
+    if unread_only:
+        query = query.filter(Notification.read_at.is_(None))
+    return query.order_by(Notification.id.desc()).limit(limit).all()
+
+def count_unread(db: Session, user_id: int) -> int:
+    return (
+        db.query(func.count(Notification.id))
+        .filter(Notification.user_id == user_id, Notification.read_at.is_(None))
+        .scalar()
+    )
+
+def mark_read(db: Session, user_id: int, up_to_id: Optional[int] = None) -> int:
+    """Marks a user's unread notifications read, up to and including up_to_id if given"""
+    query = update(Notification).where(Notification.user_id == user_id, Notification.read_at.is_(None))
+    if up_to_id is not None:
+        query = query.where(Notification.id <= up_to_id)
+    result = db.execute(query.values(read_at=datetime.utcnow()))
+    db.commit()
+    return result.rowcount
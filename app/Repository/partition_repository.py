@@ -0,0 +1,111 @@
+# repositories/partition_repository.py
+import re
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.Repository.event_repository import ARCHIVED_FIELDS
+from app.core.cache import event_detail_cache
+
+# Monthly partitions created ahead of the current month
+PARTITION_MONTHS_AHEAD = 12
+DEFAULT_PARTITION = "events_default"
+PARTITION_NAME = re.compile(r"^events_y(\d{4})m(\d{2})$")
+
+# Partitions this process already knows exist, so ingestion skips the DDL round trip
+_known_partitions = set()
+
+def is_partitioned(db: Session) -> bool:
+    """events is range partitioned by month on PostgreSQL only"""
+    return db.get_bind().dialect.name == "postgresql"
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"events_y{month.year}m{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a partition covers, or None for the default partition"""
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def partition_ddl(month: date) -> List[str]:
+    """
+    Statements that create one month's partition. Rows of that month already
+    in the default partition are moved into it first, since attaching a range
+    the default partition still holds rows for would fail.
+    """
+    name, start, end = partition_name(month), month.isoformat(), add_months(month, 1).isoformat()
+    return [
+        f"CREATE TABLE {name} (LIKE events INCLUDING DEFAULTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE start_date >= '{start}' AND start_date < '{end}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE events ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+def get_event_partitions(db: Session) -> List[str]:
+    """Names of the partitions currently attached to events"""
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "WHERE parent.relname = 'events'"
+    ))
+    return [name for (name,) in rows]
+
+def ensure_event_partitions(db: Session, dates: Iterable[date]) -> List[str]:
+    """Create the monthly partitions covering the given dates; returns the ones created"""
+    if not is_partitioned(db):
+        return []
+    months = {month_start(value) for value in dates if value} - _known_partitions
+    if not months:
+        return []
+    existing = set(get_event_partitions(db))
+    created = []
+    for month in sorted(months):
+        if partition_name(month) not in existing:
+            for statement in partition_ddl(month):
+                db.execute(text(statement))
+            db.commit()
+            created.append(partition_name(month))
+        _known_partitions.add(month)
+    return created
+
+def ensure_upcoming_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """Keep partitions in place for the current month and the next months_ahead"""
+    this_month = month_start(datetime.utcnow().date())
+    return ensure_event_partitions(db, (add_months(this_month, i) for i in range(months_ahead + 1)))
+
+def archive_event_partitions(db: Session, before: datetime) -> int:
+    """
+    Archive whole months that ended before `before`: copy each partition into
+    events_archive, then detach and drop it. Dropping a partition is a cheap
+    metadata change, unlike deleting its rows from a single table.
+    Returns the number of rows archived.
+    """
+    if not is_partitioned(db):
+        return 0
+    columns = ", ".join(ARCHIVED_FIELDS)
+    archived = 0
+    for name in sorted(get_event_partitions(db)):
+        month = partition_month(name)
+        if month is None or datetime.combine(add_months(month, 1), datetime.min.time()) > before:
+            continue
+        result = db.execute(text(
+            f"INSERT INTO events_archive ({columns}, archived_at) "
+            f"SELECT {columns}, now() FROM {name} ON CONFLICT (id) DO NOTHING"
+        ))
+        db.execute(text(f"ALTER TABLE events DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        _known_partitions.discard(month)
+        archived += result.rowcount
+    if archived:
+        event_detail_cache.clear()
+    return archived
@@ -0,0 +1,51 @@
+# repositories/recommendation_repository.py
+from typing import Iterable, Iterator, List, Tuple
+from sqlalchemy import insert, delete, select
+from sqlalchemy.orm import Session
+from app.Models.favorite import Favorite
+from app.Models.recommendation import EventNeighbor
+
+# Most recent favorites a user's recommendations are seeded from
+RECOMMENDATION_SEEDS = 50
+FAVORITES_BATCH_SIZE = 10000
+NEIGHBORS_INSERT_BATCH = 5000
+
+def iter_favorite_pairs(db: Session, batch_size: int = FAVORITES_BATCH_SIZE) -> Iterator[Tuple[int, str]]:
+    """Every (user_id, event_id) favorite, streamed through a server-side cursor"""
+    query = db.query(Favorite.user_id, Favorite.event_id).execution_options(yield_per=batch_size)
+    for user_id, event_id in query:
+        yield user_id, event_id
+
+def replace_event_neighbors(db: Session, rows: Iterable[dict], batch_size: int = NEIGHBORS_INSERT_BATCH) -> int:
+    """
+    Swap in a freshly computed neighbor table in one transaction, so
+    readers see either the old or the new neighbors, never a mix.
+    """
+    db.execute(delete(EventNeighbor))
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(EventNeighbor), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(EventNeighbor), batch)
+        written += len(batch)
+    db.commit()
+    return written
+
+def get_recommendation_candidates(db: Session, user_id: int, seeds: int = RECOMMENDATION_SEEDS) -> List[Tuple[str, str, float]]:
+    """
+    (seed event, neighbor, score) for the neighbors of a user's most recent
+    favorites that the user hasn't saved, in one query over the neighbor key.
+    """
+    favorites = select(Favorite.event_id).where(Favorite.user_id == user_id)
+    recent = favorites.order_by(Favorite.created_at.desc(), Favorite.id.desc()).limit(seeds).subquery()
+    return (
+        db.query(EventNeighbor.event_id, EventNeighbor.neighbor_id, EventNeighbor.score)
+        .join(recent, recent.c.event_id == EventNeighbor.event_id)
+        .filter(EventNeighbor.neighbor_id.not_in(favorites))
+        .all()
+    )
@@ -39,22 +39,64 @@ class UserRepository:
             return None
     
     def get_or_create_user(self, email: str, name: str = None) -> Optional[User]:
-        """Get existing user or create new one if doesn't exist"""
+        """
+        Get existing user or create new one if doesn't exist. A returning user
+        whose name has not changed costs one indexed read and no write; new
+        users and renames go through a single upsert statement.
+        """
         user = self.get_user_by_email(email)
+        if user and (not name or user.name == name):
+            return user
+        if self.db.get_bind().dialect.name in ("postgresql", "sqlite"):
+            return self.upsert_user(email, name)
         if not user:
-            user = self.create_user(email, name)
-        else:
-            # Update name if provided and different
-            if name and user.name != name:
-                user.name = name
-                try:
-                    self.db.commit()
-                    self.db.refresh(user)
-                    logger.info(f"Updated name for user {email}")
-                except Exception as e:
-                    logger.error(f"Error updating user name: {e}")
-                    self.db.rollback()
+            return self.create_user(email, name)
+        # Update name if provided and different
+        user.name = name
+        try:
+            self.db.commit()
+            self.db.refresh(user)
+            logger.info(f"Updated name for user {email}")
+        except Exception as e:
+            logger.error(f"Error updating user name: {e}")
+            self.db.rollback()
         return user
+
+    def upsert_user(self, email: str, name: str = None) -> Optional[User]:
+        """
+        Insert the user, or set its name, with one INSERT ... ON CONFLICT ...
+        RETURNING. The name is only written when it is given and differs, so
+        concurrent logins of the same user write the row once.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(User).values(email=email, name=name)
+        if name:
+            statement = statement.on_conflict_do_update(
+                index_elements=[User.email],
+                set_={"name": statement.excluded.name},
+                where=User.name.is_distinct_from(statement.excluded.name)
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[User.email])
+        try:
+            user = self.db.scalars(
+                statement.returning(User), execution_options={"populate_existing": True}
+            ).first()
+            if user is None:
+                # A concurrent login stored the same row first, so the upsert had nothing to write
+                user = self.db.query(User).filter(User.email == email).one()
+            # Detached so the commit does not expire it and reload it on first access
+            self.db.expunge(user)
+            self.db.commit()
+            logger.info(f"Provisioned user: {email}")
+            return user
+        except Exception as e:
+            logger.error(f"Error provisioning user {email}: {e}")
+            self.db.rollback()
+            return None
     
     def update_user(self, user_id: int, **kwargs) -> Optional[User]:
         """Update user information"""
@@ -0,0 +1,91 @@
+# repositories/venue_repository.py
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func
+from app.Models.event import Event
+from app.Models.venue import Venue
+from app.core.cache import event_detail_cache
+
+# Venue details ingestion keeps in line with Ticketmaster
+VENUE_FIELDS = ("name", "city", "country", "latitude", "longitude")
+
+def get_venues(db: Session, name: Optional[str] = None, city: Optional[str] = None, country: Optional[str] = None):
+    """Builds the venue browse query with filters applied"""
+    query = db.query(Venue)
+    filter_conditions = []
+
+    if name:
+        filter_conditions.append(Venue.name.ilike(f"%{name}%"))
+
+    if city:
+        filter_conditions.append(Venue.city.ilike(f"%{city}%"))
+
+    if country:
+        filter_conditions.append(Venue.country.ilike(f"%{country}%"))
+
+    if filter_conditions:
+        query = query.filter(and_(*filter_conditions))
+
+    return query.order_by(Venue.name.asc())
+
+def upsert_venues(db: Session, venues: Dict[str, Venue]) -> List[str]:
+    """
+    Insert the venues of an ingestion batch and update stored ones whose
+    details changed upstream, with one INSERT ... ON CONFLICT per batch. A
+    detail missing upstream never erases a stored one, and unchanged venues
+    aren't written. Returns the ids of the venues inserted or changed.
+    """
+    if not venues:
+        return []
+    # Sorted, so concurrent batches lock shared venues in the same order
+    rows = [
+        {"id": venue_id, **{field: getattr(venue, field) for field in VENUE_FIELDS}}
+        for venue_id, venue in sorted(venues.items())
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return merge_venues(db, rows)
+    statement = dialect_insert(Venue).values(rows)
+    updated = {field: func.coalesce(getattr(statement.excluded, field), getattr(Venue, field)) for field in VENUE_FIELDS}
+    statement = statement.on_conflict_do_update(
+        index_elements=[Venue.id],
+        set_=updated,
+        where=or_(*(getattr(Venue, field).is_distinct_from(value) for field, value in updated.items()))
+    ).returning(Venue.id)
+    changed = [venue_id for (venue_id,) in db.execute(statement)]
+    db.commit()
+    invalidate_venue_events(db, changed)
+    return changed
+
+def merge_venues(db: Session, rows: List[dict]) -> List[str]:
+    """upsert_venues for backends without INSERT ... ON CONFLICT: one lookup, then the writes"""
+    stored = {venue.id: venue for venue in db.query(Venue).filter(Venue.id.in_([row["id"] for row in rows]))}
+    changed = []
+    for row in rows:
+        venue = stored.get(row["id"])
+        if venue is None:
+            db.add(Venue(**row))
+            changed.append(row["id"])
+            continue
+        updates = {
+            field: row[field] for field in VENUE_FIELDS
+            if row[field] is not None and row[field] != getattr(venue, field)
+        }
+        for field, value in updates.items():
+            setattr(venue, field, value)
+        if updates:
+            changed.append(row["id"])
+    db.commit()
+    invalidate_venue_events(db, changed)
+    return changed
+
+def invalidate_venue_events(db: Session, venue_ids: List[str]) -> None:
+    """Cached events carry their venue's details; drop those of changed venues"""
+    if venue_ids:
+        event_detail_cache.invalidate(*(
+            event_id for (event_id,) in db.query(Event.id).filter(Event.venue_id.in_(venue_ids))
+        ))
@@ -0,0 +1,29 @@
+# routers/admin_router.py
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.Models.ingestion import IngestionJobSchema, EnqueueJobRequest
+from app.Services.job_service import enqueue_job_service, get_jobs_service
+from app.Services.event_service import get_coalescing_stats_service
+from app.core.database import get_db
+from app.core.auth import require_admin
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+@router.post("/ingestion/jobs", response_model=IngestionJobSchema, status_code=202)
+def enqueue_ingestion_job(request: EnqueueJobRequest, db: Session = Depends(get_db)):
+    """Queue a job for the ingestion worker"""
+    return enqueue_job_service(db, request.kind, request.payload)
+
+@router.get("/ingestion/jobs", response_model=List[IngestionJobSchema])
+def get_ingestion_jobs(
+    status: Optional[str] = Query(None, description="Filter by job status"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    return get_jobs_service(db, limit=limit, status=status)
+
+@router.get("/metrics/coalescing")
+def get_coalescing_metrics():
+    """How many listing requests shared another request's query, in this worker process"""
+    return get_coalescing_stats_service()
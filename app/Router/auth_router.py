@@ -1,20 +1,21 @@
 # routers/auth_router.py
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.Services.user_service import UserService
 from app.core.auth import (
-    oauth, 
+    get_oauth,
     create_token_pair,  
     refresh_access_token,  
     SECRET_KEY, 
     ALGORITHM, 
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.core.oidc import get_http_client
 from pydantic import BaseModel
-import httpx
 import logging
 
 # Set up logging to see what's happening
@@ -37,42 +38,37 @@ class TokenResponse(BaseModel):
 @router.get("/login/google")
 async def login_google(request: Request):
     redirect_uri = request.url_for('auth_google')
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
 async def auth_google(request: Request, db: Session = Depends(get_db)):
     try:
         # Step 1: Exchange authorization code for tokens
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         logger.info(f"Token keys received: {list(token.keys())}")
         user_info = None
         
-        # Method 1: Try to parse ID token if it exists
-        if 'id_token' in token:
-            try:
-                logger.info("Attempting to parse ID token...")
-                user_info = await oauth.google.parse_id_token(request, token)
-                logger.info("Successfully parsed ID token")
-            except Exception as e:
-                logger.warning(f"Failed to parse ID token: {e}")
+        # Method 1: Claims of the ID token, which authlib verifies during the code exchange
+        if token.get('userinfo'):
+            user_info = dict(token['userinfo'])
+            logger.info("Using claims from the ID token")
         
         # Method 2: Fallback to Google's userinfo endpoint
         if not user_info and 'access_token' in token:
             try:
                 logger.info("Fetching user info from Google API...")
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        'https://www.googleapis.com/oauth2/v2/userinfo',
-                        headers={'Authorization': f'Bearer {token["access_token"]}'}
-                    )
+                response = await get_http_client().get(
+                    'https://www.googleapis.com/oauth2/v2/userinfo',
+                    headers={'Authorization': f'Bearer {token["access_token"]}'}
+                )
+                
+                if response.status_code == 200:
+                    user_info = response.json()
+                    logger.info("Successfully fetched user info from API")
+                else:
+                    logger.error(f"Failed to fetch user info: {response.status_code} - {response.text}")
                     
-                    if response.status_code == 200:
-                        user_info = response.json()
-                        logger.info("Successfully fetched user info from API")
-                    else:
-                        logger.error(f"Failed to fetch user info: {response.status_code} - {response.text}")
-                        
             except Exception as e:
                 logger.error(f"Error fetching user info: {e}")
         
@@ -80,18 +76,17 @@ async def auth_google(request: Request, db: Session = Depends(get_db)):
         if not user_info and 'access_token' in token:
             try:
                 logger.info("Trying OpenID Connect userinfo endpoint...")
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        'https://openidconnect.googleapis.com/v1/userinfo',
-                        headers={'Authorization': f'Bearer {token["access_token"]}'}
-                    )
+                response = await get_http_client().get(
+                    'https://openidconnect.googleapis.com/v1/userinfo',
+                    headers={'Authorization': f'Bearer {token["access_token"]}'}
+                )
+                
+                if response.status_code == 200:
+                    user_info = response.json()
+                    logger.info("Successfully fetched user info from OpenID Connect")
+                else:
+                    logger.error(f"OpenID Connect failed: {response.status_code} - {response.text}")
                     
-                    if response.status_code == 200:
-                        user_info = response.json()
-                        logger.info("Successfully fetched user info from OpenID Connect")
-                    else:
-                        logger.error(f"OpenID Connect failed: {response.status_code} - {response.text}")
-                        
             except Exception as e:
                 logger.error(f"Error with OpenID Connect: {e}")
         
@@ -111,9 +106,10 @@ async def auth_google(request: Request, db: Session = Depends(get_db)):
                 detail="No email address found in Google account"
             )
         
-        # Initialize user service and authenticate/create user
+        # Initialize user service and authenticate/create user.
+        # The session is synchronous, so the lookup runs in the threadpool instead of blocking the loop
         user_service = UserService(db)
-        user = user_service.authenticate_or_create_user(user_info)
+        user = await run_in_threadpool(user_service.authenticate_or_create_user, user_info)
         
         if not user:
             logger.error("Failed to authenticate or create user")
@@ -1,15 +1,32 @@
 # fastapi_backend/routers/event_router.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import List, Optional
-from app.Models.event import PaginatedEventsResponse, EventFilters
+from typing import List, Optional, Union
+from app.Models.event import PaginatedEventsResponse, PaginatedEventListResponse, EventListItem, EventFilters, SuggestResponse
 from sqlalchemy.orm import Session
 from app.Services.event_service import (
     get_events_service,
     save_event_service,
-    get_favorites_service
+    unsave_event_service,
+    get_favorites_service,
+    get_trending_service,
+    export_events_service,
+    get_event_service,
+    get_events_batch_service,
+    get_suggestions_service,
+    EXPORT_MEDIA_TYPES,
+    MAX_BATCH_IDS
 )
+from app.Services.stream_service import event_stream_service, check_stream_capacity
+from app.Services.recommendation_service import get_recommendations_service
+from app.Models.recommendation import RecommendationSchema
+from app.Models.user import UserSchema
+from app.core.trending import TRENDING_TOP_K
+from app.core.suggest import SUGGEST_KINDS
+from app.Repository.event_repository import FACET_FIELDS, DEFAULT_FACET_LIMIT, LIST_FIELDS, SORT_FIELDS
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.Models.event import Event,EventSchema
 from app.Models.favorite import Favorite, FavoriteSchema
 from app.core.auth import get_current_user
@@ -19,10 +36,7 @@ router = APIRouter(prefix="/events", tags=["Events"])
 # @router.get("/", response_model=List[EventSchema])
 # def get_event_names(db: Session = Depends(get_db)):
 #     return get_events_service(db)
-@router.get("/", response_model=PaginatedEventsResponse)
-def get_events_endpoint(
-    page: int = Query(1, ge=1, description="Page number"),
-    per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+def get_event_filters(
     name: Optional[str] = Query(None, description="Filter by event name (partial match)"),
     city: Optional[str] = Query(None, description="Filter by city"),
     country: Optional[str] = Query(None, description="Filter by country"),
@@ -30,27 +44,108 @@ def get_events_endpoint(
     start_date_from: Optional[datetime] = Query(None, description="Filter events starting from this date"),
     start_date_to: Optional[datetime] = Query(None, description="Filter events starting before this date"),
     search: Optional[str] = Query(None, description="Search across name, description, and venue"),
-    sort_by: str = Query("start_date", description="Sort by field (start_date, name, created_at)"),
-    sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
-):
-    filters = EventFilters(
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude for nearby events"),
+    lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitude for nearby events"),
+    radius_km: float = Query(25, gt=0, le=500, description="Search radius in kilometers for nearby events"),
+    include_past: bool = Query(False, description="Also return past and archived events")
+) -> EventFilters:
+    """Shared event filter query parameters"""
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be provided together")
+
+    return EventFilters(
         name=name,
         city=city,
         country=country,
         venue_name=venue_name,
         start_date_from=start_date_from,
         start_date_to=start_date_to,
-        search=search
+        search=search,
+        latitude=lat,
+        longitude=lng,
+        radius_km=radius_km if lat is not None else None,
+        include_past=include_past
     )
-    
-    return get_events_service(
+
+
+@router.get("/", response_model=Union[PaginatedEventsResponse, PaginatedEventListResponse])
+def get_events_endpoint(
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    filters: EventFilters = Depends(get_event_filters),
+    sort_by: str = Query("start_date", description="Sort by field (start_date, name, created_at, popularity, distance, venue_name, city, country, latitude, longitude)"),
+    sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
+    facets: Optional[str] = Query(None, description="Comma-separated facets to count (city, country, venue_name, month)"),
+    facet_limit: int = Query(DEFAULT_FACET_LIMIT, ge=1, le=50, description="Values returned per facet"),
+    fields: Optional[str] = Query(None, description="Comma-separated event fields to return, or 'list' for the compact list item; id and the sort key are always included"),
+    db: Session = Depends(get_db)
+):
+    if sort_by not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort_by: {sort_by}")
+
+    facet_fields = [field.strip() for field in facets.split(",") if field.strip()] if facets else None
+    unknown = set(facet_fields or []) - set(FACET_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(sorted(unknown))}")
+
+    event_fields = None
+    if fields and fields.strip() == "list":
+        event_fields = list(EventListItem.model_fields)
+    elif fields:
+        event_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(event_fields) - set(LIST_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    # response_model documents the shape; the payload is encoded directly
+    return FastJSONResponse(get_events_service(
         db=db,
         page=page,
         per_page=per_page,
         filters=filters,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        facets=facet_fields,
+        facet_limit=facet_limit,
+        fields=event_fields
+    ))
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest_endpoint(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Number of suggestions"),
+    kinds: Optional[str] = Query(None, description="Comma-separated kinds to suggest (event, venue, city)")
+):
+    suggest_kinds = [kind.strip() for kind in kinds.split(",") if kind.strip()] if kinds else list(SUGGEST_KINDS)
+    unknown = set(suggest_kinds) - set(SUGGEST_KINDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+    # Served from the in-memory index; no database session per keystroke
+    return FastJSONResponse(get_suggestions_service(q, limit, suggest_kinds))
+
+
+@router.get("/stream")
+def stream_events_endpoint(filters: EventFilters = Depends(get_event_filters)):
+    """Server-Sent Events feed of newly ingested events matching the same filters as /events"""
+    check_stream_capacity()
+    return StreamingResponse(
+        event_stream_service(filters),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/export")
+def export_events_endpoint(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$", description="Export format"),
+    filters: EventFilters = Depends(get_event_filters)
+):
+    return StreamingResponse(
+        export_events_service(filters, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="events.{format}"'}
     )
 
 
@@ -63,9 +158,52 @@ def save_event(
     return save_event_service(event_id, db, user)
 
 
+@router.delete("/{event_id}/save", status_code=204)
+def unsave_event(
+    event_id: str,
+    db: Session = Depends(get_db),
+    user: int = Depends(get_current_user)
+):
+    unsave_event_service(event_id, db, user)
+
+
+@router.get("/trending", response_model=List[EventSchema])
+def get_trending_events_endpoint(
+    limit: int = Query(10, ge=1, le=TRENDING_TOP_K, description="Number of trending events"),
+    db: Session = Depends(get_db)
+):
+    return get_trending_service(db, limit)
+
+
 @router.get("/favorites", response_model=List[FavoriteSchema])
 def get_favorite_events(
     db: Session = Depends(get_db),
     user: int = Depends(get_current_user)
 ):
-    return get_favorites_service(db, user)
\ No newline at end of file
+    return get_favorites_service(db, user)
+
+
+@router.get("/recommendations", response_model=List[RecommendationSchema])
+def get_recommendations_endpoint(
+    limit: int = Query(10, ge=1, le=50, description="Number of recommendations"),
+    db: Session = Depends(get_db),
+    user: UserSchema = Depends(get_current_user)
+):
+    return get_recommendations_service(db, user.id, limit)
+
+
+@router.get("/batch", response_model=List[EventSchema])
+def get_events_batch_endpoint(
+    ids: List[str] = Query(..., description=f"Event ids to fetch (repeat the parameter, up to {MAX_BATCH_IDS})"),
+    db: Session = Depends(get_db)
+):
+    return get_events_batch_service(db, ids)
+
+
+# Must stay last so it doesn't shadow the fixed /events/... paths above
+@router.get("/{event_id}", response_model=EventSchema)
+def get_event_endpoint(
+    event_id: str,
+    db: Session = Depends(get_db)
+):
+    return get_event_service(db, event_id)
@@ -0,0 +1,31 @@
+# routers/notification_router.py
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.Models.notification import NotificationInbox
+from app.Services.notification_service import get_inbox_service, mark_read_service
+from app.core.database import get_db
+from app.core.auth import get_current_user
+from app.Models.user import UserSchema
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+
+@router.get("/", response_model=NotificationInbox)
+def get_inbox_endpoint(
+    before_id: Optional[int] = Query(None, description="Return notifications older than this id (from next_before_id)"),
+    limit: int = Query(20, ge=1, le=100, description="Notifications per page"),
+    unread_only: bool = Query(False, description="Only unread notifications"),
+    db: Session = Depends(get_db),
+    user: UserSchema = Depends(get_current_user)
+):
+    return get_inbox_service(db, user.id, before_id, limit, unread_only)
+
+
+@router.post("/read")
+def mark_read_endpoint(
+    up_to_id: Optional[int] = Query(None, description="Mark notifications up to this id read; all when omitted"),
+    db: Session = Depends(get_db),
+    user: UserSchema = Depends(get_current_user)
+):
+    return {"marked_read": mark_read_service(db, user.id, up_to_id)}
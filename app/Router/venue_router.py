@@ -0,0 +1,27 @@
+# routers/venue_router.py
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.Models.venue import PaginatedVenuesResponse
+from app.Services.venue_service import get_venues_service
+from app.core.database import get_db
+
+router = APIRouter(prefix="/venues", tags=["Venues"])
+
+@router.get("/", response_model=PaginatedVenuesResponse)
+def get_venues_endpoint(
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    name: Optional[str] = Query(None, description="Filter by venue name (partial match)"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    country: Optional[str] = Query(None, description="Filter by country"),
+    db: Session = Depends(get_db)
+):
+    return get_venues_service(
+        db=db,
+        page=page,
+        per_page=per_page,
+        name=name,
+        city=city,
+        country=country
+    )
@@ -0,0 +1,34 @@
+# services/archive_service.py
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.Repository.event_repository import archive_past_events, ARCHIVE_GRACE, ARCHIVE_BATCH_SIZE
+from app.Repository.partition_repository import archive_event_partitions
+from app.core.database import SessionLocal
+
+ARCHIVE_INTERVAL_MINUTES = 60
+
+def archive_events(payload: dict = None):
+    """
+    Move events that started more than ARCHIVE_GRACE ago into events_archive,
+    one short transaction per batch so listings never wait on a long delete.
+    """
+    payload = payload or {}
+    db: Session = SessionLocal()
+    cutoff = datetime.utcnow() - ARCHIVE_GRACE
+    batch_size = int(payload.get("batch_size", ARCHIVE_BATCH_SIZE))
+    try:
+        # Whole past months go by dropping their partition; the rest row by row
+        archived = archive_event_partitions(db, cutoff)
+        while True:
+            moved = archive_past_events(db, cutoff, batch_size)
+            if not moved:
+                break
+            archived += moved
+        print(f"Archived {archived} past events")
+        return archived
+    except Exception as e:
+        db.rollback()
+        print("Error archiving events:", str(e))
+        raise
+    finally:
+        db.close()
@@ -1,15 +1,51 @@
 # fastapi_backend/services/event_service.py
 from typing import List
 from fastapi import HTTPException,  Query
-from typing import Optional
+from typing import Optional, Iterator
+from datetime import datetime
+import csv
+import io
+import json
+import threading
 
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func
-from app.Repository.event_repository import get_events, save_event_repository, get_favorites_repository, event_exists, favorite_exists, get_total_count, apply_sorting, apply_pagination
+from app.Repository.event_repository import get_events, save_event_repository, unsave_event_repository, get_favorites_repository, get_trending_events, get_event_by_id, get_events_by_ids, event_exists, favorite_exists, get_total_count, apply_sorting, apply_pagination, stream_events, get_facets, get_suggest_rows, projected_fields, listing_source, EXPORT_COLUMNS, DEFAULT_FACET_LIMIT
 from app.Repository.user_repository import UserRepository
 from app.Models.event import EventSchema, Event
 from app.Models.favorite import FavoriteSchema
-from app.Models.event import PaginatedEventsResponse, EventFilters
+from app.Models.event import PaginatedEventsResponse, EventFilters, FacetCount
+from app.core.trending import trending_index
+from app.core.suggest import suggest_index, SUGGEST_KINDS
+from app.core.shared_state import catalog_version
+from app.core.geo import haversine_km
+from app.core.database import SessionLocal
+from app.core.singleflight import SingleFlight
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+# Most ids accepted by one multi-get request
+MAX_BATCH_IDS = 100
+# Rows buffered into each chunk written to the response
+EXPORT_CHUNK_ROWS = 500
+
+# Identical listing queries running at the same time share one execution
+listing_flights = SingleFlight()
+
+def with_distance(event: EventSchema, origin) -> EventSchema:
+    """Sets distance_km on an event relative to the query origin"""
+    if event.latitude is not None and event.longitude is not None:
+        event.distance_km = round(haversine_km(origin[0], origin[1], event.latitude, event.longitude), 3)
+    return event
+
+def row_with_distance(row, origin) -> dict:
+    """A projected listing row as a dict, with distance_km relative to the query origin"""
+    values = row._asdict()
+    if values["latitude"] is not None and values["longitude"] is not None:
+        values["distance_km"] = round(haversine_km(origin[0], origin[1], values["latitude"], values["longitude"]), 3)
+    return values
 
 # def get_events_service(db: Session) -> List[EventSchema]:
 #     try:
@@ -22,34 +58,91 @@ def get_events_service(
         per_page: int = 10,
         filters: Optional[EventFilters] = None,
         sort_by: str = "start_date",
-        sort_order: str = "asc"
+        sort_order: str = "asc",
+        facets: Optional[List[str]] = None,
+        facet_limit: int = DEFAULT_FACET_LIMIT,
+        fields: Optional[List[str]] = None
+    ) -> PaginatedEventsResponse:
+        """
+        A page of filtered events, narrowed to the given fields if any.
+        Concurrent requests for the same page share one count and page query
+        (see listing_key), so a burst on a viral page or right after ingestion
+        invalidates the caches costs one execution.
+        """
+        projection = projected_fields(fields, sort_by, bool(filters and filters.origin)) if fields else None
+        return listing_flights.do(
+            listing_key(page, per_page, filters, sort_by, sort_order, facets, facet_limit, projection),
+            lambda: query_events_page(db, page, per_page, filters, sort_by, sort_order, facets, facet_limit, projection)
+        )
+
+def listing_key(page, per_page, filters, sort_by, sort_order, facets, facet_limit, projection=None) -> tuple:
+    """
+    Identity of a listing request: parameters left at their defaults, query
+    parameter order and facet order don't change it, so equivalent requests coalesce
+    """
+    set_filters = tuple(sorted(filters.model_dump(exclude_defaults=True).items())) if filters else ()
+    return (
+        page, per_page, set_filters, sort_by, sort_order.lower(),
+        tuple(sorted(set(facets))) if facets else (),
+        facet_limit if facets else None,
+        projection
+    )
+
+def query_events_page(
+        db: Session,
+        page: int,
+        per_page: int,
+        filters: Optional[EventFilters],
+        sort_by: str,
+        sort_order: str,
+        facets: Optional[List[str]],
+        facet_limit: int,
+        projection: Optional[tuple] = None
     ) -> PaginatedEventsResponse:
         try:
-            # Build base query with filters
-            query = get_events(db, filters)
+            # Build base query with filters, on the upcoming summary when the query fits it
+            source = listing_source(db, filters, sort_by)
+            query = get_events(db, filters, projection, source)
             
             # Get total count before pagination
             total = get_total_count(query)
             
             # Apply sorting
-            query = apply_sorting(query, sort_by, sort_order)
+            origin = filters.origin if filters else None
+            query = apply_sorting(query, sort_by, sort_order, origin, model=source)
             
             # Apply pagination and execute query
             events = apply_pagination(query, page, per_page)
+
+            # Annotate nearby-events results with their exact distance
+            if origin and projection is None:
+                events = [with_distance(EventSchema.from_orm(event), origin) for event in events]
+            elif origin and "distance_km" in projection:
+                events = [row_with_distance(event, origin) for event in events]
             
             # Calculate pagination metadata
             total_pages = (total + per_page - 1) // per_page
             has_next = page < total_pages
             has_prev = page > 1
             
-            return PaginatedEventsResponse(
+            # All requested facets come from a single grouped query
+            facet_counts = None
+            if facets:
+                facet_counts = {
+                    field: [FacetCount.model_construct(value=value, count=count) for value, count in values]
+                    for field, values in get_facets(db, filters, facets, facet_limit, model=source).items()
+                }
+
+            # Rows already have the EventSchema shape, so skip re-validating them
+            return PaginatedEventsResponse.model_construct(
                 events=events,
                 total=total,
                 page=page,
                 per_page=per_page,
                 total_pages=total_pages,
                 has_next=has_next,
-                has_prev=has_prev
+                has_prev=has_prev,
+                facets=facet_counts
             )
             
         except Exception as e:
@@ -57,6 +150,10 @@ def get_events_service(
                 status_code=500, 
                 detail=f"Error fetching events: {str(e)}"
             )
+def get_coalescing_stats_service() -> dict:
+    """Single-flight counters of this process, per coalesced query"""
+    return {"events_listing": listing_flights.stats()}
+
 def get_events_with_pagination(
     db: Session,
     page: int,
@@ -135,6 +232,31 @@ def get_events_with_pagination(
 
     
 
+def get_event_service(db: Session, event_id: str) -> EventSchema:
+    try:
+        event = get_event_by_id(db, event_id)
+        if not event:
+            raise HTTPException(status_code=404, detail=f"Event with id {event_id} not found")
+        return event
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching event: {str(e)}")
+
+
+def get_events_batch_service(db: Session, event_ids: List[str]) -> List[EventSchema]:
+    try:
+        if len(event_ids) > MAX_BATCH_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids can be requested at once")
+        events = get_events_by_ids(db, event_ids)
+        # Keep the requested order and drop unknown ids
+        return [events[event_id] for event_id in dict.fromkeys(event_ids) if event_id in events]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching events: {str(e)}")
+
+
 def save_event_service(event_id: str, db: Session, user: int) -> FavoriteSchema:
     try:
         if not event_exists(event_id, db):
@@ -149,12 +271,113 @@ def save_event_service(event_id: str, db: Session, user: int) -> FavoriteSchema:
         raise HTTPException(status_code=500, detail=f"Error saving event: {str(e)}")
 
 
+def unsave_event_service(event_id: str, db: Session, user: int) -> None:
+    try:
+        if not favorite_exists(event_id, user, db):
+            raise HTTPException(status_code=404, detail="Event is not saved by user")
+        unsave_event_repository(event_id, db, user)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error removing saved event: {str(e)}")
+
+
+def get_trending_service(db: Session, limit: int = 10) -> List[EventSchema]:
+    try:
+        # The top-K list is served from memory; the DB is only hit when it goes stale
+        if trending_index.is_stale():
+            trending_index.refresh(lambda size: get_trending_events(db, size))
+        return trending_index.top(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching trending events: {str(e)}")
+
+
+def refresh_suggest_index(version: Optional[int] = None) -> None:
+    """Reload the typeahead index: in full when due, otherwise only newly ingested events"""
+    db: Session = SessionLocal()
+    try:
+        suggest_index.refresh(
+            lambda: get_suggest_rows(db),
+            lambda since: get_suggest_rows(db, since),
+            version
+        )
+    except Exception as e:
+        print("Error refreshing suggest index:", str(e))
+    finally:
+        db.close()
+
+
+def get_suggestions_service(prefix: str, limit: int = 10, kinds: List[str] = SUGGEST_KINDS) -> dict:
+    """
+    Typeahead suggestions served from memory. Only the very first call loads the
+    index inline; after that, catalog changes (each ingestion batch bumps the
+    catalog version) and full rebuilds are picked up by a background refresh.
+    """
+    try:
+        version = catalog_version.current()
+        if suggest_index.built_at is None:
+            refresh_suggest_index(version)
+        elif (version != suggest_index.version or suggest_index.needs_full_rebuild()) \
+                and not suggest_index.is_refreshing():
+            threading.Thread(target=refresh_suggest_index, args=(version,), daemon=True).start()
+        return {
+            "query": prefix,
+            "suggestions": [suggestion._asdict() for suggestion in suggest_index.suggest(prefix, limit, kinds)]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching suggestions: {str(e)}")
+
+
 def get_favorites_service(db: Session, user: int) -> List[FavoriteSchema]:
     try:
-        if not UserRepository.user_exists(user, db):
-            raise HTTPException(status_code=404, detail=f"User with id {user} not found")
+        if not UserRepository(db).user_exists(user.id):
+            raise HTTPException(status_code=404, detail=f"User with id {user.id} not found")
         return get_favorites_repository(db, user)
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching favorites: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching favorites: {str(e)}")
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_chunks(rows) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({key: _export_value(value) for key, value in row._mapping.items()}))
+        if len(lines) >= EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(rows) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in EXPORT_COLUMNS])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_export_value(value) for value in row])
+        if count % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_events_service(filters: Optional[EventFilters] = None, export_format: str = "ndjson") -> Iterator[str]:
+    """
+    Streams the filtered catalog as NDJSON or CSV text chunks.
+    The generator owns its session because it outlives the request handler.
+    """
+    db: Session = SessionLocal()
+    try:
+        rows = stream_events(db, filters)
+        if export_format == "csv":
+            yield from _csv_chunks(rows)
+        else:
+            yield from _ndjson_chunks(rows)
+    finally:
+        db.close()
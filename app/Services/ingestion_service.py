@@ -0,0 +1,326 @@
+# services/ingestion_service.py
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from app.Models.event import Event
+from app.Models.venue import Venue
+from app.Models.ingestion import IngestionJob
+from app.Repository.venue_repository import upsert_venues
+from app.Repository.event_repository import (
+    insert_new_events,
+    update_changed_events,
+    restore_archived_events,
+    refresh_upcoming_events,
+    ARCHIVE_GRACE
+)
+from app.Repository.partition_repository import is_partitioned, ensure_event_partitions, ensure_upcoming_partitions
+from app.Repository.ingestion_repository import (
+    order_keywords_by_checkpoint,
+    get_next_page,
+    save_checkpoint,
+    claim_next_job,
+    heartbeat_job,
+    finish_job
+)
+from app.core.database import SessionLocal
+from app.core.cache import event_detail_cache
+from app.Services.ticketmaster_client import (
+    TicketmasterClient,
+    UpstreamError,
+    CircuitOpenError,
+    get_ticketmaster_client
+)
+from app.Services.archive_service import archive_events
+from app.Services.notification_service import notify_favorites
+from app.Services.recommendation_service import build_recommendations
+from app.Services.stream_service import publish_records
+from app.Services.normalization import EventRecord, NORMALIZE_WORKERS, normalize_events, normalize_pages, chunked
+from typing import Iterable, Iterator, List, Optional
+import os
+import threading
+
+INGESTION_INTERVAL_MINUTES = 20
+KEYWORDS = ["music", "sports", "arts", "theatre", "comedy", "festivals", "concerts", "exhibitions"]
+PAGE_SIZE = 60
+PAGES_PER_KEYWORD = int(os.getenv("TICKETMASTER_PAGES_PER_KEYWORD", "1"))
+# Normalized events held in memory before their venues and rows are written
+PERSIST_CHUNK_SIZE = 50
+# How often a running job tells other workers it is still alive (see STALE_JOB_AFTER in app.worker)
+JOB_HEARTBEAT_SECONDS = 30
+
+# Cache to store already processed event IDs (expires after 1 hour)
+event_cache = {}
+CACHE_EXPIRY = timedelta(hours=1)
+
+def is_event_in_cache(event_id: str) -> bool:
+    """Check if event is in cache and not expired"""
+    cache_entry = event_cache.get(event_id)
+    if cache_entry:
+        if datetime.now() - cache_entry['timestamp'] < CACHE_EXPIRY:
+            return True
+        del event_cache[event_id]  # Remove expired entry
+    return False
+
+def venue_from_record(record: EventRecord) -> Optional[Venue]:
+    """Build a Venue from a normalized event record"""
+    if not record.venue_id:
+        return None
+    return Venue(
+        id=record.venue_id,
+        name=record.venue_name,
+        city=record.city,
+        country=record.country,
+        latitude=record.latitude,
+        longitude=record.longitude
+    )
+
+def event_row(record: EventRecord) -> dict:
+    """Column values of the events row for a normalized record"""
+    return {
+        "id": record.id,
+        "name": record.name,
+        "description": record.description,
+        "start_date": record.start_date,
+        "venue_id": record.venue_id,
+        "url": record.url
+    }
+
+def partition_records(db: Session, records: List[EventRecord]) -> List[EventRecord]:
+    """
+    Make sure the month partitions a chunk needs exist. Undated events need
+    none; they are stored in the default partition.
+    """
+    if is_partitioned(db):
+        ensure_event_partitions(db, (record.start_date for record in records))
+    return records
+
+def persist_events(db: Session, records: Iterable[EventRecord], existing_ids: set) -> int:
+    """Store a stream of normalized events chunk by chunk, returning how many were new"""
+    new_events = 0
+    for chunk in chunked(records, PERSIST_CHUNK_SIZE):
+        chunk = partition_records(db, chunk)
+        # Dedupe the chunk's venues in memory, then insert new and changed ones in one go
+        batch_venues = {}
+        for record in chunk:
+            if record.venue_id and record.venue_id not in batch_venues:
+                batch_venues[record.venue_id] = venue_from_record(record)
+        changed_venues = upsert_venues(db, batch_venues)
+
+        # On PostgreSQL ids are only unique per start_date, so a re-dated event wouldn't
+        # raise IntegrityError. Stored events get their date/venue changes applied and
+        # logged for favoriters instead.
+        rows = [event_row(record) for record in chunk]
+        # Archived events are only stored live again when they were rescheduled
+        existing_ids.update(restore_archived_events(db, rows, datetime.utcnow() - ARCHIVE_GRACE))
+        stored_ids, _ = update_changed_events(db, rows)
+        existing_ids.update(stored_ids)
+
+        stored = []
+        for record in chunk:
+            event_id = record.id
+                
+            # Skip if already in database or cache
+            if event_id in existing_ids or is_event_in_cache(event_id):
+                continue
+                
+            try:
+                # Create event object
+                event = Event(
+                    id=event_id,
+                    name=record.name,
+                    description=record.description,
+                    start_date=record.start_date,
+                    venue_id=record.venue_id,
+                    url=record.url
+                )
+                
+                db.add(event)
+                db.commit()
+                event_detail_cache.invalidate(event_id)
+                
+                # Add to cache
+                event_cache[event_id] = {'timestamp': datetime.now()}
+                stored.append(record)
+                new_events += 1
+                print(f"Added event: {record.name}")
+            
+            except IntegrityError:
+                db.rollback()
+                existing_ids.add(event_id)  # Add to existing IDs
+                event_cache[event_id] = {'timestamp': datetime.now()}
+                print(f"Event {event_id} already exists, skipping")
+        # New and re-dated events reach the listing summary before streams announce them
+        refresh_upcoming_events(db, [record.id for record in chunk], changed_venues)
+        # Committed, so open event streams can see them
+        publish_records(stored)
+    return new_events
+
+def bulk_persist_events(db: Session, records: List[EventRecord]) -> int:
+    """Store a normalized page with one venue lookup and one bulk event insert"""
+    records = partition_records(db, records)
+    venues = {}
+    for record in records:
+        if record.venue_id and record.venue_id not in venues:
+            venues[record.venue_id] = venue_from_record(record)
+    changed_venues = upsert_venues(db, venues)
+    rows = [event_row(record) for record in records]
+    # Archived events are only stored live again when they were rescheduled
+    archived_ids = restore_archived_events(db, rows, datetime.utcnow() - ARCHIVE_GRACE)
+    rows = [row for row in rows if row["id"] not in archived_ids]
+    # Stored events only get their date/venue changes applied and logged
+    update_changed_events(db, rows)
+    inserted = set(insert_new_events(db, rows))
+    refresh_upcoming_events(db, [row["id"] for row in rows], changed_venues)
+    publish_records(record for record in records if record.id in inserted)
+    return len(inserted)
+
+def ingest_keyword(db: Session, client: TicketmasterClient, keyword: str, existing_ids: set) -> int:
+    """Ingest a keyword page by page, checkpointing after every stored page"""
+    new_events = 0
+    page = get_next_page(db, keyword)
+    while True:
+        try:
+            # Events are parsed off the response stream and persisted as they arrive
+            stream = client.stream_events_page(keyword, page=page, size=PAGE_SIZE)
+            new_events += persist_events(db, normalize_events(stream), existing_ids)
+        except UpstreamError as e:
+            save_checkpoint(db, keyword, page, error=str(e))
+            raise
+
+        total_pages = stream.page.get("totalPages", 1)
+        page += 1
+        if page >= min(total_pages, PAGES_PER_KEYWORD):
+            save_checkpoint(db, keyword, page, completed=True)
+            return new_events
+        save_checkpoint(db, keyword, page)
+
+def fetch_ticketmaster_data(raise_errors: bool = False):
+    """
+    Run one ingestion cycle over KEYWORDS. Errors are printed; with raise_errors,
+    as under the worker, they are re-raised too so the job is recorded as failed.
+    """
+    db: Session = SessionLocal()
+    client = get_ticketmaster_client()
+    try:
+        ensure_upcoming_partitions(db)
+
+        # First check for existing events in the last 24 hours
+        existing_ids = {event[0] for event in db.query(Event.id).filter(
+            Event.created_at >= datetime.now() - timedelta(hours=24)
+        ).all()}
+        
+        new_events = 0
+        for keyword in order_keywords_by_checkpoint(db, KEYWORDS):
+            try:
+                new_events += ingest_keyword(db, client, keyword, existing_ids)
+            except CircuitOpenError:
+                # Upstream is down; stop spending quota and resume from the checkpoints next cycle
+                print(f"Ticketmaster unavailable, stopping cycle before '{keyword}'")
+                break
+            except UpstreamError as e:
+                print(f"Skipping keyword '{keyword}': {e}")
+        
+        print(f"Added {new_events} new events")
+        
+    except Exception as e:
+        db.rollback()
+        print("Error fetching Ticketmaster data:", str(e))
+        if raise_errors:
+            raise
+    finally:
+        db.close()
+
+def fetch_raw_pages(client: TicketmasterClient, keyword: str, start_page: int, max_pages: int) -> Iterator[List[dict]]:
+    """Download a keyword's Discovery pages as lists of raw event dicts"""
+    page = start_page
+    while page < max_pages:
+        stream = client.stream_events_page(keyword, page=page, size=PAGE_SIZE)
+        yield list(stream)
+        page += 1
+        if page >= stream.page.get("totalPages", 1):
+            return
+
+def backfill_keyword(db: Session, client: TicketmasterClient, keyword: str, max_pages: int, workers: int) -> int:
+    """
+    Page through a keyword for a full-catalog sync. Raw pages are normalized
+    on a process pool while the next pages download, and each normalized page
+    is bulk inserted and checkpointed in order.
+    """
+    new_events = 0
+    page = get_next_page(db, keyword)
+    pages = fetch_raw_pages(client, keyword, page, max_pages)
+    try:
+        for records in normalize_pages(pages, workers):
+            new_events += bulk_persist_events(db, records)
+            page += 1
+            save_checkpoint(db, keyword, page)
+    except UpstreamError as e:
+        save_checkpoint(db, keyword, page, error=str(e))
+        raise
+    save_checkpoint(db, keyword, page, completed=True)
+    return new_events
+
+def backfill_ticketmaster_data(payload: dict):
+    """
+    Full-catalog sync job. Payload keys (all optional): keywords, pages
+    (per keyword) and workers (normalization processes).
+    """
+    db: Session = SessionLocal()
+    client = get_ticketmaster_client()
+    keywords = payload.get("keywords") or KEYWORDS
+    max_pages = int(payload.get("pages", PAGES_PER_KEYWORD))
+    workers = int(payload.get("workers", NORMALIZE_WORKERS or os.cpu_count() or 1))
+    try:
+        ensure_upcoming_partitions(db)
+        new_events = 0
+        for keyword in order_keywords_by_checkpoint(db, keywords):
+            try:
+                new_events += backfill_keyword(db, client, keyword, max_pages, workers)
+            except CircuitOpenError:
+                print(f"Ticketmaster unavailable, stopping backfill before '{keyword}'")
+                break
+            except UpstreamError as e:
+                print(f"Skipping keyword '{keyword}': {e}")
+        print(f"Backfill added {new_events} new events")
+    finally:
+        db.close()
+
+# Job kind -> handler run by the ingestion worker
+JOB_HANDLERS = {
+    "fetch_ticketmaster": lambda payload: fetch_ticketmaster_data(raise_errors=True),
+    "backfill_ticketmaster": backfill_ticketmaster_data,
+    "archive_events": archive_events,
+    "notify_favorites": notify_favorites,
+    "build_recommendations": build_recommendations,
+}
+
+def send_heartbeats(job_id: int, worker_id: str, stop: threading.Event) -> None:
+    """Bump a running job's heartbeat until stopped, so it isn't requeued as orphaned"""
+    while not stop.wait(JOB_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            heartbeat_job(db, job_id, worker_id)
+        except Exception as e:
+            print(f"[{worker_id}] Heartbeat for job {job_id} failed: {e}")
+        finally:
+            db.close()
+
+def run_next_job(db: Session, worker_id: str) -> Optional[IngestionJob]:
+    """Claim and run one queued job; returns it, or None when the queue is empty"""
+    job = claim_next_job(db, worker_id)
+    if job is None:
+        return None
+    print(f"[{worker_id}] Running job {job.id} ({job.kind})")
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=send_heartbeats, args=(job.id, worker_id, stop), daemon=True)
+    heartbeat.start()
+    try:
+        JOB_HANDLERS[job.kind](job.payload or {})
+    except Exception as e:
+        db.rollback()
+        print(f"[{worker_id}] Job {job.id} failed: {e}")
+        return finish_job(db, job, error=f"{type(e).__name__}: {e}")
+    finally:
+        stop.set()
+        heartbeat.join()
+    return finish_job(db, job)
@@ -0,0 +1,32 @@
+# services/job_service.py
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.Models.ingestion import IngestionJobSchema
+from app.Repository.ingestion_repository import enqueue_job, get_recent_jobs
+
+# Job kinds the ingestion worker runs (see JOB_HANDLERS in ingestion_service).
+# Kept here so the web app can enqueue jobs without importing the ingestion stack.
+JOB_KINDS = ("fetch_ticketmaster", "backfill_ticketmaster", "archive_events", "notify_favorites", "build_recommendations")
+
+def enqueue_job_service(db: Session, kind: str, payload: Optional[dict] = None) -> IngestionJobSchema:
+    if kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{kind}'")
+    try:
+        job = enqueue_job(db, kind, payload)
+        return IngestionJobSchema.model_validate(job)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error enqueueing job: {str(e)}"
+        )
+
+def get_jobs_service(db: Session, limit: int = 50, status: Optional[str] = None) -> List[IngestionJobSchema]:
+    try:
+        return [IngestionJobSchema.model_validate(job) for job in get_recent_jobs(db, limit, status)]
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching jobs: {str(e)}"
+        )
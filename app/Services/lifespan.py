@@ -1,145 +1,76 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from apscheduler.schedulers.background import BackgroundScheduler
-import httpx
-from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from app.Models.event import Event, Base
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from app.core.database import SessionLocal, create_tables_if_enabled
 import os
 from dotenv import load_dotenv
-from functools import lru_cache
+from app.core.trending import trending_index, TRENDING_REFRESH_INTERVAL
+from app.core.shared_state import Lease
+from app.core.oidc import close_http_client
+from app.Repository.event_repository import get_trending_events
 
 # Load environment variables
 load_dotenv()
 
-# Database setup
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# "worker": ingestion runs in `python -m app.worker` and the web app only enqueues jobs.
+# "inline": this process fetches on startup and schedules ingestion itself (single-process dev setups).
+INGESTION_MODE = os.getenv("INGESTION_MODE", "worker")
+# Only the holder of this lease runs or enqueues scheduled ingestion, across web processes and workers
+SCHEDULER_LEASE_NAME = "ingestion-scheduler"
+SCHEDULER_LEASE_SECONDS = 90
 
-scheduler = BackgroundScheduler()
-
-# Cache to store already processed event IDs (expires after 1 hour)
-event_cache = {}
-CACHE_EXPIRY = timedelta(hours=1)
-
-def is_event_in_cache(event_id: str) -> bool:
-    """Check if event is in cache and not expired"""
-    cache_entry = event_cache.get(event_id)
-    if cache_entry:
-        if datetime.now() - cache_entry['timestamp'] < CACHE_EXPIRY:
-            return True
-        del event_cache[event_id]  # Remove expired entry
-    return False
-
-def fetch_ticketmaster_data():
+def refresh_trending_index():
     db: Session = SessionLocal()
-    keywords = ["music", "sports", "arts", "theatre", "comedy", "festivals", "concerts", "exhibitions"]
     try:
-        # First check for existing events in the last 24 hours
-        existing_ids = {event[0] for event in db.query(Event.id).filter(
-            Event.created_at >= datetime.now() - timedelta(hours=24)
-        ).all()}
-        
-        response = httpx.get(
-            "https://app.ticketmaster.com/discovery/v2/events.json",
-            params={
-                "apikey": os.getenv("TICKETMASTER_KEY"),
-                "keyword": keywords,
-                "size": 60
-            },
-            timeout=30
-        )
-       
-        
-        new_events = 0
-        for keyword in keywords:
-            response = httpx.get(
-                "https://app.ticketmaster.com/discovery/v2/events.json",
-                params={
-                    "apikey": os.getenv("TICKETMASTER_KEY"),
-                    "keyword": keyword,
-                    "size": 60
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            data = response.json()
-            events_data = data.get("_embedded", {}).get("events", [])
-        for event_data in events_data:
-            event_id = event_data.get('id')
-            if not event_id:
-                continue
-                
-            # Skip if already in database or cache
-            if event_id in existing_ids or is_event_in_cache(event_id):
-                continue
-                
-            try:
-                # Extract venue information
-                venue = event_data.get('_embedded', {}).get('venues', [{}])[0]
-                
-                # Parse date safely
-                start_date = None
-                if 'dates' in event_data and 'start' in event_data['dates']:
-                    date_str = event_data['dates']['start'].get('dateTime')
-                    if date_str:
-                        try:
-                            start_date = datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%SZ')
-                        except ValueError:
-                            pass
-                
-                # Create event object
-                event = Event(
-                    id=event_id,
-                    name=event_data['name'],
-                    description=event_data.get('description', ''),
-                    start_date=start_date,
-                    venue_name=venue.get('name', ''),
-                    city=venue.get('city', {}).get('name', ''),
-                    country=venue.get('country', {}).get('name', ''),
-                    url=event_data.get('url', '')
-                )
-                
-                db.add(event)
-                db.commit()
-                
-                # Add to cache
-                event_cache[event_id] = {'timestamp': datetime.now()}
-                new_events += 1
-                print(f"Added event: {event_data['name']}")
-            
-            except IntegrityError:
-                db.rollback()
-                existing_ids.add(event_id)  # Add to existing IDs
-                event_cache[event_id] = {'timestamp': datetime.now()}
-                print(f"Event {event_id} already exists, skipping")
-            
-            except KeyError as e:
-                db.rollback()
-                print(f"Missing required field {str(e)} in event data")
-        
-        print(f"Added {new_events} new events")
-        
+        trending_index.refresh(lambda size: get_trending_events(db, size))
     except Exception as e:
-        db.rollback()
-        print("Error fetching Ticketmaster data:", str(e))
+        print("Error refreshing trending events:", str(e))
     finally:
         db.close()
 
-@asynccontextmanager
-async def app_lifespan(app: FastAPI):
-    # Create tables if they don't exist
-    Base.metadata.create_all(bind=engine)
-    
+def start_inline_ingestion():
+    """
+    Run ingestion inside the web app on a background scheduler. Every process
+    keeps its own trending list fresh, but ingestion jobs only run in the one
+    process holding the scheduler lease. The scheduler and the ingestion stack
+    are only imported in this mode.
+    """
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from app.Services.ingestion_service import fetch_ticketmaster_data, INGESTION_INTERVAL_MINUTES
+    from app.Services.archive_service import archive_events, ARCHIVE_INTERVAL_MINUTES
+    from app.Services.notification_service import notify_favorites, NOTIFY_INTERVAL_MINUTES
+    from app.Services.recommendation_service import build_recommendations, RECOMMENDATION_INTERVAL_MINUTES
+
+    lease = Lease(SCHEDULER_LEASE_NAME, SCHEDULER_LEASE_SECONDS)
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(
+        refresh_trending_index,
+        "interval",
+        seconds=TRENDING_REFRESH_INTERVAL.total_seconds()
+    )
+    scheduler.add_job(lease.renew, "interval", seconds=SCHEDULER_LEASE_SECONDS / 3)
+
     # Initial fetch
-    fetch_ticketmaster_data()
-    
-    # Schedule regular updates (every 6 hours)
-    scheduler.add_job(fetch_ticketmaster_data, "interval", minutes=20)
+    if lease.renew():
+        fetch_ticketmaster_data()
+
+    # Schedule regular updates
+    scheduler.add_job(lease.guard(fetch_ticketmaster_data), "interval", minutes=INGESTION_INTERVAL_MINUTES)
+    scheduler.add_job(lease.guard(archive_events), "interval", minutes=ARCHIVE_INTERVAL_MINUTES)
+    scheduler.add_job(lease.guard(notify_favorites), "interval", minutes=NOTIFY_INTERVAL_MINUTES)
+    scheduler.add_job(lease.guard(build_recommendations), "interval", minutes=RECOMMENDATION_INTERVAL_MINUTES)
     scheduler.start()
+    return scheduler, lease
+
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
+    # Tables come from Alembic migrations unless CREATE_TABLES is set
+    create_tables_if_enabled()
+
+    # Otherwise the trending list reloads itself on the first request after it goes stale
+    scheduler, lease = start_inline_ingestion() if INGESTION_MODE == "inline" else (None, None)
     yield
-    scheduler.shutdown()
\ No newline at end of file
+    await close_http_client()
+    if scheduler:
+        scheduler.shutdown()
+        lease.release()
@@ -0,0 +1,112 @@
+# services/normalization.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+from app.core.geo import parse_coordinate
+
+# Processes used to normalize raw pages during backfills; 0 or 1 keeps it in-process
+NORMALIZE_WORKERS = int(os.getenv("INGESTION_NORMALIZE_WORKERS", "0"))
+
+
+class EventRecord(NamedTuple):
+    """Compact, flat form of one Discovery event, ready to persist"""
+    id: str
+    name: str
+    description: str
+    start_date: Optional[datetime]
+    url: str
+    venue_id: Optional[str]
+    venue_name: Optional[str]
+    city: Optional[str]
+    country: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+def parse_start_date(event_data: dict) -> Optional[datetime]:
+    """Parse dates.start.dateTime safely, falling back to localDate for events without a set time"""
+    start = event_data.get('dates', {}).get('start', {})
+    for key, fmt in (('dateTime', '%Y-%m-%dT%H:%M:%SZ'), ('localDate', '%Y-%m-%d')):
+        if start.get(key):
+            try:
+                return datetime.strptime(start[key], fmt)
+            except ValueError:
+                pass
+    return None
+
+
+def normalize_event(event_data: dict) -> Optional[EventRecord]:
+    """Turn a raw Discovery event into an EventRecord, or None if it can't be stored"""
+    event_id = event_data.get('id')
+    if not event_id:
+        return None
+    if not event_data.get('name'):
+        print(f"Missing required field 'name' in event data for {event_id}")
+        return None
+
+    # Extract venue information
+    venue = (event_data.get('_embedded', {}).get('venues') or [{}])[0]
+    location = venue.get('location') or {}
+    has_venue = bool(venue.get('id'))
+
+    return EventRecord(
+        id=event_id,
+        name=event_data['name'],
+        description=event_data.get('description', ''),
+        start_date=parse_start_date(event_data),
+        url=event_data.get('url', ''),
+        venue_id=venue['id'] if has_venue else None,
+        venue_name=venue.get('name', '') if has_venue else None,
+        city=venue.get('city', {}).get('name', '') if has_venue else None,
+        country=venue.get('country', {}).get('name', '') if has_venue else None,
+        latitude=parse_coordinate(location.get('latitude')) if has_venue else None,
+        longitude=parse_coordinate(location.get('longitude')) if has_venue else None
+    )
+
+
+def normalize_events(events_data: Iterable[dict]) -> Iterator[EventRecord]:
+    """Lazily normalize a stream of raw Discovery events, dropping unusable ones"""
+    for event_data in events_data:
+        record = normalize_event(event_data)
+        if record is not None:
+            yield record
+
+
+def normalize_page(events_data: List[dict]) -> List[EventRecord]:
+    """Normalize one raw Discovery page; module-level so worker processes can run it"""
+    return list(normalize_events(events_data))
+
+
+def normalize_pages(pages: Iterable[List[dict]], workers: int = NORMALIZE_WORKERS) -> Iterator[List[EventRecord]]:
+    """
+    Normalize raw pages in order, sharded across a process pool when workers > 1.
+    At most two pages per worker are in flight, so raw pages are pulled from
+    `pages` (and downloaded) only as fast as the pool consumes them.
+    """
+    if workers <= 1:
+        for page in pages:
+            yield normalize_page(page)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for page in pages:
+            in_flight.append(pool.submit(normalize_page, page))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def chunked(records: Iterable[EventRecord], size: int) -> Iterator[List[EventRecord]]:
+    """Group a stream into lists of at most `size` items"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,154 @@
+# services/notification_service.py
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.Models.notification import NotificationSchema, NotificationInbox
+from app.Repository.notification_repository import (
+    get_pending_changes,
+    get_favoriters_page,
+    insert_notifications,
+    mark_changes_fanned_out,
+    get_inbox,
+    count_unread,
+    mark_read
+)
+from app.core.database import SessionLocal
+
+NOTIFY_INTERVAL_MINUTES = 5
+# Changes fanned out together; their favoriters are read in one keyset scan
+NOTIFY_CHANGE_BATCH = 500
+# Favorites read, and notifications written, per transaction
+NOTIFY_FAVORITE_BATCH = 5000
+# Where written notifications are handed for delivery (see SINKS)
+NOTIFICATION_SINK = os.getenv("NOTIFICATION_SINK", "log")
+
+
+class NotificationSink(ABC):
+    """Delivers notifications once they are stored; called with one batch at a time"""
+
+    @abstractmethod
+    def deliver(self, notifications: List[dict]) -> None:
+        ...
+
+
+class LogSink(NotificationSink):
+    """Prints a line per batch; the inbox endpoint is the delivery channel"""
+
+    def deliver(self, notifications: List[dict]) -> None:
+        users = len({notification["user_id"] for notification in notifications})
+        print(f"Delivered {len(notifications)} notifications to {users} users")
+
+
+class NullSink(NotificationSink):
+    def deliver(self, notifications: List[dict]) -> None:
+        pass
+
+
+# Sink name -> factory; add push or email sinks here
+SINKS: Dict[str, Callable[[], NotificationSink]] = {
+    "log": LogSink,
+    "none": NullSink,
+}
+
+
+def get_notification_sink(name: str = NOTIFICATION_SINK) -> NotificationSink:
+    if name not in SINKS:
+        raise ValueError(f"Unknown NOTIFICATION_SINK '{name}'")
+    return SINKS[name]()
+
+
+def fan_out_changes(
+    db: Session,
+    sink: NotificationSink,
+    change_batch: int = NOTIFY_CHANGE_BATCH,
+    favorite_batch: int = NOTIFY_FAVORITE_BATCH
+) -> int:
+    """
+    Turn pending event changes into one notification per favoriting user.
+    Favoriters are read in keyset pages and written with one bulk insert per
+    page, so an event saved by hundreds of thousands of users costs a few
+    hundred statements, never one per user. Returns how many were written.
+    """
+    written = 0
+    while True:
+        changes = get_pending_changes(db, change_batch)
+        if not changes:
+            return written
+        changes_by_event: Dict[str, list] = {}
+        for change in changes:
+            changes_by_event.setdefault(change.event_id, []).append(change.id)
+
+        after_id = 0
+        while True:
+            favorites = get_favoriters_page(db, list(changes_by_event), after_id, favorite_batch)
+            if not favorites:
+                break
+            rows = [
+                {"user_id": user_id, "event_id": event_id, "change_id": change_id, "kind": "event_changed"}
+                for _, user_id, event_id in favorites
+                for change_id in changes_by_event[event_id]
+            ]
+            insert_notifications(db, rows)
+            sink.deliver(rows)
+            written += len(rows)
+            after_id = favorites[-1][0]
+
+        mark_changes_fanned_out(db, [change.id for change in changes])
+
+
+def notify_favorites(payload: dict = None) -> int:
+    """Job handler: fan out every pending event change"""
+    payload = payload or {}
+    db: Session = SessionLocal()
+    try:
+        written = fan_out_changes(
+            db,
+            get_notification_sink(payload.get("sink", NOTIFICATION_SINK)),
+            favorite_batch=int(payload.get("batch_size", NOTIFY_FAVORITE_BATCH))
+        )
+        print(f"Wrote {written} notifications")
+        return written
+    except Exception as e:
+        db.rollback()
+        print("Error fanning out notifications:", str(e))
+        raise
+    finally:
+        db.close()
+
+
+def get_inbox_service(
+    db: Session,
+    user: int,
+    before_id: Optional[int] = None,
+    limit: int = 20,
+    unread_only: bool = False
+) -> NotificationInbox:
+    try:
+        notifications = get_inbox(db, user, before_id, limit, unread_only)
+        return NotificationInbox(
+            notifications=[
+                NotificationSchema(
+                    id=notification.id,
+                    event_id=notification.event_id,
+                    kind=notification.kind,
+                    changes=notification.change.changes,
+                    created_at=notification.created_at,
+                    read_at=notification.read_at
+                )
+                for notification in notifications
+            ],
+            unread=count_unread(db, user),
+            next_before_id=notifications[-1].id if len(notifications) == limit else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
+
+
+def mark_read_service(db: Session, user: int, up_to_id: Optional[int] = None) -> int:
+    try:
+        return mark_read(db, user, up_to_id)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating notifications: {str(e)}")
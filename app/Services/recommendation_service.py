@@ -0,0 +1,96 @@
+# services/recommendation_service.py
+from array import array
+from datetime import datetime
+from typing import Dict, List, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.Models.recommendation import RecommendationSchema
+from app.Repository.recommendation_repository import (
+    iter_favorite_pairs,
+    replace_event_neighbors,
+    get_recommendation_candidates
+)
+from app.Repository.event_repository import get_events_by_ids
+from app.core.database import SessionLocal
+from app.core.similarity import item_neighbors, NEIGHBORS_PER_ITEM
+
+RECOMMENDATION_INTERVAL_MINUTES = 360
+# Candidates looked up per recommendation returned, since some may have passed or been archived
+CANDIDATE_OVERFETCH = 3
+
+
+def build_event_neighbors(db: Session, k: int = NEIGHBORS_PER_ITEM) -> int:
+    """
+    Recompute the top-k co-favorited events of every event and store them in
+    event_neighbors. Favorites are streamed into two compact integer arrays,
+    so memory stays at a few bytes per favorite plus the id maps.
+    """
+    user_index: Dict[int, int] = {}
+    event_index: Dict[str, int] = {}
+    users, events = array("i"), array("i")
+    for user_id, event_id in iter_favorite_pairs(db):
+        users.append(user_index.setdefault(user_id, len(user_index)))
+        events.append(event_index.setdefault(event_id, len(event_index)))
+    n_users, event_ids = len(user_index), list(event_index)
+    del user_index, event_index
+
+    computed_at = datetime.utcnow()
+    rows = (
+        {
+            "event_id": event_ids[item],
+            "rank": rank,
+            "neighbor_id": event_ids[neighbor],
+            "score": score,
+            "co_favorites": count,
+            "computed_at": computed_at
+        }
+        for item, neighbors in item_neighbors(users, events, n_users, len(event_ids), k)
+        for rank, (neighbor, score, count) in enumerate(neighbors)
+    )
+    return replace_event_neighbors(db, rows)
+
+
+def build_recommendations(payload: dict = None) -> int:
+    """Job handler: rebuild the co-favorite neighbor table"""
+    payload = payload or {}
+    db: Session = SessionLocal()
+    try:
+        written = build_event_neighbors(db, int(payload.get("k", NEIGHBORS_PER_ITEM)))
+        print(f"Stored {written} event neighbors")
+        return written
+    except Exception as e:
+        db.rollback()
+        print("Error building recommendations:", str(e))
+        raise
+    finally:
+        db.close()
+
+
+def get_recommendations_service(db: Session, user: int, limit: int = 10) -> List[RecommendationSchema]:
+    """
+    "Because you saved X": neighbors of the user's recent favorites, scored
+    by their summed similarity and attributed to the most similar saved event.
+    """
+    try:
+        merged: Dict[str, Tuple[float, float, str]] = {}
+        for seed_id, neighbor_id, score in get_recommendation_candidates(db, user):
+            total, best, because = merged.get(neighbor_id, (0.0, 0.0, seed_id))
+            if score > best:
+                best, because = score, seed_id
+            merged[neighbor_id] = (total + score, best, because)
+        ranked = sorted(merged.items(), key=lambda item: (-item[1][0], item[0]))[:limit * CANDIDATE_OVERFETCH]
+
+        # Event details come from the hot-object cache; passed or archived events drop out
+        events = get_events_by_ids(db, [event_id for event_id, _ in ranked])
+        now = datetime.utcnow()
+        recommendations = []
+        for event_id, (total, _, because) in ranked:
+            event = events.get(event_id)
+            if event is None or (event.start_date and event.start_date < now):
+                continue
+            recommendations.append(RecommendationSchema(event=event, score=round(total, 6), because_event_id=because))
+            if len(recommendations) >= limit:
+                break
+        return recommendations
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching recommendations: {str(e)}")
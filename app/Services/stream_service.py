@@ -0,0 +1,183 @@
+# services/stream_service.py
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Hashable, Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.Models.event import EventSchema, EventFilters
+from app.Repository.event_repository import (
+    get_catalog_watermark,
+    get_events_created_since,
+    get_events_changed_since,
+    DEFAULT_RADIUS_KM
+)
+from app.Services.normalization import EventRecord
+from app.core.database import SessionLocal
+from app.core.geo import haversine_km
+from app.core.pubsub import Broker
+from app.core.responses import dumps
+
+# Comment line sent on idle streams so proxies don't close them
+STREAM_HEARTBEAT_SECONDS = 15
+# How long a disconnected client waits before reconnecting
+STREAM_RETRY_MS = 5000
+# Open streams allowed per process
+STREAM_MAX_SUBSCRIBERS = 10000
+# How often the watcher checks for events committed by other processes
+WATCH_INTERVAL_SECONDS = 1.0
+# Re-read window behind the watermarks, covering rows committed after later-created ones
+WATCH_OVERLAP = timedelta(minutes=1)
+
+
+def event_key(event: EventSchema) -> Hashable:
+    """
+    What makes a pushed event new: an event reaching us from both ingestion and
+    the watcher is sent once, but a re-dated or moved event is sent again
+    """
+    return (event.id, event.start_date, event.venue_id)
+
+
+event_broker = Broker(key=event_key)
+
+
+def _contains(value: Optional[str], term: str) -> bool:
+    return term.lower() in (value or "").lower()
+
+
+def event_matches(event: EventSchema, filters: Optional[EventFilters], now: Optional[datetime] = None) -> bool:
+    """The in-memory equivalent of filter_events plus the upcoming-only default"""
+    include_past = filters is not None and filters.include_past
+    if not include_past and event.start_date and event.start_date < (now or datetime.utcnow()):
+        return False
+    if filters is None:
+        return True
+    if filters.name and not _contains(event.name, filters.name):
+        return False
+    if filters.city and not _contains(event.city, filters.city):
+        return False
+    if filters.country and not _contains(event.country, filters.country):
+        return False
+    if filters.venue_name and not _contains(event.venue_name, filters.venue_name):
+        return False
+    if filters.start_date_from and not (event.start_date and event.start_date >= filters.start_date_from):
+        return False
+    if filters.start_date_to and not (event.start_date and event.start_date <= filters.start_date_to):
+        return False
+    if filters.search and not any(
+        _contains(value, filters.search) for value in (event.name, event.description, event.venue_name, event.city)
+    ):
+        return False
+    if filters.origin:
+        if event.latitude is None or event.longitude is None:
+            return False
+        lat, lng = filters.origin
+        return haversine_km(lat, lng, event.latitude, event.longitude) <= (filters.radius_km or DEFAULT_RADIUS_KM)
+    return True
+
+
+def publish_records(records: Iterable[EventRecord]) -> None:
+    """Publish freshly committed ingestion records to this process's streams"""
+    if not len(event_broker):
+        return
+    now = datetime.utcnow()
+    event_broker.publish(
+        EventSchema.model_construct(**record._asdict(), created_at=now, favorite_count=0) for record in records
+    )
+
+
+class CatalogWatcher:
+    """
+    Feeds the broker with events inserted or re-dated by other processes (the
+    ingestion worker). While anyone is subscribed it polls the database's
+    catalog watermark, and only reads events when the watermark moved. The
+    database is the one thing web and worker processes always share.
+    """
+
+    def __init__(self, broker: Broker, interval: float = WATCH_INTERVAL_SECONDS):
+        self.broker = broker
+        self.interval = interval
+        self.watermark = datetime.utcnow()
+        self.changes_watermark = self.watermark
+        self.seen_mark: Optional[tuple] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print("Error watching for new events:", str(e))
+
+    def poll(self, db: Optional[Session] = None) -> int:
+        """Publishes events created or changed since the last poll; returns how many were new"""
+        if not len(self.broker):
+            # Nobody to tell; don't replay the backlog to the next subscriber
+            self.watermark = self.changes_watermark = datetime.utcnow()
+            self.seen_mark = None
+            return 0
+        session = db or SessionLocal()
+        try:
+            mark = tuple(get_catalog_watermark(session))
+            if mark == self.seen_mark:
+                return 0
+            created = get_events_created_since(session, self.watermark - WATCH_OVERLAP)
+            changed = get_events_changed_since(session, self.changes_watermark - WATCH_OVERLAP)
+        finally:
+            if db is None:
+                session.close()
+        events = [EventSchema.model_validate(row) for row in created]
+        if events and events[-1].created_at:
+            self.watermark = max(self.watermark, events[-1].created_at)
+        if changed:
+            self.changes_watermark = max(self.changes_watermark, changed[-1].changed_at)
+            events += [EventSchema.model_validate(row) for row in changed]
+        self.seen_mark = mark
+        return self.broker.publish(events)
+
+
+catalog_watcher = CatalogWatcher(event_broker)
+
+
+def _frame(event: EventSchema) -> str:
+    return f"id: {event.id}\nevent: event\ndata: {dumps(event).decode()}\n\n"
+
+
+def check_stream_capacity() -> None:
+    """Refuse new streams up front, before the response has started"""
+    if len(event_broker) >= STREAM_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many open event streams")
+
+
+async def event_stream_service(filters: Optional[EventFilters] = None,
+                               heartbeat_seconds: float = STREAM_HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for new events matching the filters. Each open stream
+    is a queue on the event loop; nothing touches the database per client.
+    """
+    subscription = event_broker.subscribe(lambda event: event_matches(event, filters))
+    catalog_watcher.start()
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _frame(event)
+            if subscription.overflowed and subscription.queue.empty():
+                # The client fell behind and missed events; tell it to reload the listing
+                yield "event: reset\ndata: {}\n\n"
+                return
+    finally:
+        subscription.close()
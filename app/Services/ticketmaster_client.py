@@ -0,0 +1,276 @@
+# services/ticketmaster_client.py
+import os
+import json
+import random
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    import ijson
+    ijson_errors = ijson.JSONError
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+    ijson_errors = ValueError
+
+load_dotenv()
+
+TICKETMASTER_BASE_URL = os.getenv("TICKETMASTER_BASE_URL", "https://app.ticketmaster.com/discovery/v2")
+# Discovery API limits: 5 requests per second and a daily quota reported in response headers
+TICKETMASTER_RATE_PER_SECOND = 5.0
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    """Raised when the Discovery API can't be reached after retries"""
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """
+    Token-bucket scheduler that spaces requests to the per-second limit and
+    slows down further when the remaining daily quota runs low.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = TICKETMASTER_RATE_PER_SECOND,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        wall_clock: Callable[[], float] = time.time
+    ):
+        self.max_rate = rate_per_second
+        self.rate = rate_per_second
+        self.capacity = capacity or rate_per_second
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.quota_available: Optional[int] = None
+        self.quota_reset_at: Optional[float] = None
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent"""
+        with self._lock:
+            if self.quota_available == 0 and self.quota_reset_at:
+                # Quota exhausted: wait for the reset instead of burning 429s
+                self.sleep(max(0.0, self.quota_reset_at - self.wall_clock()))
+                self.quota_available = None
+                self.rate = self.max_rate
+            self._refill()
+            if self.tokens < 1:
+                self.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def update_quota(self, headers: httpx.Headers) -> None:
+        """Adjust the schedule from Rate-Limit-Available / Rate-Limit-Reset headers"""
+        available = headers.get("Rate-Limit-Available")
+        reset = headers.get("Rate-Limit-Reset")
+        with self._lock:
+            if available is not None and available.isdigit():
+                self.quota_available = int(available)
+            if reset is not None and reset.isdigit():
+                # Reported in epoch milliseconds
+                self.quota_reset_at = int(reset) / 1000
+            if self.quota_available and self.quota_reset_at:
+                # Spread what is left of the quota over the time until it resets
+                seconds_left = max(1.0, self.quota_reset_at - self.wall_clock())
+                self.rate = min(self.max_rate, max(self.quota_available / seconds_left, 1 / seconds_left))
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial request through after a cool-down"""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                # A failed half-open trial re-opens the circuit for another cool-down
+                self.opened_at = self.clock()
+
+
+class DiscoveryEventStream:
+    """
+    Iterates the raw events of one Discovery response while its body is still
+    downloading, so only one event is held in memory at a time. The `page`
+    metadata object is filled in once iteration finishes.
+    """
+
+    def __init__(self, response: httpx.Response):
+        self.response = response
+        self.page: dict = {}
+
+    def __iter__(self) -> Iterator[dict]:
+        try:
+            if ijson is None:
+                # Without ijson, fall back to parsing the whole page at once
+                data = json.loads(self.response.read())
+                self.page = data.get("page", {})
+                yield from data.get("_embedded", {}).get("events", [])
+                return
+
+            events = ijson.sendable_list()
+            pages = ijson.sendable_list()
+            parsers = (
+                ijson.items_coro(events, "_embedded.events.item", use_float=True),
+                ijson.items_coro(pages, "page", use_float=True),
+            )
+            for chunk in self.response.iter_bytes():
+                for parser in parsers:
+                    parser.send(chunk)
+                yield from events
+                del events[:]
+            for parser in parsers:
+                parser.close()
+            yield from events
+            if pages:
+                self.page = pages[0]
+        except httpx.TransportError as e:
+            raise UpstreamError(f"Ticketmaster response interrupted: {e}") from e
+        except (ValueError, ijson_errors) as e:
+            raise UpstreamError(f"Malformed Ticketmaster response: {e}") from e
+        finally:
+            self.response.close()
+
+
+class TicketmasterClient:
+    """Discovery API client with rate-limit-aware scheduling, retries and a circuit breaker"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TICKETMASTER_BASE_URL,
+        http_client: Optional[httpx.Client] = None,
+        bucket: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.api_key = api_key if api_key is not None else os.getenv("TICKETMASTER_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.http_client = http_client or httpx.Client(timeout=30)
+        self.bucket = bucket or TokenBucket(sleep=sleep)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.sleep = sleep
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        # Full jitter keeps retries from many keywords/processes from lining up
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def get(self, path: str, params: dict, stream: bool = False) -> httpx.Response:
+        """
+        GET a Discovery API path, retrying transient failures.
+        With stream=True the body is left unread and the caller must close the response.
+        """
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow_request():
+                raise CircuitOpenError("Ticketmaster circuit breaker is open")
+            self.bucket.acquire()
+            response = None
+            try:
+                request = self.http_client.build_request(
+                    "GET",
+                    f"{self.base_url}/{path.lstrip('/')}",
+                    params={"apikey": self.api_key, **params}
+                )
+                response = self.http_client.send(request, stream=stream)
+                self.bucket.update_quota(response.headers)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    self.breaker.record_success()
+                    return response
+                last_error = f"HTTP {response.status_code}"
+                response.close()
+            except httpx.HTTPStatusError as e:
+                # Non-retryable 4xx: upstream is healthy, the request is wrong
+                response.close()
+                self.breaker.record_success()
+                raise UpstreamError(f"Ticketmaster request failed: {e}") from e
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+
+            self.breaker.record_failure()
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, response)
+                print(f"Ticketmaster request failed ({last_error}), retrying in {delay:.1f}s")
+                self.sleep(delay)
+        raise UpstreamError(f"Ticketmaster request failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def get_events_page(self, keyword: str, page: int = 0, size: int = 60) -> dict:
+        """Fetch one page of Discovery events for a keyword"""
+        return self.get("events.json", {"keyword": keyword, "page": page, "size": size}).json()
+
+    def stream_events_page(self, keyword: str, page: int = 0, size: int = 60) -> "DiscoveryEventStream":
+        """Open one page of Discovery events for a keyword, parsed as it downloads"""
+        response = self.get("events.json", {"keyword": keyword, "page": page, "size": size}, stream=True)
+        return DiscoveryEventStream(response)
+
+    def close(self) -> None:
+        self.http_client.close()
+
+
+_client: Optional[TicketmasterClient] = None
+_client_lock = threading.Lock()
+
+
+def get_ticketmaster_client() -> TicketmasterClient:
+    """Shared client, so quota and breaker state carry over between ingestion cycles"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TicketmasterClient()
+        return _client
@@ -0,0 +1,36 @@
+# services/venue_service.py
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.Repository.venue_repository import get_venues
+from app.Repository.event_repository import get_total_count, apply_pagination
+from app.Models.venue import PaginatedVenuesResponse
+
+def get_venues_service(
+        db: Session,
+        page: int = 1,
+        per_page: int = 10,
+        name: Optional[str] = None,
+        city: Optional[str] = None,
+        country: Optional[str] = None
+    ) -> PaginatedVenuesResponse:
+        try:
+            query = get_venues(db, name=name, city=city, country=country)
+            total = get_total_count(query)
+            venues = apply_pagination(query, page, per_page)
+
+            total_pages = (total + per_page - 1) // per_page
+            return PaginatedVenuesResponse(
+                venues=venues,
+                total=total,
+                page=page,
+                per_page=per_page,
+                total_pages=total_pages,
+                has_next=page < total_pages,
+                has_prev=page > 1
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error fetching venues: {str(e)}"
+            )
@@ -6,8 +6,12 @@ import os
 from dotenv import load_dotenv
 from core.database import Base
 from Models.user import User
-from Models.event import Event
+from Models.event import Event, ArchivedEvent, UpcomingEvent
+from Models.venue import Venue
 from Models.favorite import Favorite
+from Models.ingestion import IngestionCheckpoint, IngestionJob
+from Models.notification import EventChange, Notification
+from Models.recommendation import EventNeighbor
 
 load_dotenv()
 config = context.config
@@ -0,0 +1,30 @@
+"""Add event venue coordinates
+
+Revision ID: 3b8e52c1d7a4
+Revises: 94f1acfa93b0
+Create Date: 2026-10-19 10:04:17.552930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e52c1d7a4'
+down_revision: Union[str, None] = '94f1acfa93b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_events_location', 'events', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_location', table_name='events')
+    op.drop_column('events', 'longitude')
+    op.drop_column('events', 'latitude')
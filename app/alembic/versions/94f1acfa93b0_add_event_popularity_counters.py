@@ -0,0 +1,65 @@
+"""Add event popularity counters
+
+Revision ID: 94f1acfa93b0
+Revises: 7d1209db2fcf
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '94f1acfa93b0'
+down_revision: Union[str, None] = '7d1209db2fcf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app/core/trending.py
+TRENDING_EPOCH = datetime(2025, 1, 1)
+TRENDING_HALF_LIFE = timedelta(hours=24)
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('events', sa.Column('trending_score', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_events_favorite_count'), 'events', ['favorite_count'], unique=False)
+    op.create_index(op.f('ix_events_trending_score'), 'events', ['trending_score'], unique=False)
+
+    # Backfill counters from the existing favorites
+    op.execute(
+        "UPDATE events SET favorite_count = "
+        "(SELECT count(*) FROM favorites WHERE favorites.event_id = events.id)"
+    )
+
+    # Backfill log2 trending scores, one event at a time
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT event_id, created_at FROM favorites "
+        "WHERE created_at IS NOT NULL ORDER BY event_id"
+    ))
+    scores = {}
+    for event_id, created_at in rows:
+        weight = (created_at - TRENDING_EPOCH) / TRENDING_HALF_LIFE
+        score = scores.get(event_id)
+        if score is None:
+            scores[event_id] = weight
+        else:
+            high, low = max(score, weight), min(score, weight)
+            scores[event_id] = high + math.log2(1 + 2 ** (low - high))
+    for event_id, score in scores.items():
+        conn.execute(
+            sa.text("UPDATE events SET trending_score = :score WHERE id = :id"),
+            {"score": score, "id": event_id}
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_events_trending_score'), table_name='events')
+    op.drop_index(op.f('ix_events_favorite_count'), table_name='events')
+    op.drop_column('events', 'trending_score')
+    op.drop_column('events', 'favorite_count')
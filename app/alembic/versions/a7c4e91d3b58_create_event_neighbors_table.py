@@ -0,0 +1,34 @@
+"""Create event neighbors table
+
+Revision ID: a7c4e91d3b58
+Revises: f3b8d61a2c47
+Create Date: 2026-10-19 20:11:37.514062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e91d3b58'
+down_revision: Union[str, None] = 'f3b8d61a2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_neighbors',
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('neighbor_id', sa.String(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('co_favorites', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('event_id', 'rank')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_neighbors')
@@ -0,0 +1,28 @@
+"""Index event and event change creation times
+
+Revision ID: b3f6d8a1c924
+Revises: e4c9a2f7b165
+Create Date: 2026-10-20 09:12:44.318290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6d8a1c924'
+down_revision: Union[str, None] = 'e4c9a2f7b165'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_events_created_at'), 'events', ['created_at'], unique=False)
+    op.create_index(op.f('ix_event_changes_created_at'), 'event_changes', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_event_changes_created_at'), table_name='event_changes')
+    op.drop_index(op.f('ix_events_created_at'), table_name='events')
@@ -0,0 +1,53 @@
+"""Create events archive table
+
+Revision ID: b6f3c1d8e527
+Revises: a4d7e2c90b18
+Create Date: 2026-10-19 15:21:07.664310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f3c1d8e527'
+down_revision: Union[str, None] = 'a4d7e2c90b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('events_archive',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('venue_id', sa.String(), nullable=True),
+    sa.Column('url', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('trending_score', sa.Float(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['venue_id'], ['venues.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_events_archive_id'), 'events_archive', ['id'], unique=False)
+    op.create_index(op.f('ix_events_archive_start_date'), 'events_archive', ['start_date'], unique=False)
+    op.create_index(op.f('ix_events_archive_venue_id'), 'events_archive', ['venue_id'], unique=False)
+
+    # Favorites keep pointing at events after they move to the archive
+    op.drop_constraint('favorites_event_id_fkey', 'favorites', type_='foreignkey')
+    op.create_index(op.f('ix_favorites_event_id'), 'favorites', ['event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_favorites_event_id'), table_name='favorites')
+    op.execute("DELETE FROM favorites WHERE event_id NOT IN (SELECT id FROM events)")
+    op.create_foreign_key('favorites_event_id_fkey', 'favorites', 'events', ['event_id'], ['id'], ondelete='CASCADE')
+
+    op.drop_index(op.f('ix_events_archive_venue_id'), table_name='events_archive')
+    op.drop_index(op.f('ix_events_archive_start_date'), table_name='events_archive')
+    op.drop_index(op.f('ix_events_archive_id'), table_name='events_archive')
+    op.drop_table('events_archive')
@@ -0,0 +1,110 @@
+"""Create venues table and move venue columns off events
+
+Revision ID: c5d27e9f4a61
+Revises: 3b8e52c1d7a4
+Create Date: 2026-10-19 11:26:03.114872
+
+"""
+from datetime import datetime
+from hashlib import md5
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d27e9f4a61'
+down_revision: Union[str, None] = '3b8e52c1d7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def legacy_venue_id(name, city, country) -> str:
+    """Existing rows never stored a Ticketmaster venue id, so they get a stable synthetic one"""
+    return "legacy-" + md5(f"{name or ''}|{city or ''}|{country or ''}".encode()).hexdigest()
+
+
+def backfill_venues() -> None:
+    """One venue per distinct (venue_name, city, country), preferring a row with coordinates"""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, venue_name, city, country, latitude, longitude FROM events "
+        "WHERE venue_name IS NOT NULL AND venue_name <> ''"
+    )).fetchall()
+    venues, event_venues = {}, []
+    for event_id, name, city, country, latitude, longitude in rows:
+        venue_id = legacy_venue_id(name, city, country)
+        event_venues.append({"event_id": event_id, "venue_id": venue_id})
+        if venue_id not in venues or venues[venue_id]["latitude"] is None:
+            venues[venue_id] = {
+                "id": venue_id, "name": name, "city": city, "country": country,
+                "latitude": latitude, "longitude": longitude, "created_at": datetime.utcnow()
+            }
+    if venues:
+        bind.execute(sa.text(
+            "INSERT INTO venues (id, name, city, country, latitude, longitude, created_at) "
+            "VALUES (:id, :name, :city, :country, :latitude, :longitude, :created_at)"
+        ), list(venues.values()))
+        bind.execute(sa.text("UPDATE events SET venue_id = :venue_id WHERE id = :event_id"), event_venues)
+
+
+def upgrade() -> None:
+    op.create_table('venues',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_venues_id'), 'venues', ['id'], unique=False)
+    op.create_index(op.f('ix_venues_name'), 'venues', ['name'], unique=False)
+    op.create_index(op.f('ix_venues_city'), 'venues', ['city'], unique=False)
+    op.create_index(op.f('ix_venues_country'), 'venues', ['country'], unique=False)
+    op.create_index('ix_venues_location', 'venues', ['latitude', 'longitude'], unique=False)
+
+    op.add_column('events', sa.Column('venue_id', sa.String(), nullable=True))
+    op.create_index(op.f('ix_events_venue_id'), 'events', ['venue_id'], unique=False)
+
+    # Hashed in Python rather than with PostgreSQL's md5(), so SQLite can run it too
+    backfill_venues()
+
+    op.drop_index('ix_events_location', table_name='events')
+    # Batch mode is a plain ALTER on PostgreSQL and a table copy on SQLite,
+    # which can't add constraints to an existing table
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.create_foreign_key('fk_events_venue_id_venues', 'venues', ['venue_id'], ['id'])
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+        batch_op.drop_column('country')
+        batch_op.drop_column('city')
+        batch_op.drop_column('venue_name')
+
+
+def downgrade() -> None:
+    op.add_column('events', sa.Column('venue_name', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('city', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('country', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_events_location', 'events', ['latitude', 'longitude'], unique=False)
+    op.execute("""
+        UPDATE events SET venue_name = venues.name, city = venues.city, country = venues.country,
+                          latitude = venues.latitude, longitude = venues.longitude
+        FROM venues WHERE venues.id = events.venue_id
+    """)
+
+    op.drop_constraint('fk_events_venue_id_venues', 'events', type_='foreignkey')
+    op.drop_index(op.f('ix_events_venue_id'), table_name='events')
+    op.drop_column('events', 'venue_id')
+
+    op.drop_index('ix_venues_location', table_name='venues')
+    op.drop_index(op.f('ix_venues_country'), table_name='venues')
+    op.drop_index(op.f('ix_venues_city'), table_name='venues')
+    op.drop_index(op.f('ix_venues_name'), table_name='venues')
+    op.drop_index(op.f('ix_venues_id'), table_name='venues')
+    op.drop_table('venues')
@@ -0,0 +1,48 @@
+"""Keep undated events in the default partition
+
+Revision ID: c8a3e5f1d296
+Revises: b3f6d8a1c924
+Create Date: 2026-10-20 09:47:21.604138
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a3e5f1d296'
+down_revision: Union[str, None] = 'b3f6d8a1c924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, name, description, start_date, venue_id, url, created_at, favorite_count, trending_score"
+
+
+def upgrade() -> None:
+    # Only PostgreSQL partitions events; elsewhere id is still the primary key
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # A primary key can't hold a NULL start_date; a unique index can
+    op.drop_constraint('events_pkey', 'events', type_='primary')
+    op.alter_column('events', 'start_date', existing_type=sa.DateTime(), nullable=True)
+    op.create_index('uq_events_id_start_date', 'events', ['id', 'start_date'], unique=True)
+
+    # d2a9f4b7c310 parked undated events in the archive; NULL keys route to events_default
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_archive WHERE start_date IS NULL")
+    op.execute("DELETE FROM events_archive WHERE start_date IS NULL")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(f"""
+        INSERT INTO events_archive ({COLUMNS}, archived_at)
+        SELECT {COLUMNS}, now() FROM events WHERE start_date IS NULL
+        ON CONFLICT (id) DO NOTHING
+    """)
+    op.execute("DELETE FROM events WHERE start_date IS NULL")
+    op.drop_index('uq_events_id_start_date', table_name='events')
+    op.alter_column('events', 'start_date', existing_type=sa.DateTime(), nullable=False)
+    op.create_primary_key('events_pkey', 'events', ['id', 'start_date'])
@@ -0,0 +1,103 @@
+"""Partition events by month of start_date
+
+Revision ID: d2a9f4b7c310
+Revises: b6f3c1d8e527
+Create Date: 2026-10-19 16:40:52.093117
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9f4b7c310'
+down_revision: Union[str, None] = 'b6f3c1d8e527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of today; ingestion keeps extending this
+MONTHS_AHEAD = 12
+COLUMNS = "id, name, description, start_date, venue_id, url, created_at, favorite_count, trending_score"
+INDEXED_COLUMNS = ('id', 'start_date', 'venue_id', 'favorite_count', 'trending_score')
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def event_columns():
+    return [
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('venue_id', sa.String(), nullable=True),
+        sa.Column('url', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('trending_score', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['venue_id'], ['venues.id'], name='fk_events_venue_id_venues'),
+    ]
+
+
+def upgrade() -> None:
+    op.drop_constraint('fk_events_venue_id_venues', 'events', type_='foreignkey')
+    for column in ('id', 'venue_id', 'favorite_count', 'trending_score'):
+        op.drop_index(op.f(f'ix_events_{column}'), table_name='events')
+    op.rename_table('events', 'events_unpartitioned')
+    op.execute("ALTER INDEX events_pkey RENAME TO events_unpartitioned_pkey")
+
+    op.create_table('events',
+    *event_columns(),
+    sa.PrimaryKeyConstraint('id', 'start_date'),
+    postgresql_partition_by='RANGE (start_date)'
+    )
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    # One partition per month from the oldest stored event to MONTHS_AHEAD from now
+    oldest = op.get_bind().execute(sa.text("SELECT min(start_date) FROM events_unpartitioned")).scalar()
+    this_month = date.today().replace(day=1)
+    month = min(oldest.date().replace(day=1), this_month) if oldest else this_month
+    while month <= add_months(this_month, MONTHS_AHEAD):
+        op.execute(
+            f"CREATE TABLE events_y{month.year}m{month.month:02d} PARTITION OF events "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+        month = add_months(month, 1)
+
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_unpartitioned WHERE start_date IS NOT NULL")
+    # Undated events have no month to live in; keep them in the archive
+    op.execute(f"""
+        INSERT INTO events_archive ({COLUMNS}, archived_at)
+        SELECT {COLUMNS}, now() FROM events_unpartitioned WHERE start_date IS NULL
+        ON CONFLICT (id) DO NOTHING
+    """)
+    op.drop_table('events_unpartitioned')
+
+    for column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_events_{column}'), 'events', [column], unique=False)
+
+
+def downgrade() -> None:
+    for column in INDEXED_COLUMNS:
+        op.drop_index(op.f(f'ix_events_{column}'), table_name='events')
+    op.rename_table('events', 'events_partitioned')
+    op.execute("ALTER INDEX events_pkey RENAME TO events_partitioned_pkey")
+    op.execute("ALTER TABLE events_partitioned RENAME CONSTRAINT fk_events_venue_id_venues TO fk_events_partitioned_venue_id")
+
+    columns = event_columns()
+    columns[3] = sa.Column('start_date', sa.DateTime(), nullable=True)
+    op.create_table('events', *columns, sa.PrimaryKeyConstraint('id'))
+    op.execute(f"""
+        INSERT INTO events ({COLUMNS})
+        SELECT DISTINCT ON (id) {COLUMNS} FROM events_partitioned ORDER BY id, start_date DESC
+    """)
+    # Dropping the parent drops every partition with it
+    op.drop_table('events_partitioned')
+
+    for column in ('id', 'venue_id', 'favorite_count', 'trending_score'):
+        op.create_index(op.f(f'ix_events_{column}'), 'events', [column], unique=False)
@@ -0,0 +1,26 @@
+"""Add heartbeat to ingestion jobs
+
+Revision ID: d9e4b2a7f153
+Revises: c8a3e5f1d296
+Create Date: 2026-10-20 11:06:37.519842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b2a7f153'
+down_revision: Union[str, None] = 'c8a3e5f1d296'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ingestion_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingestion_jobs', 'heartbeat_at')
@@ -0,0 +1,61 @@
+"""Create upcoming events summary table
+
+Revision ID: e4c9a2f7b165
+Revises: a7c4e91d3b58
+Create Date: 2026-10-19 21:34:08.226417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9a2f7b165'
+down_revision: Union[str, None] = 'a7c4e91d3b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, name, description, start_date, venue_id, venue_name, city, country, latitude, longitude, url, created_at, favorite_count"
+
+
+def upgrade() -> None:
+    op.create_table('upcoming_events',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('venue_id', sa.String(), nullable=True),
+    sa.Column('venue_name', sa.String(), nullable=True),
+    sa.Column('city', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('url', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_upcoming_events_start_date_id', 'upcoming_events', ['start_date', 'id'], unique=False,
+        postgresql_include=['name', 'venue_name', 'city', 'country', 'url', 'favorite_count']
+    )
+    op.create_index(op.f('ix_upcoming_events_name'), 'upcoming_events', ['name'], unique=False)
+    op.create_index(op.f('ix_upcoming_events_favorite_count'), 'upcoming_events', ['favorite_count'], unique=False)
+
+    # Filled whole before listings are routed to it; ingestion keeps it current from here
+    op.execute(f"""
+        INSERT INTO upcoming_events ({COLUMNS})
+        SELECT e.id, e.name, e.description, e.start_date, e.venue_id, v.name, v.city, v.country,
+               v.latitude, v.longitude, e.url, e.created_at, e.favorite_count
+        FROM events e LEFT OUTER JOIN venues v ON v.id = e.venue_id
+        WHERE e.start_date IS NULL OR e.start_date >= (now() AT TIME ZONE 'utc')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upcoming_events_favorite_count'), table_name='upcoming_events')
+    op.drop_index(op.f('ix_upcoming_events_name'), table_name='upcoming_events')
+    op.drop_index('ix_upcoming_events_start_date_id', table_name='upcoming_events')
+    op.drop_table('upcoming_events')
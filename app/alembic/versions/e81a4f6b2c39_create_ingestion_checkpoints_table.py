@@ -0,0 +1,33 @@
+"""Create ingestion checkpoints table
+
+Revision ID: e81a4f6b2c39
+Revises: c5d27e9f4a61
+Create Date: 2026-10-19 12:48:55.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81a4f6b2c39'
+down_revision: Union[str, None] = 'c5d27e9f4a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ingestion_checkpoints',
+    sa.Column('keyword', sa.String(), nullable=False),
+    sa.Column('next_page', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('keyword')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingestion_checkpoints')
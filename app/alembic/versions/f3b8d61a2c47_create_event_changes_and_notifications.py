@@ -0,0 +1,58 @@
+"""Create event changes and notifications tables
+
+Revision ID: f3b8d61a2c47
+Revises: d2a9f4b7c310
+Create Date: 2026-10-19 18:42:15.203877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d61a2c47'
+down_revision: Union[str, None] = 'd2a9f4b7c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('fanned_out_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_event_changes_id'), 'event_changes', ['id'], unique=False)
+    op.create_index(op.f('ix_event_changes_event_id'), 'event_changes', ['event_id'], unique=False)
+    op.create_index('ix_event_changes_pending', 'event_changes', ['fanned_out_at', 'id'], unique=False)
+
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('change_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['change_id'], ['event_changes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('change_id', 'user_id', name='uq_notification_change_user')
+    )
+    op.create_index(op.f('ix_notifications_id'), 'notifications', ['id'], unique=False)
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    op.drop_index(op.f('ix_notifications_id'), table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index('ix_event_changes_pending', table_name='event_changes')
+    op.drop_index(op.f('ix_event_changes_event_id'), table_name='event_changes')
+    op.drop_index(op.f('ix_event_changes_id'), table_name='event_changes')
+    op.drop_table('event_changes')
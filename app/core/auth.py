@@ -1,12 +1,9 @@
 
 # core/auth.py
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2AuthorizationCodeBearer, HTTPAuthorizationCredentials, HTTPBearer
-from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
-from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
-from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from app.core.database import get_db
@@ -15,6 +12,7 @@ from app.Services.user_service import UserService
 import os
 import secrets
 from app.Models.user import User, UserSchema
+from app.core.oidc import GOOGLE_METADATA_URL
 
 config = Config('.env')
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', config('GOOGLE_CLIENT_ID', default=''))
@@ -24,23 +22,40 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
-oauth = OAuth()
-oauth.register(
-    name='google',
-    client_id=GOOGLE_CLIENT_ID,
-    client_secret=GOOGLE_CLIENT_SECRET,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile',
-        'response_type': 'code',
-    },
-  
-    authorize_params={
-        'access_type': 'offline',
-        'response_type': 'code',
-        'prompt': 'consent',
-    }
-)
+_oauth = None
+
+def get_oauth():
+    """
+    The Google OAuth client, registered on first use so that importing the app
+    doesn't pay for authlib until someone actually logs in. Discovery metadata
+    and JWKS are cached with a TTL (see core/oidc.py).
+    """
+    global _oauth
+    if _oauth is None:
+        from authlib.integrations.starlette_client import OAuth
+        from app.core.google_oauth import GoogleOAuthApp
+
+        oauth = OAuth()
+        oauth.register(
+            name='google',
+            client_cls=GoogleOAuthApp,
+            client_id=GOOGLE_CLIENT_ID,
+            client_secret=GOOGLE_CLIENT_SECRET,
+            server_metadata_url=GOOGLE_METADATA_URL,
+            client_kwargs={
+                'scope': 'openid email profile',
+                'response_type': 'code',
+            },
+
+            authorize_params={
+                'access_type': 'offline',
+                'response_type': 'code',
+                'prompt': 'consent',
+            }
+        )
+        _oauth = oauth
+    return _oauth
+
 security = HTTPBearer()
 
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
@@ -55,6 +70,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -68,11 +84,13 @@ def create_refresh_token(data: dict) -> str:
         "type": "refresh",
         "jti": secrets.token_urlsafe(32)  # Unique token ID for revocation
     })
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
     
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode JWT token"""
+    from jose import jwt, JWTError
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -97,13 +115,14 @@ def create_token_pair(user_data: dict) -> Dict[str, str]:
         "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
     }
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> UserSchema:
     """
     Dependency to get current authenticated user from JWT token
     Use this in your route dependencies like: user = Depends(get_current_user)
+    Plain def, so FastAPI runs the user lookup in its threadpool, off the event loop
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -171,4 +190,17 @@ async def refresh_access_token(
         "name": user.name
     }
     
-    return create_token_pair(user_data)
\ No newline at end of file
+    return create_token_pair(user_data)
+
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', config('ADMIN_TOKEN', default=''))
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding operator endpoints with the shared ADMIN_TOKEN.
+    Admin endpoints stay disabled while no token is configured.
+    """
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
@@ -0,0 +1,100 @@
+# core/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+from app.core.shared_state import CatalogVersion, catalog_version
+
+EVENT_CACHE_SIZE = 10000
+EVENT_CACHE_TTL_SECONDS = 300
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used cache with a per-entry TTL.
+    With a catalog version, invalidations also bump the shared version and
+    every process drops its entries once it sees another process's bump.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: Optional[float] = None, version: Optional[CatalogVersion] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._seen_version = None
+
+    def _sync(self) -> None:
+        """Clear entries another process may have made stale; caller holds the lock"""
+        if self.version is None:
+            return
+        current = self.version.current()
+        if current != self._seen_version:
+            if self._seen_version is not None:
+                self._entries.clear()
+            self._seen_version = current
+
+    def _live(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._entries[key]  # Remove expired entry
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value or None"""
+        with self._lock:
+            self._sync()
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Returns the cached values for the keys that are present"""
+        found = {}
+        with self._lock:
+            self._sync()
+            for key in keys:
+                entry = self._live(key)
+                if entry:
+                    found[key] = entry[0]
+        return found
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, *keys: Hashable) -> None:
+        """Drop keys from this process only, leaving the shared version alone"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if self.version is not None and keys:
+            previous = self._seen_version
+            bumped = self.version.bump()
+            with self._lock:
+                # Our own keys are already gone; only a skipped version means someone else changed things
+                if previous is not None and bumped == previous + 1:
+                    self._seen_version = bumped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Hot EventSchema objects by event id, shared by detail lookups and the favorite flow
+event_detail_cache = LRUCache(EVENT_CACHE_SIZE, EVENT_CACHE_TTL_SECONDS, version=catalog_version)
@@ -17,4 +17,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+# The schema is managed by Alembic; create_all only runs when explicitly enabled (local dev)
+CREATE_TABLES = os.getenv("CREATE_TABLES", "").lower() in ("1", "true", "yes")
+
+def create_tables_if_enabled() -> bool:
+    """Create missing tables when CREATE_TABLES is set; returns whether it ran"""
+    if CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+    return CREATE_TABLES
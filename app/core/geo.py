@@ -0,0 +1,61 @@
+# core/geo.py
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_bound(radius_km: float) -> float:
+    """The haversine term a of haversine_km at radius_km: points within the radius have a <= this"""
+    return math.sin(min(radius_km / (2 * EARTH_RADIUS_KM), math.pi / 2)) ** 2
+
+
+def longitude_scale(lat: float) -> float:
+    """Kilometers per degree of longitude relative to a degree of latitude at the given latitude"""
+    return max(math.cos(math.radians(lat)), 1e-6)
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Returns (min_lat, max_lat, min_lng, max_lng) enclosing the radius around a point.
+    Longitudes aren't wrapped, so near the antimeridian they run past ±180; see longitude_ranges.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    # Widest longitude reached by the circle, which lies slightly poleward of the center
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / longitude_scale(lat)
+    d_lng = math.degrees(math.asin(ratio)) if ratio < 1 else 180.0
+    return (
+        max(lat - d_lat, -90.0),
+        min(lat + d_lat, 90.0),
+        lng - d_lng,
+        lng + d_lng,
+    )
+
+
+def longitude_ranges(min_lng: float, max_lng: float) -> List[Tuple[float, float]]:
+    """Splits a longitude span into ranges within [-180, 180], two when it crosses the antimeridian"""
+    if max_lng - min_lng >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lng < -180.0:
+        return [(min_lng + 360.0, 180.0), (-180.0, max_lng)]
+    if max_lng > 180.0:
+        return [(min_lng, 180.0), (-180.0, max_lng - 360.0)]
+    return [(min_lng, max_lng)]
+
+
+def parse_coordinate(value) -> Optional[float]:
+    """Parse a latitude/longitude value from the Ticketmaster payload"""
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
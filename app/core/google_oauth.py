@@ -0,0 +1,38 @@
+# core/google_oauth.py
+import httpx
+from authlib.integrations.starlette_client.apps import StarletteOAuth2App
+from app.core.oidc import GOOGLE_HTTP_TIMEOUT_SECONDS, fetch_json, get_http_transport
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    Sends through the shared connection pool. authlib closes its client after
+    every call, which closes its transport; closing this one leaves the pool open.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await get_http_transport().handle_async_request(request)
+
+
+class GoogleOAuthApp(StarletteOAuth2App):
+    """
+    authlib's Starlette client, with discovery metadata and JWKS read through
+    the shared TTL cache. authlib itself keeps them forever once loaded and
+    opens a new client for every fetch.
+    """
+
+    def _get_oauth_client(self, **metadata):
+        # authlib builds a client per call; the token exchange still reuses the shared pool's connections
+        return super()._get_oauth_client(transport=PooledTransport(), timeout=GOOGLE_HTTP_TIMEOUT_SECONDS, **metadata)
+
+    async def load_server_metadata(self):
+        if self._server_metadata_url:
+            self.server_metadata.update(await fetch_json(self._server_metadata_url))
+        return self.server_metadata
+
+    async def fetch_jwk_set(self, force=False):
+        metadata = await self.load_server_metadata()
+        uri = metadata.get("jwks_uri")
+        if not uri:
+            raise RuntimeError('Missing "jwks_uri" in metadata')
+        return await fetch_json(uri, force=force)
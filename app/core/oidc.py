@@ -0,0 +1,81 @@
+# core/oidc.py
+import asyncio
+import os
+from typing import Any, Optional, Tuple
+from app.core.cache import LRUCache
+
+# Overridable so load tests can point logins at a fake provider (see loadtest/fake_oidc.py)
+GOOGLE_METADATA_URL = os.getenv(
+    "GOOGLE_OIDC_METADATA_URL", "https://accounts.google.com/.well-known/openid-configuration"
+)
+# Google rotates signing keys every few days and publishes new ones well ahead, so an hour is safe
+OIDC_CACHE_TTL_SECONDS = 3600
+GOOGLE_HTTP_TIMEOUT_SECONDS = 10
+GOOGLE_MAX_CONNECTIONS = 100
+
+# Discovery documents and JWKS by URL
+oidc_cache = LRUCache(16, OIDC_CACHE_TTL_SECONDS)
+
+# (event loop, client, its connection pool, fetch lock) of the shared client
+_http: Optional[Tuple[asyncio.AbstractEventLoop, Any, Any, asyncio.Lock]] = None
+
+
+def _http_state() -> Tuple[Any, Any, asyncio.Lock]:
+    global _http
+    loop = asyncio.get_running_loop()
+    if _http is None or _http[0] is not loop:
+        # An httpx client's pooled connections belong to the loop that opened them
+        import httpx
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=GOOGLE_MAX_CONNECTIONS, max_keepalive_connections=20)
+        )
+        client = httpx.AsyncClient(timeout=GOOGLE_HTTP_TIMEOUT_SECONDS, transport=transport)
+        _http = (loop, client, transport, asyncio.Lock())
+    return _http[1], _http[2], _http[3]
+
+
+def get_http_client():
+    """
+    The keep-alive httpx.AsyncClient shared by every login for Google's
+    endpoints, so a callback reuses warm TLS connections instead of opening its own.
+    """
+    return _http_state()[0]
+
+
+def get_http_transport():
+    """
+    The connection pool behind get_http_client, for clients built elsewhere
+    (authlib's token exchange) that should reuse its connections
+    """
+    return _http_state()[1]
+
+
+async def close_http_client() -> None:
+    global _http
+    if _http is not None:
+        loop, client, _, _ = _http
+        _http = None
+        if loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+async def fetch_json(url: str, force: bool = False) -> Any:
+    """
+    GET a JSON document through the shared client, cached for
+    OIDC_CACHE_TTL_SECONDS. Concurrent misses wait for one fetch; force
+    refetches, e.g. when a token is signed with a key not in the cached JWKS.
+    """
+    if not force:
+        cached = oidc_cache.get(url)
+        if cached is not None:
+            return cached
+    client, _, lock = _http_state()
+    async with lock:
+        cached = None if force else oidc_cache.get(url)
+        if cached is None:
+            response = await client.get(url)
+            response.raise_for_status()
+            cached = response.json()
+            oidc_cache.set(url, cached)
+    return cached
@@ -0,0 +1,95 @@
+# core/pubsub.py
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+# Items buffered per subscriber before it is considered too slow and reset
+SUBSCRIBER_QUEUE_SIZE = 1000
+# Recently published keys remembered so the same item is only delivered once
+RECENT_KEYS = 10000
+
+
+class Subscription:
+    """One listener's queue, living on the event loop it subscribed from"""
+
+    def __init__(self, broker: "Broker", predicate: Optional[Callable[[Any], bool]], maxsize: int):
+        self.broker = broker
+        self.predicate = predicate
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        # Set when items had to be dropped; the listener should resync from the listing
+        self.overflowed = False
+
+    def matches(self, item: Any) -> bool:
+        return self.predicate is None or self.predicate(item)
+
+    def _deliver(self, items: list) -> None:
+        """Runs on the subscriber's loop"""
+        for item in items:
+            try:
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                # Wake the listener so it notices the overflow
+                return
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    In-process publish/subscribe. Publishers may be any thread; each
+    subscriber receives the items matching its predicate on its own event
+    loop, so an idle subscriber costs one queue and no thread.
+    """
+
+    def __init__(self, key: Callable[[Any], Hashable] = id, recent_keys: int = RECENT_KEYS):
+        self.key = key
+        self.recent_keys = recent_keys
+        self._lock = threading.Lock()
+        self._subscribers: set = set()
+        self._recent: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, predicate: Optional[Callable[[Any], bool]] = None,
+                  maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> Subscription:
+        """Must be called from the event loop that will consume the subscription"""
+        subscription = Subscription(self, predicate, maxsize)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, items: Iterable[Any]) -> int:
+        """Delivers items not published before to matching subscribers; returns how many were new"""
+        with self._lock:
+            fresh = []
+            for item in items:
+                key = self.key(item)
+                if key in self._recent:
+                    continue
+                self._recent[key] = None
+                fresh.append(item)
+            while len(self._recent) > self.recent_keys:
+                self._recent.popitem(last=False)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            matched = [item for item in fresh if subscription.matches(item)]
+            if matched:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._deliver, matched)
+                except RuntimeError:
+                    # The subscriber's loop is gone
+                    self.unsubscribe(subscription)
+        return len(fresh)
@@ -0,0 +1,333 @@
+# core/shared_state.py
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+# "memory": state lives in this process (single worker, tests)
+# "shm": a SQLite file in shared memory, shared by every worker on the node
+# "redis": any Redis-compatible server at REDIS_URL, shared across nodes
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "memory")
+SHARED_STATE_PATH = os.getenv(
+    "SHARED_STATE_PATH",
+    os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "ticketmaster-state.sqlite")
+)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# How long a process trusts its last read of the catalog version
+CATALOG_VERSION_CHECK_SECONDS = 1.0
+
+
+class SharedState(ABC):
+    """
+    Small key/value store for state that every serving process must agree on:
+    cache entries, counters and leases. Values must be picklable.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increments a counter and returns the new value"""
+
+    def counter(self, key: str) -> int:
+        """Current value of a counter maintained with incr"""
+        return self.get(key) or 0
+
+    @abstractmethod
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Takes or renews a named lease; False while another owner holds it"""
+
+    @abstractmethod
+    def release_lease(self, name: str, owner: str) -> None:
+        ...
+
+
+class InProcessState(SharedState):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _live(self, key: str):
+        entry = self._values.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ttl_seconds if ttl_seconds else None)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key)
+            value = (entry[0] if entry else 0) + 1
+            self._values[key] = (value, entry[1] if entry else None)
+            return value
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        with self._lock:
+            entry = self._live(f"lease:{name}")
+            if entry and entry[0] != owner:
+                return False
+            self._values[f"lease:{name}"] = (owner, time.monotonic() + ttl_seconds)
+            return True
+
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._lock:
+            entry = self._live(f"lease:{name}")
+            if entry and entry[0] == owner:
+                del self._values[f"lease:{name}"]
+
+
+class SqliteSharedState(SharedState):
+    """
+    Node-local state in a SQLite file, by default on /dev/shm so it never
+    touches disk. SQLite's own file locking makes every operation atomic
+    across the worker processes of one node.
+    """
+
+    def __init__(self, path: str = SHARED_STATE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS shared_state "
+                "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")
+            self._local.db = db
+        return db
+
+    def _transaction(self):
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        return db
+
+    def get(self, key: str) -> Any:
+        row = self._connect().execute(
+            "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), time.time() + ttl_seconds if ttl_seconds else None)
+        )
+
+    def delete(self, *keys: str) -> None:
+        self._connect().executemany("DELETE FROM shared_state WHERE key = ?", [(key,) for key in keys])
+
+    def incr(self, key: str) -> int:
+        db = self._transaction()
+        try:
+            row = db.execute(
+                "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+            value = (pickle.loads(row[0]) if row else 0) + 1
+            db.execute(
+                "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, NULL)",
+                (key, pickle.dumps(value))
+            )
+            db.execute("COMMIT")
+            return value
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        key, now = f"lease:{name}", time.time()
+        db = self._transaction()
+        try:
+            row = db.execute(
+                "SELECT value FROM shared_state WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            acquired = row is None or pickle.loads(row[0]) == owner
+            if acquired:
+                db.execute(
+                    "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, pickle.dumps(owner), now + ttl_seconds)
+                )
+            db.execute("COMMIT")
+            return acquired
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self._connect().execute(
+            "DELETE FROM shared_state WHERE key = ? AND value = ?", (f"lease:{name}", pickle.dumps(owner))
+        )
+
+
+class RedisSharedState(SharedState):
+    """State on a Redis-compatible server, shared by every node"""
+
+    # Deletes the lease only if it is still held by the caller
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+    # Extends the lease only if it is still held by the caller
+    RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+    )
+
+    def __init__(self, url: str = REDIS_URL, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    def get(self, key: str) -> Any:
+        value = self.client.get(key)
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        self.client.set(key, pickle.dumps(value), px=int(ttl_seconds * 1000) if ttl_seconds else None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+    def incr(self, key: str) -> int:
+        # Counters are stored as plain integers so INCR works on them
+        return int(self.client.incr(f"counter:{key}"))
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(f"counter:{key}") or 0)
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        key, ttl_ms = f"lease:{name}", int(ttl_seconds * 1000)
+        if self.client.set(key, owner, nx=True, px=ttl_ms):
+            return True
+        return bool(self.client.eval(self.RENEW_SCRIPT, 1, key, owner, ttl_ms))
+
+    def release_lease(self, name: str, owner: str) -> None:
+        self.client.eval(self.RELEASE_SCRIPT, 1, f"lease:{name}", owner)
+
+
+class CatalogVersion:
+    """
+    Cluster-wide counter bumped whenever the event catalog changes, so caches
+    in every process can tell their entries may be stale.
+    """
+
+    KEY = "catalog_version"
+
+    def __init__(self, state_factory, check_seconds: float = CATALOG_VERSION_CHECK_SECONDS):
+        self._state_factory = state_factory
+        self.check_seconds = check_seconds
+        self._value = 0
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        """The shared version, re-read at most once per check interval"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_seconds:
+            value = self._state_factory().counter(self.KEY)
+            with self._lock:
+                self._value, self._checked_at = value, now
+        return self._value
+
+    def bump(self) -> int:
+        value = self._state_factory().incr(self.KEY)
+        with self._lock:
+            self._value, self._checked_at = value, time.monotonic()
+        return value
+
+
+class Lease:
+    """
+    A named lease this process holds while it keeps renewing it. Work guarded
+    by the lease runs in exactly one process; if that process dies the lease
+    expires and the next renewal elsewhere takes it over.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, state_factory=None, owner: Optional[str] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self._state_factory = state_factory or get_shared_state
+        self.owner = owner or process_id()
+        self.held = False
+
+    def renew(self) -> bool:
+        self.held = self._state_factory().acquire_lease(self.name, self.owner, self.ttl_seconds)
+        return self.held
+
+    def release(self) -> None:
+        if self.held:
+            self._state_factory().release_lease(self.name, self.owner)
+            self.held = False
+
+    def guard(self, func):
+        """Wraps a job so it only runs while this process holds the lease"""
+        def run_if_held(*args, **kwargs):
+            if self.held:
+                return func(*args, **kwargs)
+        run_if_held.__name__ = func.__name__
+        return run_if_held
+
+
+_state: Optional[SharedState] = None
+_state_lock = threading.Lock()
+
+
+def create_shared_state(backend: str = SHARED_STATE_BACKEND) -> SharedState:
+    if backend == "memory":
+        return InProcessState()
+    if backend == "shm":
+        return SqliteSharedState()
+    if backend == "redis":
+        return RedisSharedState()
+    raise ValueError(f"Unknown SHARED_STATE_BACKEND '{backend}'")
+
+
+def get_shared_state() -> SharedState:
+    """The process-wide shared state backend, created on first use"""
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = create_shared_state()
+        return _state
+
+
+def process_id() -> str:
+    """Identifies this process as a lease owner"""
+    return f"{os.uname().nodename}:{os.getpid()}"
+
+
+catalog_version = CatalogVersion(get_shared_state)
@@ -0,0 +1,103 @@
+# core/similarity.py
+import heapq
+import math
+from collections import Counter, defaultdict
+from typing import Iterator, List, Sequence, Tuple
+
+NEIGHBORS_PER_ITEM = 20
+# Users with more favorites than this are left out: each adds O(n^2) pairs and little signal
+MAX_USER_FAVORITES = 500
+# Item rows of the co-occurrence matrix held in memory at once
+SIMILARITY_BLOCK_SIZE = 2048
+
+Neighbor = Tuple[int, float, int]  # (item, cosine score, users who favorited both)
+
+
+def item_neighbors(
+    users: Sequence[int],
+    items: Sequence[int],
+    n_users: int,
+    n_items: int,
+    k: int = NEIGHBORS_PER_ITEM,
+    max_user_favorites: int = MAX_USER_FAVORITES,
+    block_size: int = SIMILARITY_BLOCK_SIZE
+) -> Iterator[Tuple[int, List[Neighbor]]]:
+    """
+    Top-k most similar items per item from (user, item) interaction pairs,
+    scored by cosine similarity of the items' user sets:
+    co(i, j) / sqrt(n_i * n_j). Items without co-favorites are not yielded.
+    """
+    # numpy/scipy are optional and only loaded by the offline job, never by the web app
+    try:
+        import numpy
+        from scipy import sparse
+    except ImportError:
+        yield from _python_neighbors(users, items, k, max_user_favorites)
+    else:
+        yield from _sparse_neighbors(numpy, sparse, users, items, n_users, n_items, k, max_user_favorites, block_size)
+
+
+def _sparse_neighbors(np, sparse, users, items, n_users, n_items, k, max_user_favorites, block_size):
+    """
+    Builds the binary user x item matrix X and computes X^T X one block of
+    item rows at a time, so memory holds the interactions plus one block of
+    co-occurrence counts rather than the whole item x item matrix.
+    """
+    users = np.asarray(users, dtype=np.int32)
+    items = np.asarray(items, dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(users), dtype=np.float32), (users, items)), shape=(n_users, n_items)
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    matrix = matrix[np.diff(matrix.indptr) <= max_user_favorites]
+    favorites = np.asarray(matrix.sum(axis=0), dtype=np.float64).ravel()
+    transposed = matrix.T.tocsr()
+
+    for start in range(0, n_items, block_size):
+        block = (transposed[start:start + block_size] @ matrix).tocsr()
+        for row in range(block.shape[0]):
+            item = start + row
+            low, high = block.indptr[row], block.indptr[row + 1]
+            neighbors, counts = block.indices[low:high], block.data[low:high]
+            keep = neighbors != item
+            neighbors, counts = neighbors[keep], counts[keep]
+            if not len(neighbors):
+                continue
+            scores = counts.astype(np.float64) / np.sqrt(favorites[item] * favorites[neighbors])
+            if len(scores) > k:
+                # Everything tied with the k-th score, so ties resolve by id like the fallback
+                top = np.flatnonzero(scores >= -np.partition(-scores, k - 1)[k - 1])
+            else:
+                top = np.arange(len(scores))
+            top = top[np.lexsort((neighbors[top], -scores[top]))][:k]
+            yield item, [
+                (int(neighbor), float(score), int(count))
+                for neighbor, score, count in zip(neighbors[top], scores[top], counts[top])
+            ]
+
+
+def _python_neighbors(users, items, k, max_user_favorites):
+    """Pure-Python fallback: pair counting per user, fine for small catalogs"""
+    by_user = defaultdict(set)
+    for user, item in zip(users, items):
+        by_user[user].add(item)
+    favorites = Counter()
+    cooccurrence = defaultdict(Counter)
+    for user_items in by_user.values():
+        if len(user_items) > max_user_favorites:
+            continue
+        favorites.update(user_items)
+        for item in user_items:
+            row = cooccurrence[item]
+            for other in user_items:
+                if other != item:
+                    row[other] += 1
+
+    for item in sorted(cooccurrence):
+        scored = (
+            (count / math.sqrt(favorites[item] * favorites[other]), other, count)
+            for other, count in cooccurrence[item].items()
+        )
+        top = heapq.nsmallest(k, scored, key=lambda entry: (-entry[0], entry[1]))
+        yield item, [(other, score, count) for score, other, count in top]
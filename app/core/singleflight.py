@@ -0,0 +1,65 @@
+# core/singleflight.py
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution. The
+    first caller runs the function; callers arriving while it runs wait and
+    share its result, or its exception. Nothing is kept once the call returns,
+    so this only dedupes work already in flight and never serves stale data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.executions = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        """Counters since startup; coalescing_ratio is the share of calls that rode on another's execution"""
+        with self._lock:
+            calls, executions, in_flight = self.calls, self.executions, len(self._calls)
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": calls - executions,
+            "coalescing_ratio": round((calls - executions) / calls, 4) if calls else 0.0,
+            "in_flight": in_flight,
+        }
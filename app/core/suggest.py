@@ -0,0 +1,246 @@
+# core/suggest.py
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+SUGGEST_KINDS = ("event", "venue", "city")
+# Prefixes matching more entries than this get their top items computed at build time,
+# so a query never ranks more than this many entries
+PRECOMPUTE_THRESHOLD = 1000
+# Items kept per kind for a precomputed prefix
+PRECOMPUTED_TOP = 50
+# Weights drift as favorites change, so the index is rebuilt from scratch this often
+SUGGEST_FULL_REBUILD_INTERVAL = timedelta(minutes=10)
+# Sorts after every character a normalized key can contain
+KEY_END = "\U0010ffff"
+
+Ref = Tuple[str, str]  # (kind, id); cities use their normalized name as id
+
+
+class SuggestRow(NamedTuple):
+    """One event as loaded for the index"""
+    id: str
+    name: str
+    venue_id: Optional[str]
+    venue_name: Optional[str]
+    city: Optional[str]
+    favorite_count: int
+    created_at: Optional[datetime]
+
+
+class Suggestion(NamedTuple):
+    kind: str
+    text: str
+    id: Optional[str]
+    score: float
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace so "Beyoncé" matches "beyon" """
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(text.lower().split())
+
+
+def word_starts(text: str) -> List[str]:
+    """Every suffix of a normalized text that starts a word, so "madison square" matches "squ" """
+    words = text.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+def contributions(row: SuggestRow) -> List[Tuple[Ref, str]]:
+    """The items an event adds its popularity to"""
+    items = [(("event", row.id), row.name)]
+    if row.venue_id and row.venue_name:
+        items.append((("venue", row.venue_id), row.venue_name))
+    if row.city:
+        items.append((("city", normalize(row.city)), row.city))
+    return items
+
+
+def popularity(row: SuggestRow) -> int:
+    return 1 + (row.favorite_count or 0)
+
+
+class SuggestIndex:
+    """
+    Prefix index over event names, venues and cities: a sorted array of
+    (word-start key, item) entries searched with bisect. Items are ranked by
+    popularity, the favorites of an event plus one, summed over their events
+    for venues and cities.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._texts: Dict[Ref, str] = {}
+        self._weights: Dict[Ref, float] = {}
+        self._events: Dict[str, SuggestRow] = {}
+        self._entries: List[Tuple[str, Ref]] = []
+        self._top: Dict[str, List[Ref]] = {}
+        self.loaded_until: Optional[datetime] = None
+        self.built_at: Optional[datetime] = None
+        self.version: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def is_refreshing(self) -> bool:
+        return self._write_lock.locked()
+
+    def needs_full_rebuild(self) -> bool:
+        return self.built_at is None or datetime.utcnow() - self.built_at >= SUGGEST_FULL_REBUILD_INTERVAL
+
+    @staticmethod
+    def _rank(refs: Iterable[Ref], weights: Dict[Ref, float], texts: Dict[Ref, str]) -> List[Ref]:
+        """Top PRECOMPUTED_TOP refs of each kind, best first; ties go alphabetically"""
+        by_kind: Dict[str, List[Ref]] = {}
+        for ref in refs:
+            by_kind.setdefault(ref[0], []).append(ref)
+        top = []
+        for kind_refs in by_kind.values():
+            top.extend(heapq.nlargest(PRECOMPUTED_TOP, kind_refs, key=weights.__getitem__))
+        top.sort(key=lambda ref: (-weights[ref], texts[ref]))
+        return top
+
+    @staticmethod
+    def _entries_for(refs: Iterable[Ref], texts: Dict[Ref, str]) -> List[Tuple[str, Ref]]:
+        return [(key, ref) for ref in refs for key in word_starts(normalize(texts[ref]))]
+
+    def _precompute(self, entries, weights, texts, top, start=0, end=None, length=1) -> List[Ref]:
+        """
+        Ranks entries[start:end], recording top lists in `top` for every prefix
+        whose range is too large to rank per query. Works bottom-up: a prefix's
+        top items are among its longer prefixes' top items, so each entry is
+        only ranked once.
+        """
+        end = len(entries) if end is None else end
+        candidates = set()
+        i = start
+        while i < end:
+            key, ref = entries[i]
+            if len(key) < length:
+                candidates.add(ref)
+                i += 1
+                continue
+            prefix = key[:length]
+            j = bisect_left(entries, (prefix + KEY_END,), i, end)
+            if j - i > PRECOMPUTE_THRESHOLD:
+                top[prefix] = self._precompute(entries, weights, texts, top, i, j, length + 1)
+                candidates.update(top[prefix])
+            else:
+                candidates.update(ref for _, ref in entries[i:j])
+            i = j
+        return self._rank(candidates, weights, texts)
+
+    def rebuild(self, rows: Iterable[SuggestRow], version: Optional[int] = None) -> None:
+        """Replace the whole index"""
+        with self._write_lock:
+            self._rebuild(rows, version)
+
+    def _rebuild(self, rows: Iterable[SuggestRow], version: Optional[int]) -> None:
+        texts, weights, events = {}, {}, {}
+        loaded_until = None
+        for row in rows:
+            events[row.id] = row
+            for ref, text in contributions(row):
+                texts[ref] = text
+                weights[ref] = weights.get(ref, 0) + popularity(row)
+            if row.created_at and (loaded_until is None or row.created_at > loaded_until):
+                loaded_until = row.created_at
+        entries = self._entries_for(texts, texts)
+        entries.sort()
+        top = {}
+        self._precompute(entries, weights, texts, top)
+        with self._lock:
+            self._texts, self._weights, self._events = texts, weights, events
+            self._entries, self._top = entries, top
+            self.loaded_until, self.version = loaded_until, version
+            self.built_at = datetime.utcnow()
+
+    def extend(self, rows: Iterable[SuggestRow], version: Optional[int] = None) -> None:
+        """Merge in events added or changed since the last load, without rebuilding the rest"""
+        with self._write_lock:
+            self._extend(rows, version)
+
+    def _extend(self, rows: Iterable[SuggestRow], version: Optional[int]) -> None:
+        # Writers are serialized, so the current state can be read without the reader lock.
+        # Readers keep using the old dicts and list until the swap below.
+        texts, weights = dict(self._texts), dict(self._weights)
+        events = {}
+        loaded_until = self.loaded_until
+        for row in rows:
+            previous = events.get(row.id) or self._events.get(row.id)
+            if previous is not None:
+                for ref, _ in contributions(previous):
+                    weights[ref] -= popularity(previous)
+            events[row.id] = row
+            for ref, text in contributions(row):
+                texts[ref] = text
+                weights[ref] = weights.get(ref, 0) + popularity(row)
+            if row.created_at and (loaded_until is None or row.created_at > loaded_until):
+                loaded_until = row.created_at
+        changed = {ref for row in events.values() for ref, _ in contributions(row)}
+        added = self._entries_for((ref for ref in changed if ref not in self._texts), texts)
+        entries = self._entries
+        if added:
+            # Two sorted runs, so the sort only has to merge them
+            entries = entries + sorted(added)
+            entries.sort()
+
+        # Only the precomputed prefixes the changed items fall under need re-ranking
+        affected: Dict[str, set] = {}
+        for key, ref in self._entries_for(changed, texts):
+            for length in range(1, len(key) + 1):
+                prefix = key[:length]
+                if prefix in self._top:
+                    affected.setdefault(prefix, set(self._top[prefix])).add(ref)
+        top = {prefix: self._rank(refs, weights, texts) for prefix, refs in affected.items()}
+
+        with self._lock:
+            self._texts, self._weights = texts, weights
+            self._events.update(events)
+            self._entries = entries
+            self._top = {**self._top, **top}
+            self.loaded_until, self.version = loaded_until, version
+
+    def refresh(self, full_loader: Callable[[], Iterable[SuggestRow]],
+                since_loader: Callable[[datetime], Iterable[SuggestRow]], version: Optional[int] = None) -> None:
+        """Full rebuild when due, otherwise load only events created since the last load"""
+        if not self._write_lock.acquire(blocking=False):
+            return  # Another thread is already refreshing
+        try:
+            if self.needs_full_rebuild() or self.loaded_until is None:
+                self._rebuild(full_loader(), version)
+            else:
+                self._extend(since_loader(self.loaded_until), version)
+        finally:
+            self._write_lock.release()
+
+    def suggest(self, prefix: str, limit: int = 10, kinds: Iterable[str] = SUGGEST_KINDS) -> List[Suggestion]:
+        """Top `limit` items with a word starting with `prefix`, most popular first"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        kinds = set(kinds)
+        with self._lock:
+            texts, weights = self._texts, self._weights
+            candidates = self._top.get(prefix)
+            if candidates is None:
+                start = bisect_left(self._entries, (prefix,))
+                end = bisect_left(self._entries, (prefix + KEY_END,), start)
+                candidates = self._rank({ref for _, ref in self._entries[start:end]}, weights, texts)
+        suggestions = []
+        for ref in candidates:
+            if ref[0] in kinds and weights[ref] > 0:
+                suggestions.append(Suggestion(ref[0], texts[ref], ref[1] if ref[0] != "city" else None, weights[ref]))
+                if len(suggestions) >= limit:
+                    break
+        return suggestions
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,78 @@
+# core/trending.py
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from app.Models.event import EventSchema
+
+# Scores are stored as log2(sum(2 ** ((favorited_at - EPOCH) / HALF_LIFE))).
+# Every favorite's weight is fixed when it is written, so stored scores keep
+# their relative order as time passes and never need to be decayed in place.
+TRENDING_EPOCH = datetime(2025, 1, 1)
+TRENDING_HALF_LIFE = timedelta(hours=24)
+TRENDING_TOP_K = 100
+TRENDING_REFRESH_INTERVAL = timedelta(minutes=5)
+
+
+def favorite_weight(favorited_at: datetime) -> float:
+    """Log2 weight contributed by a favorite created at the given time"""
+    return (favorited_at - TRENDING_EPOCH) / TRENDING_HALF_LIFE
+
+
+def add_favorite_score(score: Optional[float], weight: float) -> float:
+    """Adds a favorite's weight to a log2 trending score"""
+    if score is None:
+        return weight
+    high, low = max(score, weight), min(score, weight)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def remove_favorite_score(score: Optional[float], weight: float) -> Optional[float]:
+    """Removes a favorite's weight from a log2 trending score"""
+    if score is None or weight >= score - 1e-9:
+        return None
+    return score + math.log2(1 - 2 ** (weight - score))
+
+
+def decayed_score(score: Optional[float], now: Optional[datetime] = None) -> float:
+    """Converts a stored score into the decayed favorite count as of now"""
+    if score is None:
+        return 0.0
+    return 2 ** (score - favorite_weight(now or datetime.utcnow()))
+
+
+class TrendingIndex:
+    """In-process top-K list of trending events, refreshed from the indexed score column"""
+
+    def __init__(self, size: int = TRENDING_TOP_K, refresh_interval: timedelta = TRENDING_REFRESH_INTERVAL):
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._events: List[EventSchema] = []
+        self._refreshed_at: Optional[datetime] = None
+
+    def is_stale(self) -> bool:
+        """Check if the top-K list has never been loaded or is older than the refresh interval"""
+        refreshed_at = self._refreshed_at
+        return refreshed_at is None or datetime.utcnow() - refreshed_at >= self.refresh_interval
+
+    def refresh(self, loader: Callable[[int], List[EventSchema]]) -> None:
+        """Reload the top-K list using a loader that returns the K highest scored events"""
+        events = loader(self.size)
+        with self._lock:
+            self._events = events
+            self._refreshed_at = datetime.utcnow()
+
+    def top(self, limit: int) -> List[EventSchema]:
+        """Returns the first `limit` trending events"""
+        with self._lock:
+            return self._events[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events = []
+            self._refreshed_at = None
+
+
+trending_index = TrendingIndex()
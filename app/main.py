@@ -1,15 +1,10 @@
 # fastapi_backend/main.py
 from fastapi import FastAPI
-from .Router import event_router, auth_router
-from .core.database import Base, engine
+from .Router import event_router, auth_router, venue_router, admin_router, notification_router
 from starlette.middleware.sessions import SessionMiddleware
 from .core.auth import SECRET_KEY
-from contextlib import asynccontextmanager
-from apscheduler.schedulers.background import BackgroundScheduler
 from .Services.lifespan import app_lifespan
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(lifespan=app_lifespan)
 
 
@@ -21,4 +16,7 @@ app.add_middleware(
 )
 
 app.include_router(event_router.router)
-app.include_router(auth_router.router)
\ No newline at end of file
+app.include_router(auth_router.router)
+app.include_router(venue_router.router)
+app.include_router(admin_router.router)
+app.include_router(notification_router.router)
\ No newline at end of file
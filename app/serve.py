@@ -0,0 +1,44 @@
+# app/serve.py
+"""
+Production server: one uvicorn process per core behind a single socket.
+
+    python -m app.serve                      # WEB_CONCURRENCY workers (default: CPU count)
+    python -m app.serve --workers 4 --port 8000
+
+With more than one worker, process-local caches would disagree, so the
+shared-state backend defaults to "shm" (a SQLite file in /dev/shm shared by
+the workers of this node). Set SHARED_STATE_BACKEND=redis to share it across
+nodes instead.
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API with multiple worker processes")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Worker processes inherit the environment, so they all pick the same backend
+        os.environ.setdefault("SHARED_STATE_BACKEND", "shm")
+    print(f"Serving on {args.host}:{args.port} with {args.workers} workers "
+          f"(shared state: {os.getenv('SHARED_STATE_BACKEND', 'memory')})")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        proxy_headers=True
+    )
+
+
+if __name__ == "__main__":
+    main()
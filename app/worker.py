@@ -0,0 +1,105 @@
+# app/worker.py
+"""
+Standalone ingestion worker.
+
+Runs queued ingestion jobs outside the web processes so parsing and ORM work
+never competes with request handling:
+
+    python -m app.worker            # poll forever, enqueueing fetch, archive and notification runs
+    python -m app.worker --once     # drain the queue once and exit
+"""
+import argparse
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal, create_tables_if_enabled
+from app.core.shared_state import Lease
+from app.Repository.ingestion_repository import enqueue_job, requeue_stale_jobs
+from app.Services.ingestion_service import INGESTION_INTERVAL_MINUTES, run_next_job
+from app.Services.archive_service import ARCHIVE_INTERVAL_MINUTES
+from app.Services.notification_service import NOTIFY_INTERVAL_MINUTES
+from app.Services.recommendation_service import RECOMMENDATION_INTERVAL_MINUTES
+from app.Services.lifespan import SCHEDULER_LEASE_NAME, SCHEDULER_LEASE_SECONDS
+
+POLL_INTERVAL_SECONDS = float(os.getenv("INGESTION_POLL_SECONDS", "5"))
+# Running jobs without a heartbeat for this long are assumed orphaned by a crashed worker
+STALE_JOB_AFTER = timedelta(minutes=5)
+# Jobs the worker enqueues for itself, and how often
+PERIODIC_JOBS = {
+    "fetch_ticketmaster": timedelta(minutes=INGESTION_INTERVAL_MINUTES),
+    "archive_events": timedelta(minutes=ARCHIVE_INTERVAL_MINUTES),
+    "notify_favorites": timedelta(minutes=NOTIFY_INTERVAL_MINUTES),
+    "build_recommendations": timedelta(minutes=RECOMMENDATION_INTERVAL_MINUTES),
+}
+
+
+def drain_queue(worker_id: str) -> int:
+    """Run queued jobs until none are left, returning how many ran"""
+    ran = 0
+    db = SessionLocal()
+    try:
+        while run_next_job(db, worker_id) is not None:
+            ran += 1
+    finally:
+        db.close()
+    return ran
+
+
+def enqueue_due_jobs(db: Session, lease: Lease, next_enqueue: Dict[str, datetime]) -> List[str]:
+    """
+    Enqueue the periodic jobs that are due, but only while this worker holds
+    the scheduler lease, so the schedule runs once however many workers (or
+    inline web processes) are deployed. Returns the kinds enqueued.
+    """
+    if not lease.renew():
+        return []
+    enqueued = []
+    for kind, interval in PERIODIC_JOBS.items():
+        if datetime.utcnow() >= next_enqueue[kind]:
+            # Deduped against queued and running jobs, so cycles never stack or overlap
+            enqueue_job(db, kind)
+            next_enqueue[kind] = datetime.utcnow() + interval
+            enqueued.append(kind)
+    return enqueued
+
+
+def run_worker(worker_id: str, poll_interval: float = POLL_INTERVAL_SECONDS, schedule: bool = True) -> None:
+    next_enqueue = {kind: datetime.utcnow() for kind in PERIODIC_JOBS}
+    lease = Lease(SCHEDULER_LEASE_NAME, SCHEDULER_LEASE_SECONDS)
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                requeue_stale_jobs(db, STALE_JOB_AFTER)
+                if schedule:
+                    enqueue_due_jobs(db, lease, next_enqueue)
+            finally:
+                db.close()
+
+            if not drain_queue(worker_id):
+                time.sleep(poll_interval)
+    finally:
+        lease.release()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ticketmaster ingestion worker")
+    parser.add_argument("--once", action="store_true", help="drain the queue once and exit")
+    parser.add_argument("--no-schedule", action="store_true", help="only run jobs enqueued by others")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    create_tables_if_enabled()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    if args.once:
+        print(f"Ran {drain_queue(worker_id)} jobs")
+        return
+    print(f"Ingestion worker {worker_id} started")
+    run_worker(worker_id, args.poll_interval, schedule=not args.no_schedule)
+
+
+if __name__ == "__main__":
+    main()
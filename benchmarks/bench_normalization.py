@@ -0,0 +1,60 @@
+"""
+Compare serial and process-pool normalization of raw Discovery pages.
+
+    python -m benchmarks.bench_normalization [workers]
+
+Normalizes PAGES synthetic pages of 200 events each, the shape a
+full-catalog backfill hands to normalize_pages. The pool path pays for
+pickling raw pages to the workers and records back, so it only wins when
+there are cores to spread the parsing over.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.Services.normalization import normalize_pages
+
+PAGES = 500
+EVENTS_PER_PAGE = 200
+
+
+def raw_event(i):
+    return {
+        "id": f"event{i:07d}",
+        "name": f"Event {i}",
+        "description": "Lorem ipsum " * 20,
+        "url": f"https://www.ticketmaster.com/event/{i}",
+        "dates": {"start": {"dateTime": f"2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}T20:00:00Z"}},
+        "_embedded": {"venues": [{
+            "id": f"venue{i % 5000}",
+            "name": f"Venue {i % 5000}",
+            "city": {"name": f"City {i % 300}"},
+            "country": {"name": "United States Of America"},
+            "location": {"latitude": "40.7505", "longitude": "-73.9934"}
+        }]}
+    }
+
+
+def run(pages, workers):
+    started = time.perf_counter()
+    count = sum(len(records) for records in normalize_pages(pages, workers))
+    return count, time.perf_counter() - started
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    pages = [
+        [raw_event(p * EVENTS_PER_PAGE + i) for i in range(EVENTS_PER_PAGE)]
+        for p in range(PAGES)
+    ]
+
+    count, serial = run(pages, 0)
+    print(f"serial     : {serial:.2f}s for {count} events ({count / serial:,.0f}/s)")
+    count, pooled = run(pages, workers)
+    print(f"{workers:>2} workers : {pooled:.2f}s for {count} events ({count / pooled:,.0f}/s), {serial / pooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Time the co-favorite neighbor build on synthetic favorites.
+
+    python -m benchmarks.bench_recommendations [favorites]
+
+Generates FAVORITES (user, event) pairs with a skewed event popularity
+and runs item_neighbors over them, reporting wall time and peak traced
+memory. Without numpy/scipy installed this measures the pure-Python
+fallback, which is only meant for small catalogs.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.similarity import item_neighbors
+
+USERS_PER_FAVORITE = 0.1
+EVENTS = 50_000
+
+
+def synthetic_favorites(count):
+    rng = random.Random(42)
+    users, events = array("i"), array("i")
+    n_users = int(count * USERS_PER_FAVORITE)
+    for _ in range(count):
+        users.append(rng.randrange(n_users))
+        # Popularity follows a rough power law, like real on-sale traffic
+        events.append(min(int(rng.paretovariate(1.2)) - 1, EVENTS - 1))
+    return users, events, n_users
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users, events, n_users = synthetic_favorites(count)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    neighbors = sum(len(row) for _, row in item_neighbors(users, events, n_users, EVENTS))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{count:,} favorites -> {neighbors:,} neighbors in {elapsed:.2f}s, peak {peak / 2 ** 20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the listing response paths at per_page=100.
+
+    python -m benchmarks.bench_serialization
+
+"orm" is the previous path: ORM Event objects validated into
+PaginatedEventsResponse, validated again against the response model and
+run through jsonable_encoder. "rows" is the current path: column tuples
+wrapped without validation and encoded by FastJSONResponse.
+"""
+import os
+import timeit
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.responses import FastJSONResponse
+from app.Models.event import Event, PaginatedEventsResponse
+from app.Models.venue import Venue
+import app.Models.user
+import app.Models.favorite
+from app.Services.event_service import get_events_service
+
+PER_PAGE = 100
+ROUNDS = 200
+
+
+def seed(db, count=1000):
+    db.add_all([
+        Venue(id=f"venue{i}", name=f"Venue {i}", city=f"City {i % 50}", country="United States Of America",
+              latitude=40.0 + i / 1000, longitude=-74.0 - i / 1000)
+        for i in range(count // 10)
+    ])
+    start = datetime(2030, 1, 1)
+    db.add_all([
+        Event(id=f"event{i:06d}", name=f"Event {i}", description="Lorem ipsum " * 40,
+              start_date=start + timedelta(hours=i), venue_id=f"venue{i % (count // 10)}",
+              url=f"https://www.ticketmaster.com/event/{i}")
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def orm_path(db):
+    events = (
+        db.query(Event).options(joinedload(Event.venue))
+        .order_by(Event.start_date.asc()).offset(0).limit(PER_PAGE).all()
+    )
+    total = db.query(Event).count()
+    response = PaginatedEventsResponse(
+        events=events, total=total, page=1, per_page=PER_PAGE,
+        total_pages=(total + PER_PAGE - 1) // PER_PAGE, has_next=True, has_prev=False
+    )
+    # FastAPI validates the returned value against response_model before encoding it
+    validated = PaginatedEventsResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def rows_path(db):
+    response = get_events_service(db, page=1, per_page=PER_PAGE)
+    return FastJSONResponse(response).body
+
+
+def main():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+
+    for name, path in (("orm", orm_path), ("rows", rows_path)):
+        path(db)
+        seconds = min(timeit.repeat(lambda: path(db), number=ROUNDS, repeat=3)) / ROUNDS
+        db.expunge_all()
+        print(f"{name:>5}: {seconds * 1000:.3f} ms per page of {PER_PAGE}")
+
+
+if __name__ == "__main__":
+    main()
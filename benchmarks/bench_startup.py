@@ -0,0 +1,55 @@
+"""
+Measure cold start: time to import app.main and time to the first response.
+
+    python -m benchmarks.bench_startup [runs]
+
+Each run is a fresh interpreter so nothing is cached in sys.modules. The
+first request goes through the app lifespan (CREATE_TABLES=1 on a fresh
+SQLite file) and GET /events/. Also reports which optional subsystems
+were imported by the time the first response was sent.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 10
+OPTIONAL_MODULES = ("authlib", "apscheduler", "jose", "ijson", "app.Services.ingestion_service")
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+loaded = [name for name in {OPTIONAL_MODULES!r} if name in sys.modules]
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    assert client.get("/events/").status_code == 200
+    first_response = time.perf_counter()
+print(json.dumps({{"import": imported - started, "first_response": first_response - started, "loaded": loaded}}))
+"""
+
+
+def run_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        env = dict(os.environ, DATABASE_URL=database_url, CREATE_TABLES="1", PYTHONWARNINGS="ignore")
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    results = [run_once() for _ in range(runs)]
+    for key in ("import", "first_response"):
+        samples = [result[key] * 1000 for result in results]
+        print(f"{key:>14}: median {statistics.median(samples):.0f} ms, min {min(samples):.0f} ms over {runs} runs")
+    print(f"optional modules loaded: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
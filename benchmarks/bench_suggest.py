@@ -0,0 +1,64 @@
+"""
+Measure typeahead latency against the in-memory suggest index.
+
+    python -m benchmarks.bench_suggest [events]
+
+Builds the index from synthetic events (100k by default), then times
+suggest() for every prefix of a few typical queries, one keystroke at a
+time, plus an incremental extend with one ingestion batch.
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.suggest import SuggestIndex, SuggestRow
+
+WORDS = ["taylor", "swift", "tame", "impala", "the", "live", "tour", "world", "orchestra", "festival",
+         "jazz", "night", "hamilton", "lakers", "celtics", "comedy", "opera", "symphony", "rock", "hip"]
+QUERIES = ["taylor swift", "the world tour", "lakers", "new york", "madison square garden", "jazz festival"]
+BATCH_SIZE = 200
+
+
+def synthetic_rows(count, offset=0):
+    rng = random.Random(offset)
+    for i in range(offset, offset + count):
+        yield SuggestRow(
+            id=f"event{i:07d}",
+            name=" ".join(rng.choice(WORDS) for _ in range(3)) + f" {i}",
+            venue_id=f"venue{i % 5000}",
+            venue_name=f"Madison Square Garden {i % 5000}" if i % 7 == 0 else f"Venue Hall {i % 5000}",
+            city="New York" if i % 5 == 0 else f"City {i % 300}",
+            favorite_count=rng.randint(0, 500),
+            created_at=datetime(2030, 1, 1)
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    index = SuggestIndex()
+
+    started = time.perf_counter()
+    index.rebuild(synthetic_rows(count))
+    print(f"rebuild    : {time.perf_counter() - started:.2f}s for {count} events")
+
+    started = time.perf_counter()
+    index.extend(synthetic_rows(BATCH_SIZE, offset=count))
+    print(f"extend     : {time.perf_counter() - started:.2f}s for a {BATCH_SIZE}-event batch")
+
+    timings = []
+    for query in QUERIES:
+        for end in range(1, len(query) + 1):
+            started = time.perf_counter()
+            index.suggest(query[:end], 10)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"suggest    : {len(timings)} keystrokes, p50 {timings[len(timings) // 2] * 1000:.3f}ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f}ms, max {timings[-1] * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Load-testing kit: local stand-ins for Ticketmaster Discovery and Google's
+OpenID provider, and a runner that drives mixed user traffic against the app.
+
+    python -m loadtest.runner --users 50 --duration 60
+"""
@@ -0,0 +1,136 @@
+"""
+A local fake of the Ticketmaster Discovery API.
+
+    python -m loadtest.fake_discovery --port 8101 --latency-ms 150 --error-rate 0.02
+
+Serves /discovery/v2/events.json with deterministic pages: the same keyword,
+page and size always return the same events, so runs are comparable. Each
+response is delayed by the configured latency (plus up to `jitter` of it),
+and a share of requests fails with 503 or 429 so the client's retries,
+backoff and circuit breaker run under load too. Point the app at it with
+TICKETMASTER_BASE_URL=http://127.0.0.1:8101/discovery/v2.
+"""
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+EVENTS_PER_KEYWORD = 600
+# Discovery refuses to page past the first 1000 results
+MAX_DEPTH = 1000
+VENUES = 500
+CITIES = [
+    ("New York", "United States Of America", 40.71, -74.00), ("Los Angeles", "United States Of America", 34.05, -118.24),
+    ("Chicago", "United States Of America", 41.88, -87.63), ("Toronto", "Canada", 43.65, -79.38),
+    ("London", "Great Britain", 51.51, -0.13), ("Berlin", "Germany", 52.52, 13.40),
+    ("Paris", "France", 48.86, 2.35), ("Sydney", "Australia", -33.87, 151.21),
+]
+WORDS = ["live", "tour", "night", "festival", "orchestra", "world", "symphony", "comedy", "classic", "summer",
+         "acoustic", "grand", "final", "championship", "opening", "the", "show", "legends", "jazz", "rock"]
+EPOCH = datetime(2030, 1, 1)
+
+
+def fake_venue(number: int) -> dict:
+    city, country, latitude, longitude = CITIES[number % len(CITIES)]
+    return {
+        "id": f"fake-venue-{number}",
+        "name": f"{city} Arena {number}",
+        "city": {"name": city},
+        "country": {"name": country},
+        "location": {"latitude": f"{latitude + number % 100 / 1000:.4f}", "longitude": f"{longitude - number % 100 / 1000:.4f}"},
+    }
+
+
+def fake_event(keyword: str, index: int) -> dict:
+    """Event `index` of a keyword's result set; a pure function of its arguments"""
+    rng = random.Random(zlib.crc32(f"{keyword}:{index}".encode()))
+    start = EPOCH + timedelta(hours=rng.randrange(24 * 365))
+    return {
+        "id": f"fake-{keyword}-{index}",
+        "name": " ".join([keyword.title()] + rng.sample(WORDS, 3)),
+        "description": " ".join(rng.choices(WORDS, k=30)),
+        "url": f"https://www.ticketmaster.com/event/fake-{keyword}-{index}",
+        "dates": {"start": {"dateTime": start.strftime("%Y-%m-%dT%H:%M:%SZ"), "localDate": start.strftime("%Y-%m-%d")}},
+        "_embedded": {"venues": [fake_venue(rng.randrange(VENUES))]},
+    }
+
+
+def create_app(
+    latency_ms: float = 0,
+    jitter: float = 0.5,
+    error_rate: float = 0,
+    events_per_keyword: int = EVENTS_PER_KEYWORD,
+    seed: int = 0
+) -> Starlette:
+    failures = random.Random(seed)
+    stats = {"requests": 0, "errors": 0}
+
+    async def events(request: Request):
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms * (1 + failures.uniform(0, jitter)) / 1000)
+        if error_rate and failures.random() < error_rate:
+            stats["errors"] += 1
+            if failures.random() < 0.5:
+                return JSONResponse({"fault": {"faultstring": "Rate limit quota violation"}}, status_code=429, headers={"Retry-After": "1"})
+            return JSONResponse({"fault": {"faultstring": "Service unavailable"}}, status_code=503)
+
+        keyword = request.query_params.get("keyword", "")
+        page = int(request.query_params.get("page", 0))
+        size = min(int(request.query_params.get("size", 20)), 200)
+        if (page + 1) * size > MAX_DEPTH:
+            return JSONResponse({"errors": [{"code": "DIS1035", "detail": "API Limits Exceeded"}]}, status_code=400)
+
+        first = page * size
+        indexes = range(first, min(first + size, events_per_keyword))
+        body = {
+            "page": {
+                "size": size,
+                "totalElements": events_per_keyword,
+                "totalPages": -(-events_per_keyword // size),
+                "number": page,
+            }
+        }
+        if indexes:
+            body["_embedded"] = {"events": [fake_event(keyword, index) for index in indexes]}
+        # A generous quota that resets every minute, reported like the real API does
+        headers = {
+            "Rate-Limit-Available": "5000",
+            "Rate-Limit-Reset": str(int((time.time() // 60 + 1) * 60 * 1000)),
+        }
+        return JSONResponse(body, headers=headers)
+
+    async def health(request: Request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/discovery/v2/events.json", events),
+        Route("/health", health),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0.5, help="extra latency, as a fraction of --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--events-per-keyword", type=int, default=EVENTS_PER_KEYWORD)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter, args.error_rate, args.events_per_keyword),
+        host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
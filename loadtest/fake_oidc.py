@@ -0,0 +1,147 @@
+"""
+A local fake of Google's OpenID Connect provider.
+
+    python -m loadtest.fake_oidc --port 8102
+
+Publishes a discovery document and JWKS, and signs real RS256 ID tokens, so
+the app's authlib client runs its whole login path against it: discovery,
+the authorization redirect, the code exchange and ID token verification.
+/authorize signs in without a consent page, as `login_hint` when given and
+otherwise as the next of --users synthetic accounts in turn, so repeated
+logins exercise the existing-user path. Point the app at it with
+GOOGLE_OIDC_METADATA_URL=http://127.0.0.1:8102/.well-known/openid-configuration.
+"""
+import argparse
+import asyncio
+import itertools
+import secrets
+import time
+from typing import Dict
+from urllib.parse import urlencode
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse
+from starlette.routing import Route
+
+USERS = 1000
+TOKEN_TTL_SECONDS = 3600
+# Codes not exchanged within this long are dropped
+CODE_TTL_SECONDS = 60
+
+
+def user_email(number: int) -> str:
+    return f"user{number}@loadtest.example"
+
+
+def create_app(issuer: str, users: int = USERS, latency_ms: float = 0) -> Starlette:
+    from joserfc import jwt
+    from joserfc.jwk import RSAKey
+
+    issuer = issuer.rstrip("/")
+    key = RSAKey.generate_key(2048, parameters={"kid": secrets.token_hex(8), "use": "sig", "alg": "RS256"})
+    next_user = itertools.cycle(range(users))
+    codes: Dict[str, dict] = {}
+    access_tokens: Dict[str, dict] = {}
+
+    async def delay():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    async def metadata(request: Request):
+        return JSONResponse({
+            "issuer": issuer,
+            "authorization_endpoint": f"{issuer}/authorize",
+            "token_endpoint": f"{issuer}/token",
+            "userinfo_endpoint": f"{issuer}/userinfo",
+            "jwks_uri": f"{issuer}/jwks",
+            "response_types_supported": ["code"],
+            "subject_types_supported": ["public"],
+            "id_token_signing_alg_values_supported": ["RS256"],
+            "scopes_supported": ["openid", "email", "profile"],
+        })
+
+    async def jwks(request: Request):
+        return JSONResponse({"keys": [key.as_dict(private=False)]})
+
+    async def authorize(request: Request):
+        await delay()
+        params = request.query_params
+        email = params.get("login_hint") or user_email(next(next_user))
+        code = secrets.token_urlsafe(24)
+        now = time.time()
+        for stale in [stale for stale, grant in codes.items() if grant["expires_at"] < now]:
+            del codes[stale]
+        codes[code] = {
+            "email": email,
+            "client_id": params.get("client_id"),
+            "nonce": params.get("nonce"),
+            "expires_at": now + CODE_TTL_SECONDS,
+        }
+        query = {"code": code}
+        if params.get("state"):
+            query["state"] = params["state"]
+        return RedirectResponse(f"{params['redirect_uri']}?{urlencode(query)}", status_code=302)
+
+    async def token(request: Request):
+        await delay()
+        form = await request.form()
+        grant = codes.pop(form.get("code"), None)
+        if grant is None or grant["expires_at"] < time.time():
+            return JSONResponse({"error": "invalid_grant"}, status_code=400)
+
+        now = int(time.time())
+        email = grant["email"]
+        claims = {
+            "iss": issuer,
+            "sub": email,
+            "aud": grant["client_id"],
+            "iat": now,
+            "exp": now + TOKEN_TTL_SECONDS,
+            "email": email,
+            "email_verified": True,
+            "name": email.split("@")[0].title(),
+        }
+        if grant["nonce"]:
+            claims["nonce"] = grant["nonce"]
+        access_token = secrets.token_urlsafe(24)
+        access_tokens[access_token] = claims
+        return JSONResponse({
+            "access_token": access_token,
+            "token_type": "Bearer",
+            "expires_in": TOKEN_TTL_SECONDS,
+            "scope": "openid email profile",
+            "id_token": jwt.encode({"alg": "RS256", "kid": key.kid}, claims, key),
+        })
+
+    async def userinfo(request: Request):
+        claims = access_tokens.get(request.headers.get("Authorization", "").removeprefix("Bearer "))
+        if claims is None:
+            return JSONResponse({"error": "invalid_token"}, status_code=401)
+        return JSONResponse({name: claims[name] for name in ("sub", "email", "email_verified", "name")})
+
+    return Starlette(routes=[
+        Route("/.well-known/openid-configuration", metadata),
+        Route("/jwks", jwks),
+        Route("/authorize", authorize),
+        Route("/token", token, methods=["POST"]),
+        Route("/userinfo", userinfo),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8102)
+    parser.add_argument("--users", type=int, default=USERS)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(f"http://{args.host}:{args.port}", args.users, args.latency_ms),
+        host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
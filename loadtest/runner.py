@@ -0,0 +1,301 @@
+"""
+Drive mixed user traffic against the app and report throughput and tail
+latency per scenario.
+
+    python -m loadtest.runner [--users 50] [--duration 60] [--mix browse=40,search=25,login=5,save=15,favorites=15]
+                              [--discovery-latency-ms 100] [--discovery-error-rate 0.01] [--database-url URL]
+
+By default everything runs in this process. The fake Discovery API and the
+fake OpenID provider are served on local ports, the app is pointed at them
+and seeded by one ingestion cycle against the fake, and virtual users call
+the ASGI app directly. Each user logs in once, then loops over scenarios
+picked by the --mix weights until --duration runs out. The runner shares
+the CPU with the app, so in-process numbers are a floor; for capacity
+figures run the app under uvicorn (INGESTION_MODE=inline, the env printed
+by --print-env) and pass its URL as --target. A SQLite file is used unless
+--database-url is given; its single writer makes save-heavy mixes lock
+long before PostgreSQL would.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from loadtest import fake_discovery, fake_oidc
+
+DEFAULT_MIX = "browse=40,search=25,login=5,save=15,favorites=15"
+SEARCH_WORDS = ["live", "tour", "festival", "orchestra", "comedy", "jazz", "rock", "summer", "music", "sports"]
+APP_BASE_URL = "http://app"
+
+
+class ScenarioStats:
+    """Latencies of one scenario's runs, in seconds"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def record(self, elapsed: float, ok: bool) -> None:
+        self.latencies.append(elapsed)
+        if not ok:
+            self.errors += 1
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class VirtualUser:
+    """One simulated visitor: a cookie-keeping app client plus a client for the identity provider"""
+
+    def __init__(self, app_client: httpx.AsyncClient, outside: httpx.AsyncClient, event_ids: List[str], rng: random.Random):
+        self.app = app_client
+        self.outside = outside
+        self.event_ids = event_ids
+        self.rng = rng
+        self.token: Optional[str] = None
+
+    @property
+    def auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def browse(self) -> bool:
+        response = await self.app.get("/events/", params={"page": self.rng.randint(1, 20), "per_page": 20})
+        if response.status_code != 200:
+            return False
+        events = response.json()["events"]
+        if events:
+            response = await self.app.get(f"/events/{self.rng.choice(events)['id']}")
+        return response.status_code == 200
+
+    async def search(self) -> bool:
+        word = self.rng.choice(SEARCH_WORDS)
+        # A few keystrokes of typeahead, then the full search
+        for length in range(2, min(len(word), 4) + 1):
+            response = await self.app.get("/events/suggest", params={"q": word[:length]})
+            if response.status_code != 200:
+                return False
+        response = await self.app.get("/events/", params={"search": word, "per_page": 20})
+        return response.status_code == 200
+
+    async def login(self) -> bool:
+        """The full authorization-code flow: app redirect, provider sign-in, app callback"""
+        response = await self.app.get("/auth/login/google")
+        if response.status_code not in (302, 307):
+            return False
+        response = await self.outside.get(response.headers["location"])
+        if response.status_code != 302:
+            return False
+        callback = httpx.URL(response.headers["location"])
+        response = await self.app.get(callback.raw_path.decode())
+        if response.status_code != 200:
+            return False
+        self.token = response.json()["access_token"]
+        return True
+
+    async def save(self) -> bool:
+        event_id = self.rng.choice(self.event_ids)
+        response = await self.app.post(f"/events/{event_id}/save", headers=self.auth)
+        if response.status_code == 400:
+            # Already saved: unsave instead, so the favorites table stays about the same size
+            response = await self.app.delete(f"/events/{event_id}/save", headers=self.auth)
+        return response.status_code in (200, 204)
+
+    async def favorites(self) -> bool:
+        response = await self.app.get("/events/favorites", headers=self.auth)
+        return response.status_code == 200
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[bool]]] = {
+    "browse": VirtualUser.browse,
+    "search": VirtualUser.search,
+    "login": VirtualUser.login,
+    "save": VirtualUser.save,
+    "favorites": VirtualUser.favorites,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name.strip()}', expected one of {', '.join(SCENARIOS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BackgroundServer:
+    """Serves an ASGI app with uvicorn on a daemon thread for the life of a with block"""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Fake server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def configure_environment(discovery_url: str, oidc_url: str, database_url: Optional[str]) -> Dict[str, str]:
+    """Environment that points the app at the fakes; must be set before the app is imported"""
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'loadtest.db')}"
+    env = {
+        "DATABASE_URL": database_url,
+        "CREATE_TABLES": "1",
+        "TICKETMASTER_BASE_URL": f"{discovery_url}/discovery/v2",
+        "TICKETMASTER_KEY": "loadtest",
+        "TICKETMASTER_PAGES_PER_KEYWORD": os.getenv("TICKETMASTER_PAGES_PER_KEYWORD", "3"),
+        "GOOGLE_OIDC_METADATA_URL": f"{oidc_url}/.well-known/openid-configuration",
+        "GOOGLE_CLIENT_ID": "loadtest-client",
+        "GOOGLE_CLIENT_SECRET": "loadtest-secret",
+    }
+    os.environ.update(env)
+    return env
+
+
+async def sample_event_ids(client: httpx.AsyncClient, pages: int = 5) -> List[str]:
+    event_ids = []
+    for page in range(1, pages + 1):
+        response = await client.get("/events/", params={"page": page, "per_page": 100})
+        response.raise_for_status()
+        event_ids += [event["id"] for event in response.json()["events"]]
+    if not event_ids:
+        raise SystemExit("The app has no events to browse; check that ingestion reached the fake Discovery API")
+    return event_ids
+
+
+async def run_load(app_client_factory, users: int, duration: float, weights: Dict[str, float], think_ms: float, seed: int):
+    stats = {name: ScenarioStats() for name in weights}
+    names, cumulative = list(weights), list(weights.values())
+    async with app_client_factory() as probe:
+        event_ids = await sample_event_ids(probe)
+
+    async def visitor(number: int):
+        rng = random.Random(seed + number)
+        async with app_client_factory() as app_client, httpx.AsyncClient(timeout=30) as outside:
+            user = VirtualUser(app_client, outside, event_ids, rng)
+            # Logged in up front so save and favorites have a token; not counted in the stats
+            if not await user.login():
+                raise SystemExit("Login failed; is the app pointed at the fake OpenID provider?")
+            deadline = started + duration
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, cumulative)[0]
+                began = time.perf_counter()
+                try:
+                    ok = await SCENARIOS[name](user)
+                except httpx.HTTPError:
+                    ok = False
+                stats[name].record(time.perf_counter() - began, ok)
+                if think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(visitor(number) for number in range(users)))
+    return stats, time.perf_counter() - started
+
+
+def report(stats: Dict[str, ScenarioStats], elapsed: float, users: int) -> str:
+    def row(label: str, scenario: ScenarioStats) -> str:
+        return (
+            f"{label:<10} {len(scenario.latencies):>7} {scenario.errors:>7} {len(scenario.latencies) / elapsed:>8.1f} "
+            + " ".join(f"{scenario.percentile(fraction) * 1000:>8.1f}" for fraction in (0.50, 0.95, 0.99, 1.0))
+        )
+
+    total = ScenarioStats()
+    lines = [
+        f"{users} users for {elapsed:.1f}s",
+        f"{'scenario':<10} {'runs':>7} {'errors':>7} {'runs/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for name, scenario in stats.items():
+        total.latencies += scenario.latencies
+        total.errors += scenario.errors
+        lines.append(row(name, scenario))
+    lines.append(row("total", total))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test with fake Ticketmaster and Google")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic after login and seeding")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight pairs")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's scenarios")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", help="URL of an app already running against the fakes; skips the in-process app")
+    parser.add_argument("--database-url", help="database for the in-process app (default: a temporary SQLite file)")
+    parser.add_argument("--discovery-latency-ms", type=float, default=0)
+    parser.add_argument("--discovery-error-rate", type=float, default=0)
+    parser.add_argument("--oidc-latency-ms", type=float, default=0)
+    parser.add_argument("--print-env", action="store_true", help="serve the fakes and print the env to run the app with")
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    if args.target:
+        # The app under test is already pointed at fakes (see --print-env) and seeds itself
+        def remote_client():
+            return httpx.AsyncClient(base_url=args.target, timeout=30)
+
+        stats, elapsed = asyncio.run(run_load(remote_client, args.users, args.duration, weights, args.think_ms, args.seed))
+        print(report(stats, elapsed, args.users))
+        return
+
+    discovery_port, oidc_port = free_port(), free_port()
+    discovery_url, oidc_url = f"http://127.0.0.1:{discovery_port}", f"http://127.0.0.1:{oidc_port}"
+    discovery = fake_discovery.create_app(args.discovery_latency_ms, error_rate=args.discovery_error_rate, seed=args.seed)
+    oidc = fake_oidc.create_app(oidc_url, latency_ms=args.oidc_latency_ms)
+
+    with BackgroundServer(discovery, discovery_port), BackgroundServer(oidc, oidc_port):
+        env = configure_environment(discovery_url, oidc_url, args.database_url)
+        if args.print_env:
+            for name, value in env.items():
+                print(f"export {name}={value}")
+            print("Fakes are up; press Ctrl+C to stop")
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                return
+
+        from app.main import app
+        from app.Services.ingestion_service import fetch_ticketmaster_data
+
+        def local_client():
+            return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=APP_BASE_URL, timeout=30)
+
+        async def in_process():
+            async with app.router.lifespan_context(app):
+                seeding = time.perf_counter()
+                await asyncio.to_thread(fetch_ticketmaster_data)
+                print(f"Seeded from the fake Discovery API in {time.perf_counter() - seeding:.1f}s")
+                return await run_load(local_client, args.users, args.duration, weights, args.think_ms, args.seed)
+
+        stats, elapsed = asyncio.run(in_process())
+
+    print(report(stats, elapsed, args.users))
+
+if __name__ == "__main__":
+    main()
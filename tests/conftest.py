@@ -0,0 +1,28 @@
+import os
+
+# The app builds its engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+import app.Models.user
+import app.Models.favorite
+import app.Models.event
+import app.Models.ingestion
+import app.Models.notification
+import app.Models.recommendation
+
+@pytest.fixture
+def sqlite_db():
+    """A real session on a throwaway in-memory SQLite database"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
@@ -1,8 +1,12 @@
+import os
+import subprocess
+import sys
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from app.Models.event import PaginatedEventsResponse
 from app.main import app
+from app.Services.job_service import JOB_KINDS
 
 client = TestClient(app)
 
@@ -127,4 +131,246 @@ def test_get_favorite_events(mock_get_favorites_service):
         }]
     finally:
         # Clean up dependency overrides
-        app.dependency_overrides.clear()
\ No newline at end of file
+        app.dependency_overrides.clear()
+
+@patch("app.Router.event_router.get_trending_service")
+def test_get_trending_events(mock_get_trending_service):
+    mock_get_trending_service.return_value = [{"id": "1", "name": "Event 1", "favorite_count": 3}]
+
+    response = client.get("/events/trending?limit=5")
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == "1"
+    assert response.json()[0]["favorite_count"] == 3
+    mock_get_trending_service.assert_called_once()
+    assert mock_get_trending_service.call_args.args[1] == 5
+
+
+def test_get_events_requires_lat_and_lng_together():
+    response = client.get("/events/?lat=40.7")
+    assert response.status_code == 400
+
+
+@patch("app.Router.event_router.get_events_service")
+def test_get_events_rejects_unknown_sort_fields(mock_get_events_service):
+    mock_get_events_service.return_value = PaginatedEventsResponse(
+        events=[], total=0, page=1, per_page=10, total_pages=0, has_next=False, has_prev=False
+    )
+
+    assert client.get("/events/?sort_by=latitude").status_code == 200
+    assert client.get("/events/?sort_by=venue").status_code == 400
+    assert client.get("/events/?sort_by=nonsense").status_code == 400
+    assert client.get("/events/?include_past=true&sort_by=trending_score").status_code == 400
+
+
+@patch("app.Router.event_router.get_events_service")
+def test_get_events_fields_expand_the_list_preset(mock_get_events_service):
+    mock_get_events_service.return_value = PaginatedEventsResponse(
+        events=[], total=0, page=1, per_page=10, total_pages=0, has_next=False, has_prev=False
+    )
+
+    assert client.get("/events/?fields=list").status_code == 200
+    assert "description" not in mock_get_events_service.call_args.kwargs["fields"]
+    assert "venue_name" in mock_get_events_service.call_args.kwargs["fields"]
+    assert client.get("/events/?fields=name,secret").status_code == 400
+
+
+@patch("app.Router.venue_router.get_venues_service")
+def test_get_venues(mock_get_venues_service):
+    mock_get_venues_service.return_value = {
+        "venues": [{"id": "v1", "name": "O2 Arena", "city": "London"}],
+        "total": 1,
+        "page": 1,
+        "per_page": 10,
+        "total_pages": 1,
+        "has_next": False,
+        "has_prev": False
+    }
+
+    response = client.get("/venues/?city=london")
+    assert response.status_code == 200
+    assert response.json()["venues"][0]["id"] == "v1"
+    assert mock_get_venues_service.call_args.kwargs["city"] == "london"
+
+
+@patch("app.Router.event_router.export_events_service")
+def test_export_events(mock_export_events_service):
+    mock_export_events_service.return_value = iter(['{"id": "1"}\n', '{"id": "2"}\n'])
+
+    response = client.get("/events/export?format=ndjson&city=london")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.splitlines() == ['{"id": "1"}', '{"id": "2"}']
+    filters, export_format = mock_export_events_service.call_args.args
+    assert filters.city == "london"
+    assert export_format == "ndjson"
+
+
+def test_fast_json_response_matches_validated_output(sqlite_db):
+    from datetime import datetime
+    from app.Models.event import Event, EventSchema
+    from app.Models.venue import Venue
+    from app.Repository.event_repository import get_events, apply_pagination
+    from app.core.responses import FastJSONResponse
+
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London"),
+        Event(id="e1", name="Concert", venue_id="v1", start_date=datetime(2030, 5, 1, 20, 0)),
+    ])
+    sqlite_db.commit()
+
+    rows = apply_pagination(get_events(sqlite_db), 1, 10)
+    fast = PaginatedEventsResponse.model_construct(
+        events=rows, total=1, page=1, per_page=10, total_pages=1, has_next=False, has_prev=False
+    )
+    validated = PaginatedEventsResponse(
+        events=[EventSchema.from_orm(row) for row in rows],
+        total=1, page=1, per_page=10, total_pages=1, has_next=False, has_prev=False
+    )
+    assert FastJSONResponse(fast).body == FastJSONResponse(validated).body
+    assert PaginatedEventsResponse.model_validate_json(FastJSONResponse(fast).body) == validated
+
+
+@patch("app.Router.event_router.get_event_service")
+def test_get_event_detail(mock_get_event_service):
+    mock_get_event_service.return_value = {"id": "abc", "name": "Event abc"}
+
+    response = client.get("/events/abc")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Event abc"
+    assert mock_get_event_service.call_args.args[1] == "abc"
+
+@patch("app.Router.event_router.get_events_batch_service")
+def test_get_events_batch(mock_get_events_batch_service):
+    mock_get_events_batch_service.return_value = [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}]
+
+    response = client.get("/events/batch?ids=a&ids=b")
+    assert response.status_code == 200
+    assert [event["id"] for event in response.json()] == ["a", "b"]
+    assert mock_get_events_batch_service.call_args.args[1] == ["a", "b"]
+
+
+@patch("app.Router.event_router.get_suggestions_service")
+def test_suggest_events(mock_get_suggestions_service):
+    mock_get_suggestions_service.return_value = {
+        "query": "tay", "suggestions": [{"kind": "event", "text": "Taylor Swift", "id": "e1", "score": 41}]
+    }
+
+    response = client.get("/events/suggest?q=tay&kinds=event,venue")
+    assert response.status_code == 200
+    assert response.json()["suggestions"][0]["text"] == "Taylor Swift"
+    assert mock_get_suggestions_service.call_args.args == ("tay", 10, ["event", "venue"])
+    assert client.get("/events/suggest?q=tay&kinds=artist").status_code == 400
+
+
+@patch("app.Router.admin_router.enqueue_job_service")
+def test_admin_enqueue_requires_token(mock_enqueue_job_service):
+    with patch("app.core.auth.ADMIN_TOKEN", "s3cret"):
+        assert client.post("/admin/ingestion/jobs", json={"kind": "fetch_ticketmaster"}).status_code == 403
+        assert client.post(
+            "/admin/ingestion/jobs",
+            json={"kind": "fetch_ticketmaster"},
+            headers={"X-Admin-Token": "wrong"}
+        ).status_code == 403
+
+        mock_enqueue_job_service.return_value = {
+            "id": 1, "kind": "fetch_ticketmaster", "status": "queued",
+            "attempts": 0, "run_after": "2026-01-01T00:00:00"
+        }
+        response = client.post(
+            "/admin/ingestion/jobs",
+            json={"kind": "fetch_ticketmaster"},
+            headers={"X-Admin-Token": "s3cret"}
+        )
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    mock_enqueue_job_service.assert_called_once()
+
+
+def test_importing_the_app_defers_optional_subsystems():
+    probe = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('authlib', 'apscheduler', 'app.Services.ingestion_service', 'scipy') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        env=dict(os.environ, DATABASE_URL="sqlite://"),
+        capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_enqueueable_job_kinds_have_worker_handlers():
+    from app.Services.ingestion_service import JOB_HANDLERS
+    assert set(JOB_KINDS) == set(JOB_HANDLERS)
+
+
+def test_google_callback_provisions_the_user_off_the_event_loop():
+    import threading
+    import httpx
+    from datetime import datetime
+    from unittest.mock import AsyncMock
+    from app.core.database import get_db
+    from app.Models.user import UserSchema
+
+    oauth = MagicMock()
+    oauth.google.authorize_access_token = AsyncMock(return_value={"access_token": "google-token"})
+    shared_client = MagicMock()
+    shared_client.get = AsyncMock(return_value=httpx.Response(200, json={"email": "fan@example.com", "name": "Fan"}))
+    threads = []
+
+    def provision(user_info):
+        threads.append(threading.current_thread())
+        return UserSchema(id=7, email=user_info["email"], name=user_info["name"], created_at=datetime(2024, 1, 1))
+
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    try:
+        with patch("app.Router.auth_router.get_oauth", return_value=oauth), \
+                patch("app.Router.auth_router.get_http_client", return_value=shared_client), \
+                patch("app.Router.auth_router.UserService.authenticate_or_create_user", side_effect=provision):
+            response = client.get("/auth/google/callback")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["user_info"] == {"id": 7, "email": "fan@example.com", "name": "Fan", "picture": ""}
+    # The userinfo fallback went through the shared client, and the upsert ran in a worker thread
+    shared_client.get.assert_awaited_once()
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+
+
+def test_notification_endpoints_scope_to_the_current_users_id():
+    from datetime import datetime
+    from app.core.auth import get_current_user
+    from app.core.database import get_db
+    from app.Models.notification import NotificationInbox
+    from app.Models.user import UserSchema
+
+    app.dependency_overrides[get_current_user] = lambda: UserSchema(id=5, email="fan@example.com", created_at=datetime(2024, 1, 1))
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    try:
+        with patch("app.Router.notification_router.get_inbox_service", return_value=NotificationInbox(notifications=[], unread=0)) as inbox, \
+                patch("app.Router.notification_router.mark_read_service", return_value=3) as mark_read:
+            assert client.get("/notifications/").status_code == 200
+            assert client.post("/notifications/read").json() == {"marked_read": 3}
+    finally:
+        app.dependency_overrides.clear()
+
+    assert inbox.call_args.args[1] == 5 and mark_read.call_args.args[1] == 5
+
+
+@patch("app.Router.event_router.get_recommendations_service", return_value=[])
+def test_recommendations_are_scoped_to_the_current_users_id(mock_recommendations):
+    from datetime import datetime
+    from app.core.auth import get_current_user
+    from app.core.database import get_db
+    from app.Models.user import UserSchema
+
+    app.dependency_overrides[get_current_user] = lambda: UserSchema(id=5, email="fan@example.com", created_at=datetime(2024, 1, 1))
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    try:
+        response = client.get("/events/recommendations?limit=3")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200 and response.json() == []
+    assert mock_recommendations.call_args.args[1:] == (5, 3)
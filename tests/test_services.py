@@ -1,14 +1,71 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.Models.event import EventSchema
 from fastapi import HTTPException
 from app.Services.event_service import (
     get_events_service,
     save_event_service,
-    get_favorites_service
+    unsave_event_service,
+    get_favorites_service,
+    get_trending_service
+)
+from datetime import date, datetime, timedelta
+from app.core.geo import haversine_km, bounding_box, longitude_ranges
+from app.Models.event import Event, ArchivedEvent, UpcomingEvent
+from app.Models.venue import Venue
+from app.Repository.event_repository import get_events, apply_pagination, get_events_by_ids, save_event_repository
+from app.Repository.event_repository import archive_past_events, apply_sorting, get_total_count, update_changed_events, SORT_FIELDS
+from app.Repository.partition_repository import (
+    add_months,
+    partition_name,
+    partition_month,
+    partition_ddl,
+    ensure_upcoming_partitions,
+    archive_event_partitions
+)
+from app.Models.user import User
+from app.core.cache import LRUCache, event_detail_cache
+from app.core.shared_state import InProcessState, SqliteSharedState, CatalogVersion
+from app.Services.event_service import get_event_service, get_events_batch_service
+from app.Repository.venue_repository import upsert_venues
+from app.Services.normalization import normalize_event
+from app.Services.event_service import export_events_service
+import json
+from app.core.trending import (
+    TrendingIndex,
+    favorite_weight,
+    add_favorite_score,
+    remove_favorite_score,
+    decayed_score
 )
 from app.Models.event import PaginatedEventsResponse, EventFilters
+from app.core.suggest import SuggestIndex, SuggestRow
+from app.Services.event_service import get_suggestions_service
+from app.Services.stream_service import CatalogWatcher, event_key, event_stream_service, publish_records
+from app.Services.normalization import EventRecord
+from app.core.pubsub import Broker
+from app.core.shared_state import catalog_version
+import asyncio
+import threading
+from app.Models.favorite import Favorite
+from app.Models.notification import EventChange, Notification
+from app.Services.ingestion_service import bulk_persist_events, partition_records
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.dialects import postgresql, sqlite
+from app.Services.notification_service import NotificationSink, fan_out_changes, get_inbox_service, mark_read_service
+from app.Services.recommendation_service import build_event_neighbors, get_recommendations_service
+from app.core.similarity import item_neighbors, _python_neighbors
+import random
+import math
+import time
+from app.Services.user_service import UserService
+from app.core.singleflight import SingleFlight
+from app.Services.event_service import get_coalescing_stats_service
+from app.core import oidc
+from app.core.auth import get_oauth
 
 # Fixtures
 @pytest.fixture
@@ -130,12 +187,862 @@ def test_save_event_already_saved(mock_event_exists, mock_favorite_exists, db, u
 def test_get_favorites_success(mock_user_exists, mock_get_favorites, db, user_id):
     mock_user_exists.return_value = True
     mock_get_favorites.return_value = ["fav1", "fav2"]
-    result = get_favorites_service(db, user_id)
+    # Routes pass the UserSchema from get_current_user
+    result = get_favorites_service(db, MagicMock(id=user_id))
     assert result == ["fav1", "fav2"]
+    mock_user_exists.assert_called_once_with(user_id)
 
 @patch("app.Services.event_service.UserRepository.user_exists")
 def test_get_favorites_user_not_found(mock_user_exists, db, user_id):
     mock_user_exists.return_value = False
     with pytest.raises(HTTPException) as exc:
-        get_favorites_service(db, user_id)
-    assert exc.value.status_code == 404
\ No newline at end of file
+        get_favorites_service(db, MagicMock(id=user_id))
+    assert exc.value.status_code == 404
+
+def test_get_favorites_service_reads_the_current_users_favorites(sqlite_db):
+    user = User(email="fan@example.com")
+    sqlite_db.add_all([user, Event(id="e1", name="Concert")])
+    sqlite_db.commit()
+    save_event_repository("e1", sqlite_db, user)
+
+    assert [favorite.event_id for favorite in get_favorites_service(sqlite_db, user)] == ["e1"]
+    with pytest.raises(HTTPException) as exc:
+        get_favorites_service(sqlite_db, MagicMock(id=user.id + 1))
+    assert exc.value.status_code == 404
+
+@patch("app.Services.event_service.unsave_event_repository")
+@patch("app.Services.event_service.favorite_exists")
+def test_unsave_event_success(mock_favorite_exists, mock_unsave_repo, db, user_id):
+    mock_favorite_exists.return_value = True
+    unsave_event_service("123", db, user_id)
+    mock_unsave_repo.assert_called_once_with("123", db, user_id)
+
+@patch("app.Services.event_service.favorite_exists")
+def test_unsave_event_not_saved(mock_favorite_exists, db, user_id):
+    mock_favorite_exists.return_value = False
+    with pytest.raises(HTTPException) as exc:
+        unsave_event_service("123", db, user_id)
+    assert exc.value.status_code == 404
+
+def test_trending_scores_decay_and_roll_back():
+    now = datetime(2026, 1, 10)
+    old = add_favorite_score(None, favorite_weight(now - timedelta(days=3)))
+    old = add_favorite_score(old, favorite_weight(now - timedelta(days=3)))
+    fresh = add_favorite_score(None, favorite_weight(now))
+
+    # One fresh favorite outranks two favorites three half-lives old
+    assert fresh > old
+    assert decayed_score(fresh, now) == pytest.approx(1.0)
+    assert decayed_score(old, now) == pytest.approx(0.25)
+
+    # Removing every favorite clears the score
+    old = remove_favorite_score(old, favorite_weight(now - timedelta(days=3)))
+    assert decayed_score(old, now) == pytest.approx(0.125)
+    assert remove_favorite_score(old, favorite_weight(now - timedelta(days=3))) is None
+
+@patch("app.Services.event_service.get_trending_events")
+@patch("app.Services.event_service.trending_index", new_callable=TrendingIndex)
+def test_get_trending_service_serves_from_index(mock_index, mock_get_trending, db):
+    mock_get_trending.return_value = [
+        EventSchema(id="event1", name="Event 1"),
+        EventSchema(id="event2", name="Event 2"),
+    ]
+    assert [event.id for event in get_trending_service(db, 1)] == ["event1"]
+    assert [event.id for event in get_trending_service(db, 5)] == ["event1", "event2"]
+
+    # The second call is served from the precomputed list
+    mock_get_trending.assert_called_once_with(db, mock_index.size)
+
+
+def test_geo_bounding_box_contains_radius():
+    min_lat, max_lat, min_lng, max_lng = bounding_box(48.8566, 2.3522, 50)
+    assert haversine_km(48.8566, 2.3522, max_lat, 2.3522) == pytest.approx(50, rel=1e-3)
+    assert haversine_km(48.8566, 2.3522, 48.8566, max_lng) >= 50
+    assert min_lat < 48.8566 < max_lat and min_lng < 2.3522 < max_lng
+
+def test_geo_longitude_ranges_split_at_the_antimeridian():
+    assert longitude_ranges(1.5, 3.2) == [(1.5, 3.2)]
+    assert longitude_ranges(179.5, 180.5) == [(179.5, 180.0), (-180.0, -179.5)]
+    assert longitude_ranges(-180.5, -179.5) == [(179.5, 180.0), (-180.0, -179.5)]
+    assert longitude_ranges(-10.0, 350.0) == [(-180.0, 180.0)]
+
+@patch("app.Services.event_service.get_events")
+@patch("app.Services.event_service.get_total_count")
+@patch("app.Services.event_service.apply_sorting")
+@patch("app.Services.event_service.apply_pagination")
+def test_get_events_service_nearby_sets_distance(mock_pagination, mock_sorting, mock_count, mock_get_events, db):
+    filters = EventFilters(latitude=51.5074, longitude=-0.1278, radius_km=10)
+    mock_count.return_value = 1
+    mock_pagination.return_value = [EventSchema(id="event1", name="Event 1", latitude=51.5155, longitude=-0.0922)]
+
+    result = get_events_service(db, filters=filters, sort_by="distance")
+
+    assert mock_sorting.call_args.args[1:] == ("distance", "asc", (51.5074, -0.1278))
+    assert result.events[0].distance_km == pytest.approx(2.6, abs=0.1)
+
+
+def test_normalize_event_from_discovery_event():
+    record = normalize_event({
+        "id": "G5vYZ9",
+        "name": "Concert",
+        "dates": {"start": {"dateTime": "2030-05-01T20:00:00Z"}},
+        "_embedded": {"venues": [{
+            "id": "KovZpZA7AAEA",
+            "name": "Madison Square Garden",
+            "city": {"name": "New York"},
+            "country": {"name": "United States Of America"},
+            "location": {"longitude": "-73.99160060", "latitude": "40.75097353"}
+        }]}
+    })
+    assert record.start_date == datetime(2030, 5, 1, 20, 0)
+    assert record.venue_id == "KovZpZA7AAEA"
+    assert record.city == "New York"
+    assert record.latitude == pytest.approx(40.75097353)
+    assert normalize_event({"id": "x", "name": "No venue"}).venue_id is None
+    assert normalize_event({"name": "No id"}) is None
+
+def test_upsert_venues_writes_new_and_changed_venues_only(sqlite_db):
+    assert upsert_venues(sqlite_db, {"v1": Venue(id="v1", name="Arena", latitude=51.5)}) == ["v1"]
+    assert upsert_venues(sqlite_db, {
+        "v1": Venue(id="v1", name="Arena", latitude=51.5),
+        "v2": Venue(id="v2", name="Hall"),
+    }) == ["v2"]
+    # Renamed upstream; the coordinates it no longer sends are kept
+    assert upsert_venues(sqlite_db, {"v1": Venue(id="v1", name="The Arena")}) == ["v1"]
+    sqlite_db.expire_all()
+    assert [(v.id, v.name, v.latitude) for v in sqlite_db.query(Venue).order_by(Venue.id)] == [
+        ("v1", "The Arena", 51.5), ("v2", "Hall", None)
+    ]
+
+def test_get_events_filters_through_venue_join(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom"),
+        Venue(id="v2", name="Olympiastadion", city="Berlin", country="Germany"),
+        Event(id="e1", name="Concert", venue_id="v1"),
+        Event(id="e2", name="Match", venue_id="v2"),
+        Event(id="e3", name="TBA"),
+    ])
+    sqlite_db.commit()
+
+    events = apply_pagination(get_events(sqlite_db, EventFilters(city="london")), 1, 10)
+    assert [event.id for event in events] == ["e1"]
+    assert EventSchema.from_orm(events[0]).venue_name == "O2 Arena"
+    assert get_events(sqlite_db, EventFilters()).count() == 3
+
+
+def _seed_export_events(session):
+    session.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom"),
+        Event(id="e1", name="Concert", venue_id="v1", start_date=datetime(2030, 5, 1, 20, 0)),
+        Event(id="e2", name="Match, Final", venue_id="v1"),
+        Event(id="e3", name="Elsewhere"),
+        Event(id="e4", name="Started", venue_id="v1", start_date=datetime.utcnow() - timedelta(hours=2)),
+    ])
+    session.commit()
+
+@patch("app.Services.event_service.EXPORT_CHUNK_ROWS", 1)
+def test_export_events_ndjson_streams_filtered_rows(sqlite_db):
+    _seed_export_events(sqlite_db)
+    with patch("app.Services.event_service.SessionLocal", return_value=sqlite_db):
+        chunks = list(export_events_service(EventFilters(city="london"), "ndjson"))
+
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert len(chunks) == 2
+    # Like the listing, events that have started are only exported with include_past
+    assert [row["id"] for row in rows] == ["e1", "e2"]
+    assert rows[0]["venue_name"] == "O2 Arena"
+    assert rows[0]["start_date"] == "2030-05-01T20:00:00"
+
+    with patch("app.Services.event_service.SessionLocal", return_value=sqlite_db):
+        chunks = list(export_events_service(EventFilters(city="london", include_past=True), "ndjson"))
+    assert sorted(json.loads(line)["id"] for line in "".join(chunks).splitlines()) == ["e1", "e2", "e4"]
+
+def test_export_events_csv(sqlite_db):
+    _seed_export_events(sqlite_db)
+    with patch("app.Services.event_service.SessionLocal", return_value=sqlite_db):
+        lines = "".join(export_events_service(None, "csv")).splitlines()
+
+    assert lines[0].startswith("id,name,description,start_date,venue_id,venue_name,city")
+    assert len(lines) == 4
+    assert '"Match, Final"' in lines[2]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+def test_get_events_by_ids_caches_and_invalidates_on_save(sqlite_db):
+    event_detail_cache.clear()
+    user = User(email="fan@example.com")
+    sqlite_db.add_all([user, Event(id="e1", name="Concert"), Event(id="e2", name="Match")])
+    sqlite_db.commit()
+
+    assert set(get_events_by_ids(sqlite_db, ["e1", "e2", "missing"])) == {"e1", "e2"}
+    assert event_detail_cache.get("e1").favorite_count == 0
+
+    # A second lookup doesn't touch the database
+    with patch.object(sqlite_db, "query", side_effect=AssertionError("cache miss")):
+        assert get_events_by_ids(sqlite_db, ["e1"])["e1"].name == "Concert"
+
+    version = catalog_version.current()
+    save_event_repository("e1", sqlite_db, user)
+    assert event_detail_cache.get("e1") is None
+    # A favorite isn't a catalog change: other processes' caches and the suggest index stay put
+    assert catalog_version.current() == version
+    assert get_events_by_ids(sqlite_db, ["e1"])["e1"].favorite_count == 1
+    event_detail_cache.clear()
+
+@patch("app.Services.event_service.get_event_by_id")
+def test_get_event_service_not_found(mock_get_event_by_id, db):
+    mock_get_event_by_id.return_value = None
+    with pytest.raises(HTTPException) as exc:
+        get_event_service(db, "missing")
+    assert exc.value.status_code == 404
+
+@patch("app.Services.event_service.get_events_by_ids")
+def test_get_events_batch_service_keeps_request_order(mock_get_events_by_ids, db):
+    mock_get_events_by_ids.return_value = {
+        "e1": EventSchema(id="e1", name="Event 1"),
+        "e2": EventSchema(id="e2", name="Event 2"),
+    }
+    result = get_events_batch_service(db, ["e2", "missing", "e1", "e2"])
+    assert [event.id for event in result] == ["e2", "e1"]
+
+
+def test_archive_moves_past_events_and_include_past_unions_them(sqlite_db):
+    now = datetime.utcnow()
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London"),
+        Event(id="old1", name="Old Concert", venue_id="v1", start_date=now - timedelta(days=30)),
+        Event(id="old2", name="Old Match", venue_id="v1", start_date=now - timedelta(days=10)),
+        Event(id="recent", name="Last Night", venue_id="v1", start_date=now - timedelta(hours=2)),
+        Event(id="next", name="Next Concert", venue_id="v1", start_date=now + timedelta(days=3)),
+    ])
+    sqlite_db.commit()
+
+    cutoff = now - timedelta(days=1)
+    assert archive_past_events(sqlite_db, cutoff, batch_size=1) == 1
+    assert archive_past_events(sqlite_db, cutoff, batch_size=10) == 1
+    assert archive_past_events(sqlite_db, cutoff) == 0
+    assert {event.id for event in sqlite_db.query(Event)} == {"recent", "next"}
+    assert sqlite_db.get(ArchivedEvent, "old1").archived_at is not None
+
+    # Listings only show upcoming events by default
+    assert [event.id for event in apply_pagination(get_events(sqlite_db, EventFilters()), 1, 10)] == ["next"]
+
+    query = get_events(sqlite_db, EventFilters(city="london", include_past=True))
+    assert get_total_count(query) == 4
+    events = apply_pagination(apply_sorting(query, "start_date", "asc"), 1, 10)
+    assert [event.id for event in events] == ["old1", "old2", "recent", "next"]
+    assert events[0].venue_name == "O2 Arena"
+
+
+def test_reingested_archived_events_are_skipped_or_restored_and_archive_again(sqlite_db):
+    now = datetime.utcnow()
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena"),
+        Event(id="a1", name="Festival", venue_id="v1", start_date=now - timedelta(days=3), favorite_count=4),
+        Event(id="a2", name="Concert", venue_id="v1", start_date=now - timedelta(days=3)),
+    ])
+    sqlite_db.commit()
+    cutoff = now - timedelta(days=1)
+    assert archive_past_events(sqlite_db, cutoff) == 2
+
+    # Discovery still lists the festival, and the concert was rescheduled
+    assert bulk_persist_events(sqlite_db, [
+        EventRecord("a1", "Festival", "", now - timedelta(days=3), "", "v1", "O2 Arena", None, None, None, None),
+        EventRecord("a2", "Concert", "", now + timedelta(days=30), "", "v1", "O2 Arena", None, None, None, None),
+    ]) == 0
+    assert {event.id for event in sqlite_db.query(Event)} == {"a2"}
+    assert {event.id for event in sqlite_db.query(ArchivedEvent)} == {"a1"}
+    assert sqlite_db.get(Event, "a2").start_date == now + timedelta(days=30)
+    assert sqlite_db.query(EventChange).filter(EventChange.event_id == "a2").count() == 1
+
+    # An id that is live and archived at once is archived again; the live copy wins
+    sqlite_db.add(Event(id="a1", name="Festival (day 2)", venue_id="v1", start_date=now - timedelta(days=2)))
+    sqlite_db.commit()
+    assert archive_past_events(sqlite_db, cutoff) == 1
+    assert sqlite_db.get(ArchivedEvent, "a1").name == "Festival (day 2)"
+    assert sqlite_db.query(Event).filter(Event.id == "a1").count() == 0
+
+def test_event_partition_ddl_covers_one_month():
+    month = date(2026, 12, 1)
+    assert add_months(month, 1) == date(2027, 1, 1)
+    assert partition_month(partition_name(month)) == month
+    assert partition_month("events_default") is None
+
+    create, move, attach = partition_ddl(month)
+    assert create == "CREATE TABLE events_y2026m12 (LIKE events INCLUDING DEFAULTS)"
+    assert "DELETE FROM events_default WHERE start_date >= '2026-12-01' AND start_date < '2027-01-01'" in move
+    assert attach.endswith("FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')")
+
+def test_partition_helpers_are_noops_off_postgres(sqlite_db):
+    assert ensure_upcoming_partitions(sqlite_db) == []
+    assert archive_event_partitions(sqlite_db, datetime.utcnow()) == 0
+
+
+def test_event_ids_stay_unique_off_postgres_and_undated_events_are_kept(sqlite_db):
+    pg_ddl = str(CreateTable(Event.__table__).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY" not in pg_ddl and "PARTITION BY RANGE (start_date)" in pg_ddl
+    assert "PRIMARY KEY (id)" in str(CreateTable(Event.__table__).compile(dialect=sqlite.dialect()))
+
+    sqlite_db.add(Event(id="e1", name="Show", start_date=datetime(2099, 1, 1)))
+    sqlite_db.commit()
+    sqlite_db.add(Event(id="e1", name="Show", start_date=datetime(2099, 2, 1)))
+    with pytest.raises(IntegrityError):
+        sqlite_db.commit()
+    sqlite_db.rollback()
+
+    records = [_record("e2", "London"), _record("e3", "London", None)]
+    with patch("app.Services.ingestion_service.is_partitioned", return_value=True), \
+            patch("app.Services.ingestion_service.ensure_event_partitions") as mock_ensure:
+        assert partition_records(sqlite_db, records) == records
+    assert list(mock_ensure.call_args.args[1]) == [datetime(2099, 1, 1), None]
+
+
+@pytest.mark.parametrize("backend", ["memory", "shm"])
+def test_shared_state_counters_and_leases(backend, tmp_path):
+    state = InProcessState() if backend == "memory" else SqliteSharedState(str(tmp_path / "state.sqlite"))
+    state.set("k", {"a": 1})
+    assert state.get("k") == {"a": 1}
+    state.delete("k")
+    assert state.get("k") is None
+
+    assert [state.incr("version") for _ in range(3)] == [1, 2, 3]
+    assert state.counter("version") == 3
+
+    assert state.acquire_lease("scheduler", "web-1", ttl_seconds=60)
+    assert state.acquire_lease("scheduler", "web-1", ttl_seconds=60)  # renewal
+    assert not state.acquire_lease("scheduler", "web-2", ttl_seconds=60)
+    state.release_lease("scheduler", "web-1")
+    assert state.acquire_lease("scheduler", "web-2", ttl_seconds=60)
+
+def test_catalog_version_invalidates_other_processes_caches(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    # Two "processes", each with its own connection and cache, sharing one state file
+    web_1 = LRUCache(10, version=CatalogVersion(lambda state=SqliteSharedState(path): state, check_seconds=0))
+    web_2 = LRUCache(10, version=CatalogVersion(lambda state=SqliteSharedState(path): state, check_seconds=0))
+    web_1.set("e1", "old")
+    web_1.set("e2", "old")
+    web_2.set("e1", "old")
+    assert web_2.get("e1") == "old"
+
+    web_1.invalidate("e1")
+    # The writer keeps its unrelated entries; the other process drops everything it had
+    assert web_1.get("e1") is None and web_1.get("e2") == "old"
+    assert web_2.get("e1") is None
+
+
+def test_get_events_service_facets_come_from_one_query(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom"),
+        Venue(id="v2", name="Wembley", city="London", country="United Kingdom"),
+        Venue(id="v3", name="Olympia", city="Paris", country="France"),
+        Event(id="e1", name="Concert", venue_id="v1", start_date=datetime(2030, 5, 1)),
+        Event(id="e2", name="Match", venue_id="v2", start_date=datetime(2030, 5, 20)),
+        Event(id="e3", name="Concert 2", venue_id="v1", start_date=datetime(2030, 6, 2)),
+        Event(id="e4", name="Show", venue_id="v3", start_date=datetime(2030, 4, 2)),
+        Event(id="e5", name="Concert 3", venue_id="v3", start_date=datetime(2030, 7, 2)),
+    ])
+    sqlite_db.commit()
+
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = get_events_service(
+        sqlite_db, per_page=2, filters=EventFilters(search="concert"),
+        facets=["city", "venue_name", "month"], facet_limit=2
+    )
+
+    facets = {field: [(facet.value, facet.count) for facet in values] for field, values in result.facets.items()}
+    assert facets == {
+        "city": [("London", 2), ("Paris", 1)],
+        "venue_name": [("O2 Arena", 2), ("Olympia", 1)],
+        "month": [("2030-05", 1), ("2030-06", 1)],
+    }
+    # Count, page and all facets: three statements however many facets are asked for,
+    # after the per-process check of whether the upcoming summary is filled
+    assert len(statements) == 4
+
+
+def test_get_events_service_projects_requested_fields(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom", latitude=51.503, longitude=0.003),
+        Event(id="e1", name="Concert", description="x" * 1000, venue_id="v1", start_date=datetime(2030, 5, 1), favorite_count=3),
+        Event(id="e2", name="Match", description="y" * 1000, venue_id="v1", start_date=datetime(2030, 5, 2), favorite_count=7),
+        ArchivedEvent(id="e0", name="Old show", description="z", venue_id="v1", start_date=datetime(2020, 1, 1), favorite_count=9),
+    ])
+    sqlite_db.commit()
+
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = get_events_service(sqlite_db, fields=["name"])
+
+    # id and the sort key always come along; nothing else is selected
+    assert [dict(row._mapping) for row in result.events] == [
+        {"id": "e1", "name": "Concert", "start_date": datetime(2030, 5, 1)},
+        {"id": "e2", "name": "Match", "start_date": datetime(2030, 5, 2)},
+    ]
+    assert not any("description" in statement for statement in statements)
+
+    result = get_events_service(
+        sqlite_db, filters=EventFilters(include_past=True), sort_by="popularity", sort_order="desc", fields=["name"]
+    )
+    assert [(row.id, row.favorite_count) for row in result.events] == [("e0", 9), ("e2", 7), ("e1", 3)]
+
+    result = get_events_service(
+        sqlite_db, filters=EventFilters(latitude=51.5, longitude=0.0, radius_km=10), fields=["name", "distance_km"]
+    )
+    assert {row["id"] for row in result.events} == {"e1", "e2"}
+    assert all(0 < row["distance_km"] < 1 for row in result.events)
+
+
+def test_nearby_search_reaches_across_the_antimeridian(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="Taveuni East", latitude=-16.8, longitude=-179.95),
+        Venue(id="v2", name="Taveuni West", latitude=-16.8, longitude=179.9),
+        Venue(id="v3", name="Greenwich", latitude=-16.8, longitude=0.0),
+        Event(id="e1", name="East", venue_id="v1", start_date=datetime(2099, 1, 1)),
+        Event(id="e2", name="West", venue_id="v2", start_date=datetime(2099, 1, 1)),
+        Event(id="e3", name="Far", venue_id="v3", start_date=datetime(2099, 1, 1)),
+    ])
+    sqlite_db.commit()
+
+    # About 5km east and 11km west of the origin, on either side of ±180
+    result = get_events_service(
+        sqlite_db, filters=EventFilters(latitude=-16.8, longitude=179.997, radius_km=25), sort_by="distance"
+    )
+    assert [event.id for event in result.events] == ["e1", "e2"]
+    assert all(event.distance_km < 12 for event in result.events)
+
+def test_nearby_radius_matches_the_reported_haversine_distance(sqlite_db):
+    sqlite_db.add_all([
+        # 100.09km by haversine, but inside 100km on a flat projection
+        Venue(id="v1", name="Outside", latitude=69.426, longitude=27.0),
+        # 99.40km by haversine, but outside 100km on a flat projection
+        Venue(id="v2", name="Inside", latitude=70.279, longitude=27.5),
+        Venue(id="v3", name="Closer", latitude=70.2, longitude=25.5),
+        Event(id="e1", name="Outside", venue_id="v1", start_date=datetime(2099, 1, 1)),
+        Event(id="e2", name="Inside", venue_id="v2", start_date=datetime(2099, 1, 1)),
+        Event(id="e3", name="Closer", venue_id="v3", start_date=datetime(2099, 1, 1)),
+    ])
+    sqlite_db.commit()
+
+    result = get_events_service(
+        sqlite_db, filters=EventFilters(latitude=70.0, longitude=25.0, radius_km=100), sort_by="distance"
+    )
+    assert [event.id for event in result.events] == ["e3", "e2"]
+    assert result.events[1].distance_km == pytest.approx(99.398, abs=1e-3)
+    assert all(event.distance_km <= 100 for event in result.events)
+
+def test_every_accepted_sort_works_on_the_archive_union(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", latitude=51.5, longitude=0.0),
+        Event(id="e1", name="Concert", venue_id="v1", start_date=datetime(2099, 1, 1), trending_score=2.0),
+        ArchivedEvent(id="e0", name="Old show", venue_id="v1", start_date=datetime(2000, 1, 1)),
+    ])
+    sqlite_db.commit()
+
+    # trending_score is an events column, but the union doesn't select it
+    assert "trending_score" not in SORT_FIELDS
+    for sort_by in SORT_FIELDS:
+        for fields in (None, ["name"]):
+            result = get_events_service(sqlite_db, filters=EventFilters(include_past=True), sort_by=sort_by, fields=fields)
+            assert {row["id"] if isinstance(row, dict) else row.id for row in result.events} == {"e0", "e1"}
+
+def test_suggest_index_ranks_by_popularity_and_extends_incrementally():
+    index = SuggestIndex()
+    index.rebuild([
+        SuggestRow("e1", "Taylor Swift", "v1", "Madison Square Garden", "New York", 40, datetime(2030, 1, 1)),
+        SuggestRow("e2", "Tame Impala", "v2", "Théâtre du Châtelet", "Paris", 5, datetime(2030, 1, 1)),
+        SuggestRow("e3", "Swan Lake", "v2", "Théâtre du Châtelet", "Paris", 1, datetime(2030, 1, 2)),
+    ])
+
+    assert [(s.kind, s.text) for s in index.suggest("ta", 2)] == [("event", "Taylor Swift"), ("event", "Tame Impala")]
+    # Word starts and accents match too; venues and cities add up their events' popularity
+    assert [s.text for s in index.suggest("sw")] == ["Taylor Swift", "Swan Lake"]
+    assert index.suggest("chat")[0].text == "Théâtre du Châtelet"
+    assert index.suggest("par", kinds=["city"])[0]._asdict() == {"kind": "city", "text": "Paris", "id": None, "score": 8}
+
+    index.extend([SuggestRow("e4", "Tame Impala Encore", "v3", "Zenith", "Paris", 90, datetime(2030, 1, 3))])
+    assert [s.id for s in index.suggest("tame")] == ["e4", "e2"]
+    assert index.suggest("paris")[0].score == 99
+    assert index.loaded_until == datetime(2030, 1, 3)
+
+
+def test_get_suggestions_service_only_loads_the_index_once(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom"),
+        Event(id="e1", name="Oasis Live", venue_id="v1", start_date=datetime(2099, 5, 1), favorite_count=3),
+        Event(id="e2", name="Old Show", venue_id="v1", start_date=datetime(2000, 5, 1)),
+    ])
+    sqlite_db.commit()
+
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with patch("app.Services.event_service.suggest_index", new_callable=SuggestIndex), \
+            patch("app.Services.event_service.SessionLocal", return_value=sqlite_db):
+        first = get_suggestions_service("o", 10)
+        loaded = len(statements)
+        second = get_suggestions_service("oasis", 10)
+
+    # Past events are left out of the index; equal scores come back alphabetically
+    assert [(s["kind"], s["text"]) for s in first["suggestions"]] == [("venue", "O2 Arena"), ("event", "Oasis Live")]
+    assert second["suggestions"][0]["id"] == "e1"
+    assert loaded == 1 and len(statements) == 1
+
+
+def _record(event_id, city, start_date=datetime(2099, 1, 1)):
+    return EventRecord(event_id, f"Show {event_id}", "", start_date, "", "v1", "Arena", city, "UK", 51.5, -0.1)
+
+@patch("app.Services.stream_service.catalog_watcher")
+def test_event_stream_pushes_matching_events_published_from_another_thread(mock_watcher):
+    async def scenario():
+        stream = event_stream_service(EventFilters(city="london"), heartbeat_seconds=0.05)
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        publisher = threading.Thread(target=publish_records, args=([
+            _record("e1", "London"), _record("e2", "Paris"), _record("e3", "London", datetime(2000, 1, 1)),
+        ],))
+        publisher.start()
+        publisher.join()
+        frame = await stream.__anext__()
+        # Paris doesn't match the filters and e3 is in the past: only keep-alives follow
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        await stream.aclose()
+        return frame
+
+    with patch("app.Services.stream_service.event_broker", Broker(key=lambda event: event.id)) as broker:
+        frame = asyncio.run(scenario())
+        assert len(broker) == 0
+    assert frame.startswith("id: e1\nevent: event\ndata: ")
+    assert json.loads(frame.split("data: ", 1)[1])["city"] == "London"
+
+
+def test_catalog_watcher_publishes_events_committed_or_changed_elsewhere(sqlite_db):
+    broker = Broker(key=event_key)
+    watcher = CatalogWatcher(broker)
+    statements = []
+
+    async def scenario():
+        subscription = broker.subscribe()
+        sqlite_db.add_all([Venue(id="v1", name="Arena", city="London"), Event(id="e1", name="Show", venue_id="v1")])
+        sqlite_db.commit()
+        assert watcher.poll(sqlite_db) == 1
+        # Nothing changed since: only the watermark is read, nothing is sent twice
+        event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert watcher.poll(sqlite_db) == 0
+        assert len(statements) == 1
+        # Another process re-dates it: sent again with the new date
+        update_changed_events(sqlite_db, [{"id": "e1", "start_date": datetime(2099, 6, 1), "venue_id": "v1"}])
+        assert watcher.poll(sqlite_db) == 1
+        events = [await asyncio.wait_for(subscription.get(), 1) for _ in range(2)]
+        subscription.close()
+        return events
+
+    first, changed = asyncio.run(scenario())
+    assert (first.id, first.venue_name, first.start_date) == ("e1", "Arena", None)
+    assert (changed.id, changed.start_date) == ("e1", datetime(2099, 6, 1))
+
+
+class CollectingSink(NotificationSink):
+    def __init__(self):
+        self.batches = []
+
+    def deliver(self, notifications):
+        self.batches.append(notifications)
+
+
+def test_ingested_date_change_fans_out_to_favoriters_in_batches(sqlite_db):
+    sqlite_db.add_all([User(id=i, email=f"fan{i}@example.com") for i in range(1, 6)])
+    sqlite_db.add_all([
+        Event(id="e1", name="Show", start_date=datetime(2099, 1, 1)),
+        Event(id="e2", name="Other", start_date=datetime(2099, 2, 1)),
+    ])
+    sqlite_db.add_all([Favorite(user_id=i, event_id="e1") for i in range(1, 6)] + [Favorite(user_id=1, event_id="e2")])
+    sqlite_db.commit()
+
+    # e1 is re-dated, e2 comes back undated (never erases a stored date), e3 is new
+    bulk_persist_events(sqlite_db, [
+        EventRecord("e1", "Show", "", datetime(2099, 3, 1), "", None, None, None, None, None, None),
+        EventRecord("e2", "Other", "", None, "", None, None, None, None, None, None),
+        EventRecord("e3", "New", "", datetime(2099, 4, 1), "", None, None, None, None, None, None),
+    ])
+    sqlite_db.expire_all()
+    assert sqlite_db.query(Event.start_date).filter(Event.id == "e1").scalar() == datetime(2099, 3, 1)
+    assert sqlite_db.query(Event.start_date).filter(Event.id == "e2").scalar() == datetime(2099, 2, 1)
+
+    sink = CollectingSink()
+    assert fan_out_changes(sqlite_db, sink, favorite_batch=2) == 5
+    assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+    # Fanned-out changes aren't picked up again
+    assert fan_out_changes(sqlite_db, sink) == 0
+    assert sqlite_db.query(Notification).count() == 5
+
+    inbox = get_inbox_service(sqlite_db, 3)
+    assert inbox.unread == 1 and inbox.next_before_id is None
+    assert inbox.notifications[0].changes == {
+        "start_date": {"old": "2099-01-01T00:00:00", "new": "2099-03-01T00:00:00"}
+    }
+    assert mark_read_service(sqlite_db, 3) == 1
+    assert get_inbox_service(sqlite_db, 3).unread == 0
+    assert get_inbox_service(sqlite_db, 1).unread == 1
+
+
+def test_upcoming_summary_is_refreshed_by_ingestion_and_serves_fitting_listings(sqlite_db):
+    sqlite_db.add_all([
+        Venue(id="v1", name="O2 Arena", city="London", country="United Kingdom"),
+        Event(id="e0", name="Past", venue_id="v1", start_date=datetime(2000, 1, 1)),
+        Event(id="e1", name="Concert", venue_id="v1", start_date=datetime(2099, 5, 1)),
+    ])
+    sqlite_db.commit()
+    # Not filled yet, so listings read events
+    assert [row.id for row in get_events_service(sqlite_db).events] == ["e1"]
+
+    # The first batch fills the whole summary, not only its own events
+    bulk_persist_events(sqlite_db, [
+        EventRecord("e2", "Match", "", datetime(2099, 4, 1), "", "v2", "Olympia", "Paris", "France", None, None),
+    ])
+    assert {event_id for (event_id,) in sqlite_db.query(UpcomingEvent.id)} == {"e1", "e2"}
+    save_event_repository("e1", sqlite_db, MagicMock(id=1))
+
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = get_events_service(sqlite_db, sort_by="popularity", sort_order="desc")
+    assert [(row.id, row.venue_name, row.favorite_count) for row in result.events] == [
+        ("e1", "O2 Arena", 1), ("e2", "Olympia", 0)
+    ]
+    page = get_events_service(sqlite_db, filters=EventFilters(country="france"), fields=["name"])
+    assert [dict(row._mapping) for row in page.events] == [{"id": "e2", "name": "Match", "start_date": datetime(2099, 4, 1)}]
+    # Fitting listings never join venues
+    assert all("upcoming_events" in statement and "venues" not in statement for statement in statements)
+
+    statements.clear()
+    past = get_events_service(sqlite_db, filters=EventFilters(include_past=True))
+    assert [row.id for row in past.events] == ["e0", "e2", "e1"]
+    assert not any("upcoming_events" in statement for statement in statements)
+
+def test_renamed_venue_reaches_summary_listings_sorted_by_coordinates(sqlite_db):
+    bulk_persist_events(sqlite_db, [
+        _record("e1", "London"),
+        EventRecord("e2", "Other", "", datetime(2099, 2, 1), "", "v2", "Hall", "Paris", "France", 48.8, 2.3),
+    ])
+    # e1 isn't in this batch, but its venue is renamed by it
+    bulk_persist_events(sqlite_db, [
+        EventRecord("e3", "New", "", datetime(2099, 3, 1), "", "v1", "New Arena", "London", "UK", 51.5, -0.1),
+    ])
+
+    result = get_events_service(sqlite_db, sort_by="latitude", sort_order="desc")
+    assert [(row.venue_name, row.latitude) for row in result.events] == [
+        ("New Arena", 51.5), ("New Arena", 51.5), ("Hall", 48.8)
+    ]
+
+def test_sparse_and_python_item_neighbors_agree():
+    pytest.importorskip("scipy")
+    rng = random.Random(7)
+    pairs = {(rng.randrange(200), rng.randrange(60)) for _ in range(1500)}
+    users, items = zip(*sorted(pairs))
+
+    sparse_result = dict(item_neighbors(users, items, 200, 60, k=5, block_size=16))
+    python_result = dict(_python_neighbors(users, items, k=5, max_user_favorites=500))
+    assert sparse_result.keys() == python_result.keys()
+    for item, neighbors in python_result.items():
+        assert [(n, c) for n, _, c in sparse_result[item]] == [(n, c) for n, _, c in neighbors]
+        assert [s for _, s, _ in sparse_result[item]] == pytest.approx([s for _, s, _ in neighbors], rel=1e-5)
+
+
+def test_recommendations_come_from_co_favorites_of_saved_events(sqlite_db):
+    sqlite_db.add_all([User(id=i, email=f"fan{i}@example.com") for i in range(1, 5)])
+    sqlite_db.add_all([Event(id=f"e{i}", name=f"Show {i}", start_date=datetime(2099, 1, i)) for i in range(1, 6)])
+    sqlite_db.add_all([
+        Favorite(user_id=user_id, event_id=event_id)
+        for user_id, event_id in [
+            (1, "e1"), (1, "e2"), (1, "e3"),
+            (2, "e1"), (2, "e2"),
+            (3, "e2"), (3, "e4"),
+            (4, "e5"),
+        ]
+    ])
+    sqlite_db.commit()
+
+    assert build_event_neighbors(sqlite_db) == 8
+    # User 2 saved e1 and e2: e3 is co-favorited with both, e4 with e2 only; e5 with nothing
+    recommendations = get_recommendations_service(sqlite_db, 2)
+    assert [(r.event.id, r.because_event_id) for r in recommendations] == [("e3", "e1"), ("e4", "e2")]
+    assert recommendations[0].score == pytest.approx(1 / math.sqrt(2) + 1 / math.sqrt(3))
+    assert get_recommendations_service(sqlite_db, 4) == []
+
+
+def test_user_provisioning_upserts_once_and_skips_unchanged_names(sqlite_db):
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    service = UserService(sqlite_db)
+
+    created = service.authenticate_or_create_user({"email": "fan@example.com", "name": "Fan"})
+    # One read that misses, then one INSERT ... RETURNING
+    assert len(statements) == 2 and "RETURNING" in statements[-1]
+
+    statements.clear()
+    again = service.authenticate_or_create_user({"email": "fan@example.com", "name": "Fan"})
+    assert len(statements) == 1 and statements[0].lstrip().startswith("SELECT")
+
+    renamed = service.authenticate_or_create_user({"email": "fan@example.com", "name": "Big Fan"})
+    assert created.id == again.id == renamed.id and renamed.name == "Big Fan"
+    assert sqlite_db.query(User).one().name == "Big Fan"
+
+    # A login without a name keeps the stored one, and a concurrent insert is read back
+    assert service.authenticate_or_create_user({"email": "fan@example.com"}).name == "Big Fan"
+    assert service.user_repository.upsert_user("fan@example.com").name == "Big Fan"
+    assert sqlite_db.query(User).count() == 1
+
+
+def test_google_metadata_and_jwks_are_fetched_once_per_ttl():
+    import httpx
+
+    fetched = []
+
+    def google(request):
+        fetched.append(request.url.path)
+        if request.url.path.endswith("openid-configuration"):
+            return httpx.Response(200, json={"issuer": "https://accounts.google.com", "jwks_uri": "https://www.googleapis.com/oauth2/v3/certs"})
+        return httpx.Response(200, json={"keys": []})
+
+    async def logins():
+        loop = asyncio.get_running_loop()
+        transport = httpx.MockTransport(google)
+        oidc._http = (loop, httpx.AsyncClient(transport=transport), transport, asyncio.Lock())
+        app = get_oauth().google
+        # A burst of logins shares one fetch of each document
+        assert await asyncio.gather(*(app.fetch_jwk_set() for _ in range(20))) == [{"keys": []}] * 20
+        assert (await app.load_server_metadata())["issuer"] == "https://accounts.google.com"
+        # An unknown signing key forces a JWKS refetch; an expired TTL refetches both
+        await app.fetch_jwk_set(force=True)
+        with patch("app.core.cache.time.monotonic", return_value=time.monotonic() + oidc.OIDC_CACHE_TTL_SECONDS + 1):
+            await app.fetch_jwk_set()
+        await oidc.close_http_client()
+
+    with patch.object(oidc, "oidc_cache", LRUCache(16, oidc.OIDC_CACHE_TTL_SECONDS)):
+        asyncio.run(logins())
+    metadata, jwks = "/.well-known/openid-configuration", "/oauth2/v3/certs"
+    assert fetched == [metadata, jwks, jwks, metadata, jwks]
+
+
+def test_google_token_exchange_goes_through_the_shared_pool():
+    import httpx
+
+    requests = []
+
+    def google(request):
+        requests.append((request.method, request.url.path))
+        if request.url.path.endswith("openid-configuration"):
+            return httpx.Response(200, json={"token_endpoint": "https://oauth2.googleapis.com/token"})
+        return httpx.Response(200, json={"access_token": "google-token", "token_type": "Bearer"})
+
+    async def exchanges():
+        loop = asyncio.get_running_loop()
+        transport = httpx.MockTransport(google)
+        oidc._http = (loop, httpx.AsyncClient(transport=transport), transport, asyncio.Lock())
+        app = get_oauth().google
+        # authlib closes its per-call client each time; the pool stays open for the next login
+        for code in ("code-1", "code-2"):
+            token = await app.fetch_access_token(redirect_uri="http://testserver/auth/google/callback", code=code)
+            assert token["access_token"] == "google-token"
+        await oidc.close_http_client()
+
+    with patch.object(oidc, "oidc_cache", LRUCache(16, oidc.OIDC_CACHE_TTL_SECONDS)):
+        asyncio.run(exchanges())
+    token = ("POST", "/token")
+    assert requests == [("GET", "/.well-known/openid-configuration"), token, token]
+
+def test_fake_discovery_pages_are_deterministic_and_fail_on_request():
+    from fastapi.testclient import TestClient
+    from loadtest import fake_discovery
+    from app.Services.ticketmaster_client import TicketmasterClient, UpstreamError
+
+    def discovery(**options):
+        return TicketmasterClient(
+            api_key="test",
+            base_url="http://testserver/discovery/v2",
+            http_client=TestClient(fake_discovery.create_app(**options)),
+            sleep=lambda seconds: None
+        )
+
+    page = discovery(events_per_keyword=70).get_events_page("music", page=1, size=60)
+    assert page == discovery(events_per_keyword=70).get_events_page("music", page=1, size=60)
+    records = [normalize_event(event) for event in page["_embedded"]["events"]]
+    assert [record.id for record in records] == [f"fake-music-{index}" for index in range(60, 70)]
+    assert all(record.venue_id and record.start_date for record in records)
+
+    with pytest.raises(UpstreamError):
+        discovery(error_rate=1).get_events_page("music")
+
+
+def test_fake_oidc_signs_id_tokens_for_the_authorized_client():
+    from urllib.parse import parse_qs, urlparse
+    from fastapi.testclient import TestClient
+    from joserfc import jwt
+    from joserfc.jwk import KeySet
+    from loadtest import fake_oidc
+
+    provider = TestClient(fake_oidc.create_app("http://testserver", users=2))
+    metadata = provider.get("/.well-known/openid-configuration").json()
+    redirect = provider.get(
+        "/authorize",
+        params={"client_id": "app", "redirect_uri": "http://app/callback", "state": "s1", "nonce": "n1"},
+        follow_redirects=False
+    )
+    query = parse_qs(urlparse(redirect.headers["location"]).query)
+    assert query["state"] == ["s1"]
+
+    token = provider.post("/token", data={"code": query["code"][0]}).json()
+    claims = jwt.decode(token["id_token"], KeySet.import_key_set(provider.get("/jwks").json())).claims
+    assert claims["iss"] == metadata["issuer"] and claims["aud"] == "app" and claims["nonce"] == "n1"
+    assert claims["email"] == fake_oidc.user_email(0)
+    # Codes are single use
+    assert provider.post("/token", data={"code": query["code"][0]}).status_code == 400
+
+
+def test_concurrent_identical_listings_share_one_query():
+    flights = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def slow_query(db, page, *args):
+        executions.append(page)
+        release.wait(5)
+        if page == 3:
+            raise HTTPException(status_code=500, detail="boom")
+        return {"page": page}
+
+    results, errors = [], []
+
+    def request(page, filters):
+        try:
+            results.append(get_events_service(MagicMock(), page=page, filters=filters, sort_order="ASC", facets=["city", "month"]))
+        except HTTPException as e:
+            errors.append(e)
+
+    with patch("app.Services.event_service.listing_flights", flights), \
+            patch("app.Services.event_service.query_events_page", side_effect=slow_query):
+        # Same filters spelled differently, plus a different page and a failing one
+        threads = [threading.Thread(target=request, args=(1, EventFilters(city="Paris"))) for _ in range(8)]
+        threads += [threading.Thread(target=request, args=(1, EventFilters(city="Paris", include_past=False)))]
+        threads += [threading.Thread(target=request, args=(2, EventFilters(city="Paris")))]
+        threads += [threading.Thread(target=request, args=(3, None)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while flights.calls < len(threads):
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        stats = get_coalescing_stats_service()["events_listing"]
+
+    assert sorted(executions) == [1, 2, 3]
+    assert sorted(result["page"] for result in results) == [1] * 9 + [2]
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert stats == {"calls": 12, "executions": 3, "coalesced": 9, "coalescing_ratio": 0.75, "in_flight": 0}
@@ -0,0 +1,295 @@
+import time
+import pytest
+import httpx
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+from app.Models.event import Event
+from app.Models.ingestion import IngestionCheckpoint, IngestionJob
+from app.core.shared_state import InProcessState, Lease
+from app.Services.lifespan import SCHEDULER_LEASE_NAME
+from app.worker import PERIODIC_JOBS, enqueue_due_jobs
+from app.Services.ticketmaster_client import (
+    TicketmasterClient,
+    TokenBucket,
+    CircuitBreaker,
+    UpstreamError,
+    CircuitOpenError
+)
+from app.Services.ingestion_service import fetch_ticketmaster_data, backfill_ticketmaster_data, run_next_job
+from app.Services.normalization import normalize_pages
+from app.Repository.ingestion_repository import enqueue_job, claim_next_job, finish_job, heartbeat_job, requeue_stale_jobs
+import json
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def discovery_page(keyword, page=0, total_pages=1):
+    return {
+        "_embedded": {"events": [{
+            "id": f"{keyword}-{page}",
+            "name": f"{keyword.title()} {page}",
+            "dates": {"start": {"dateTime": "2030-05-01T20:00:00Z"}},
+            "_embedded": {"venues": [{"id": "v1", "name": "Arena", "city": {"name": "London"}}]}
+        }]},
+        "page": {"number": page, "totalPages": total_pages}
+    }
+
+
+def make_client(handler, clock=None, **kwargs):
+    clock = clock or FakeClock()
+    return TicketmasterClient(
+        api_key="test",
+        base_url="http://fake-discovery/discovery/v2",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        bucket=TokenBucket(clock=clock, sleep=clock.sleep, wall_clock=clock),
+        breaker=CircuitBreaker(clock=clock),
+        sleep=clock.sleep,
+        **kwargs
+    )
+
+
+def test_client_retries_rate_limited_requests():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        return httpx.Response(200, json=discovery_page("music"))
+
+    clock = FakeClock()
+    data = make_client(handler, clock).get_events_page("music")
+
+    assert data["_embedded"]["events"][0]["id"] == "music-0"
+    assert len(calls) == 2
+    assert calls[0].url.params["apikey"] == "test"
+    assert 2 in clock.sleeps
+
+
+def test_client_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(401)
+
+    with pytest.raises(UpstreamError):
+        make_client(handler).get_events_page("music")
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_repeated_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    client = make_client(handler, max_retries=10)
+    client.breaker.failure_threshold = 3
+
+    with pytest.raises(CircuitOpenError):
+        client.get_events_page("music")
+    assert len(calls) == 3
+
+    # While open, nothing is sent upstream
+    with pytest.raises(CircuitOpenError):
+        client.get_events_page("sports")
+    assert len(calls) == 3
+
+
+def test_token_bucket_spreads_remaining_quota():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=5, clock=clock, sleep=clock.sleep, wall_clock=clock)
+    bucket.update_quota(httpx.Headers({"Rate-Limit-Available": "10", "Rate-Limit-Reset": "100000"}))
+    assert bucket.rate == pytest.approx(0.1)
+
+    bucket.update_quota(httpx.Headers({"Rate-Limit-Available": "0", "Rate-Limit-Reset": "100000"}))
+    bucket.acquire()
+    assert clock.now >= 100
+
+
+def test_failed_keyword_is_checkpointed_and_resumed(sqlite_db):
+    failing = {"sports"}
+
+    def handler(request):
+        keyword = request.url.params["keyword"]
+        if keyword in failing:
+            return httpx.Response(503)
+        return httpx.Response(200, json=discovery_page(keyword))
+
+    client = make_client(handler, max_retries=1)
+    client.breaker.failure_threshold = 100
+    with patch("app.Services.ingestion_service.SessionLocal", return_value=sqlite_db), \
+         patch("app.Services.ingestion_service.get_ticketmaster_client", return_value=client), \
+         patch("app.Services.ingestion_service.KEYWORDS", ["music", "sports", "arts"]), \
+         patch("app.Services.ingestion_service.event_cache", {}):
+        fetch_ticketmaster_data()
+
+        # Partial progress from the other keywords survived the failure
+        assert {event.id for event in sqlite_db.query(Event)} == {"music-0", "arts-0"}
+        sports = sqlite_db.get(IngestionCheckpoint, "sports")
+        assert sports.completed_at is None
+        assert "503" in sports.last_error
+
+        failing.clear()
+        fetched = []
+        client.http_client = httpx.Client(transport=httpx.MockTransport(
+            lambda request: fetched.append(request.url.params["keyword"]) or handler(request)
+        ))
+        fetch_ticketmaster_data()
+
+    assert fetched[0] == "sports"
+    assert sqlite_db.get(IngestionCheckpoint, "sports").completed_at is not None
+
+
+def test_stream_events_page_yields_events_before_the_body_ends():
+    body = json.dumps({
+        "_embedded": {"events": [{"id": f"e{i}", "name": f"Event {i}"} for i in range(3)]},
+        "page": {"size": 3, "totalPages": 7, "number": 0}
+    }).encode()
+    sent = []
+
+    def body_chunks():
+        for start in range(0, len(body), 16):
+            sent.append(start)
+            yield body[start:start + 16]
+
+    client = make_client(lambda request: httpx.Response(200, content=body_chunks()))
+    stream = client.stream_events_page("music")
+    events = iter(stream)
+
+    assert next(events)["id"] == "e0"
+    assert len(sent) < len(body) / 16
+    assert [event["id"] for event in events] == ["e1", "e2"]
+    assert stream.page["totalPages"] == 7
+
+
+def test_stream_events_page_reports_truncated_bodies():
+    client = make_client(lambda request: httpx.Response(200, content=b'{"_embedded": {"events": [{"id": "e0"'))
+    with pytest.raises(UpstreamError):
+        list(client.stream_events_page("music"))
+
+
+def test_jobs_are_claimed_once_and_deduped(sqlite_db):
+    first = enqueue_job(sqlite_db, "fetch_ticketmaster")
+    assert enqueue_job(sqlite_db, "fetch_ticketmaster").id == first.id
+
+    job = claim_next_job(sqlite_db, "worker-a")
+    assert job.id == first.id
+    assert job.status == "running" and job.locked_by == "worker-a" and job.attempts == 1
+    # Nothing left for a second worker
+    assert claim_next_job(sqlite_db, "worker-b") is None
+    # Nor is a second cycle queued while the first is still running
+    assert enqueue_job(sqlite_db, "fetch_ticketmaster").id == first.id
+    assert enqueue_job(sqlite_db, "archive_events").id != first.id
+
+    finish_job(sqlite_db, job)
+    assert enqueue_job(sqlite_db, "fetch_ticketmaster").id != first.id
+
+
+def test_run_next_job_records_success_and_failure(sqlite_db):
+    calls = []
+
+    def failing(payload):
+        raise UpstreamError("down")
+
+    handlers = {"fetch_ticketmaster": calls.append, "broken": failing}
+    with patch.dict("app.Services.ingestion_service.JOB_HANDLERS", handlers, clear=True):
+        enqueue_job(sqlite_db, "fetch_ticketmaster", {"keyword": "music"})
+        enqueue_job(sqlite_db, "broken")
+
+        done = run_next_job(sqlite_db, "worker-a")
+        failed = run_next_job(sqlite_db, "worker-a")
+        assert run_next_job(sqlite_db, "worker-a") is None
+
+    assert calls == [{"keyword": "music"}]
+    assert done.status == "succeeded" and done.finished_at is not None
+    assert failed.status == "failed" and "down" in failed.error
+
+
+def test_running_jobs_send_heartbeats_and_only_silent_ones_are_requeued(sqlite_db):
+    def slow(payload):
+        time.sleep(0.2)
+
+    sessions = sessionmaker(bind=sqlite_db.get_bind())
+    with patch.dict("app.Services.ingestion_service.JOB_HANDLERS", {"backfill_ticketmaster": slow}, clear=True), \
+         patch("app.Services.ingestion_service.SessionLocal", sessions), \
+         patch("app.Services.ingestion_service.JOB_HEARTBEAT_SECONDS", 0.02):
+        enqueue_job(sqlite_db, "backfill_ticketmaster")
+        done = run_next_job(sqlite_db, "worker-a")
+    assert done.status == "succeeded" and done.heartbeat_at > done.started_at
+
+    # A job running for hours is left alone while its heartbeat is fresh
+    long_running = enqueue_job(sqlite_db, "backfill_ticketmaster")
+    claim_next_job(sqlite_db, "worker-a")
+    long_running.started_at = datetime.utcnow() - timedelta(hours=3)
+    sqlite_db.commit()
+    assert requeue_stale_jobs(sqlite_db, timedelta(minutes=5)) == 0
+
+    long_running.heartbeat_at = datetime.utcnow() - timedelta(minutes=10)
+    sqlite_db.commit()
+    assert requeue_stale_jobs(sqlite_db, timedelta(minutes=5)) == 1
+    sqlite_db.refresh(long_running)
+    assert long_running.status == "queued" and long_running.locked_by is None
+    # The old worker's heartbeats no longer land once the job was taken from it
+    assert not heartbeat_job(sqlite_db, long_running.id, "worker-a")
+
+def test_failed_fetch_cycle_fails_its_job(sqlite_db):
+    with patch("app.Services.ingestion_service.SessionLocal", sessionmaker(bind=sqlite_db.get_bind())), \
+         patch("app.Services.ingestion_service.ensure_upcoming_partitions", side_effect=RuntimeError("db down")):
+        # Inline callers keep the old behaviour: the error is printed, not raised
+        fetch_ticketmaster_data()
+
+        enqueue_job(sqlite_db, "fetch_ticketmaster")
+        job = run_next_job(sqlite_db, "worker-a")
+
+    assert job.status == "failed" and "db down" in job.error
+
+def test_only_the_scheduler_lease_holder_enqueues_periodic_jobs(sqlite_db):
+    state = InProcessState()
+    lease_a = Lease(SCHEDULER_LEASE_NAME, 90, state_factory=lambda: state, owner="worker-a")
+    lease_b = Lease(SCHEDULER_LEASE_NAME, 90, state_factory=lambda: state, owner="worker-b")
+    due_a = {kind: datetime.utcnow() for kind in PERIODIC_JOBS}
+    due_b = dict(due_a)
+
+    assert enqueue_due_jobs(sqlite_db, lease_a, due_a) == list(PERIODIC_JOBS)
+    assert enqueue_due_jobs(sqlite_db, lease_b, due_b) == []
+    # Nothing is due again until the interval passes
+    assert enqueue_due_jobs(sqlite_db, lease_a, due_a) == []
+
+    # Another worker takes over the schedule once the holder lets go
+    lease_a.release()
+    assert enqueue_due_jobs(sqlite_db, lease_b, due_b) == list(PERIODIC_JOBS)
+    assert sqlite_db.query(IngestionJob).count() == len(PERIODIC_JOBS)
+
+def test_parallel_normalization_matches_serial_order():
+    pages = [discovery_page(f"kw{i}", page=i)["_embedded"]["events"] for i in range(6)]
+    assert list(normalize_pages(pages, workers=2)) == list(normalize_pages(pages, workers=0))
+
+
+def test_backfill_bulk_inserts_every_page(sqlite_db):
+    def handler(request):
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json=discovery_page("music", page=page, total_pages=3))
+
+    client = make_client(handler)
+    with patch("app.Services.ingestion_service.SessionLocal", return_value=sqlite_db), \
+         patch("app.Services.ingestion_service.get_ticketmaster_client", return_value=client):
+        backfill_ticketmaster_data({"keywords": ["music"], "pages": 10, "workers": 2})
+
+    assert {event.id for event in sqlite_db.query(Event)} == {"music-0", "music-1", "music-2"}
+    checkpoint = sqlite_db.get(IngestionCheckpoint, "music")
+    assert checkpoint.next_page == 0 and checkpoint.completed_at is not None